@@ -1,2 +1,6 @@
 """FastAPI backend package for travel SaaS MVP."""
 
+import time
+
+# Taken before any submodule (and langgraph) is imported; warm-up reports startup time from here.
+IMPORTED_AT = time.monotonic()
@@ -0,0 +1,69 @@
+import asyncio
+import io
+import json
+import logging
+import tempfile
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from typing import IO, Any
+
+from pydantic import ValidationError
+
+from .plan_service import agenerate_plan
+from .schemas import PlanRequest
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def spool_body(chunks: AsyncIterator[bytes], *, max_memory_bytes: int = 1 << 20) -> IO[bytes]:
+    """Buffer an uploaded JSONL body, spilling to disk once it exceeds ``max_memory_bytes``.
+
+    The body is spooled before planning starts because most HTTP/1.1 clients
+    do not read the response while they are still sending the request.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+    async for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def iter_spooled_lines(spool: IO[bytes]) -> Iterable[str]:
+    with io.TextIOWrapper(spool, encoding="utf-8", errors="replace") as text:
+        yield from text
+
+
+async def _plan_line(line_no: int, line: str) -> str:
+    try:
+        payload = PlanRequest.model_validate_json(line)
+    except ValidationError as exc:
+        record: dict[str, Any] = {
+            "line": line_no,
+            "error": "invalid_request",
+            "detail": exc.errors(include_url=False, include_context=False, include_input=False),
+        }
+    else:
+        try:
+            record = {"line": line_no, "result": await agenerate_plan(payload.model_dump())}
+        except Exception as exc:
+            # One failing line must not end the stream for the lines after it.
+            LOGGER.exception("batch line %s failed", line_no)
+            record = {"line": line_no, "error": "plan_failed", "detail": f"{exc.__class__.__name__}: {exc}"}
+    return json.dumps(record, ensure_ascii=False)
+
+
+async def astream_batch(lines: Iterable[str], *, concurrency: int) -> AsyncIterator[str]:
+    """Plan JSONL requests with at most ``concurrency`` in flight, yielding results in input order."""
+    pending: deque[asyncio.Task[str]] = deque()
+    try:
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            pending.append(asyncio.create_task(_plan_line(line_no, line)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft() + "\n"
+        while pending:
+            yield await pending.popleft() + "\n"
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+from .metrics import METRICS, Sample
+from .settings import get_settings
+
+BlobKey = tuple[str, str, str, Any]
+WritesKey = tuple[str, str, str]
+
+
+def _thread_id(config: RunnableConfig) -> str:
+    return str(config["configurable"]["thread_id"])
+
+
+class BoundedInMemorySaver(InMemorySaver):
+    """``InMemorySaver`` with LRU and idle-TTL retention per thread.
+
+    At most ``max_threads`` threads are kept; a thread untouched for
+    ``ttl_seconds`` is dropped on the next access. Blob and write keys are
+    indexed per thread, so eviction does not scan the whole store.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self.max_threads = max(1, max_threads)
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._clock = clock
+        self._access: OrderedDict[str, float] = OrderedDict()
+        self._blob_keys: dict[str, set[BlobKey]] = {}
+        self._write_keys: dict[str, set[WritesKey]] = {}
+        self._lock = threading.RLock()
+
+    def _touch(self, thread_id: str) -> None:
+        self._access[thread_id] = self._clock()
+        self._access.move_to_end(thread_id)
+
+    def _evict(self) -> None:
+        deadline = self._clock() - self.ttl_seconds
+        while self._access:
+            thread_id, last_access = next(iter(self._access.items()))
+            if len(self._access) <= self.max_threads and last_access > deadline:
+                break
+            self._forget(thread_id)
+            self.evictions += 1
+
+    def _forget(self, thread_id: str) -> None:
+        """Drop a thread from memory."""
+        self._access.pop(thread_id, None)
+        self.storage.pop(thread_id, None)
+        for key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        for key in self._write_keys.pop(thread_id, ()):
+            self.writes.pop(key, None)
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with self._lock:
+            self._evict()
+            # InMemorySaver's lookup creates an empty entry for unknown threads; track it so it ages out.
+            self._touch(_thread_id(config))
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            self._evict()
+            items = list(super().list(config, filter=filter, before=before, limit=limit))
+        return iter(items)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            thread_id = _thread_id(config)
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            keys = self._blob_keys.setdefault(thread_id, set())
+            keys.update((thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items())
+            self._touch(thread_id)
+            self._evict()
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Any,
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            thread_id = _thread_id(config)
+            super().put_writes(config, writes, task_id, task_path)
+            outer_key = (thread_id, config["configurable"].get("checkpoint_ns", ""), config["configurable"]["checkpoint_id"])
+            self._write_keys.setdefault(thread_id, set()).add(outer_key)
+            self._touch(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._forget(str(thread_id))
+
+    def close(self) -> None:
+        """Nothing to release in memory; present for symmetry with SQLiteCheckpointSaver."""
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"threads": len(self._access), "evictions": self.evictions}
+
+
+class SQLiteCheckpointSaver(BoundedInMemorySaver):
+    """Checkpoints persisted to SQLite (WAL) behind a bounded in-memory cache.
+
+    Writes are buffered and flushed in one transaction once ``batch_size``
+    rows are pending or ``flush_interval_seconds`` has passed (a daemon
+    thread covers idle periods; ``close`` flushes the rest). A thread that
+    is not in memory is loaded from disk on first use. On disk, threads
+    beyond ``max_threads`` (least recently used first) or idle longer than
+    ``ttl_seconds`` are pruned at flush time. ``list(None)`` only sees
+    threads currently in memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_threads: int,
+        ttl_seconds: float,
+        memory_threads: int = 1024,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(max_threads=min(memory_threads, max_threads), ttl_seconds=ttl_seconds, clock=clock)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.disk_max_threads = max(1, max_threads)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flushes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS threads (thread_id TEXT PRIMARY KEY, last_access REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS threads_last_access ON threads(last_access);"
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, checkpoint_type TEXT, checkpoint BLOB,"
+            "metadata_type TEXT, metadata BLOB, parent_id TEXT,"
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id));"
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "thread_id TEXT, checkpoint_ns TEXT, channel TEXT, version, value_type TEXT, value BLOB,"
+            "PRIMARY KEY (thread_id, checkpoint_ns, channel, version));"
+            "CREATE TABLE IF NOT EXISTS writes ("
+            "thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, task_id TEXT, idx INTEGER, channel TEXT,"
+            "value_type TEXT, value BLOB, task_path TEXT,"
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx));"
+        )
+        self._loaded: set[str] = set()
+        self._pending_threads: dict[str, float] = {}
+        self._pending_checkpoints: list[tuple[Any, ...]] = []
+        self._pending_blobs: list[tuple[Any, ...]] = []
+        self._pending_writes: list[tuple[Any, ...]] = []
+        self._last_flush = self._clock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="checkpoint-flusher", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def _pending_rows(self) -> int:
+        return len(self._pending_checkpoints) + len(self._pending_blobs) + len(self._pending_writes)
+
+    def _maybe_flush(self) -> None:
+        if self._pending_rows() >= self.batch_size or self._clock() - self._last_flush >= self.flush_interval_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._last_flush = self._clock()
+            if not self._pending_threads:
+                return
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._pending_checkpoints)
+                self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", self._pending_blobs)
+                self._conn.executemany("INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending_writes)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO threads (thread_id, last_access) VALUES (?, ?)",
+                    list(self._pending_threads.items()),
+                )
+                self._prune()
+            self._pending_threads.clear()
+            self._pending_checkpoints.clear()
+            self._pending_blobs.clear()
+            self._pending_writes.clear()
+            self.flushes += 1
+
+    def _prune(self) -> None:
+        stale = self._conn.execute(
+            "SELECT thread_id FROM threads WHERE last_access <= ? UNION "
+            "SELECT thread_id FROM (SELECT thread_id FROM threads ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self._clock() - self.ttl_seconds, self.disk_max_threads),
+        ).fetchall()
+        for (thread_id,) in stale:
+            self._delete_rows(thread_id)
+
+    def _delete_rows(self, thread_id: str) -> None:
+        for table in ("threads", "checkpoints", "blobs", "writes"):
+            self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def _forget(self, thread_id: str) -> None:
+        if thread_id in self._pending_threads:
+            self.flush()
+        self._loaded.discard(thread_id)
+        super()._forget(thread_id)
+
+    def _ensure_loaded(self, thread_id: str) -> None:
+        if thread_id in self._loaded:
+            return
+        self._loaded.add(thread_id)
+        row = self._conn.execute("SELECT last_access FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        if row is None:
+            return
+        if row[0] <= self._clock() - self.ttl_seconds:
+            with self._conn:
+                self._delete_rows(thread_id)
+            return
+        for ns, checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata, parent_id in self._conn.execute(
+            "SELECT checkpoint_ns, checkpoint_id, checkpoint_type, checkpoint, metadata_type, metadata, parent_id "
+            "FROM checkpoints WHERE thread_id = ?",
+            (thread_id,),
+        ):
+            self.storage[thread_id][ns][checkpoint_id] = ((checkpoint_type, checkpoint), (metadata_type, metadata), parent_id)
+        blob_keys = self._blob_keys.setdefault(thread_id, set())
+        for ns, channel, version, value_type, value in self._conn.execute(
+            "SELECT checkpoint_ns, channel, version, value_type, value FROM blobs WHERE thread_id = ?",
+            (thread_id,),
+        ):
+            key = (thread_id, ns, channel, version)
+            self.blobs[key] = (value_type, value)
+            blob_keys.add(key)
+        write_keys = self._write_keys.setdefault(thread_id, set())
+        for ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path in self._conn.execute(
+            "SELECT checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, task_path "
+            "FROM writes WHERE thread_id = ?",
+            (thread_id,),
+        ):
+            key = (thread_id, ns, checkpoint_id)
+            self.writes[key][(task_id, idx)] = (task_id, channel, (value_type, value), task_path)
+            write_keys.add(key)
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with self._lock:
+            self._ensure_loaded(_thread_id(config))
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config is not None:
+                self._ensure_loaded(_thread_id(config))
+            return super().list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            thread_id = _thread_id(config)
+            self._ensure_loaded(thread_id)
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            (checkpoint_type, data), (metadata_type, metadata_data), parent_id = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+            self._pending_checkpoints.append(
+                (thread_id, checkpoint_ns, checkpoint["id"], checkpoint_type, data, metadata_type, metadata_data, parent_id)
+            )
+            for channel, version in new_versions.items():
+                value_type, value = self.blobs[(thread_id, checkpoint_ns, channel, version)]
+                self._pending_blobs.append((thread_id, checkpoint_ns, channel, version, value_type, value))
+            self._pending_threads[thread_id] = self._clock()
+            self._maybe_flush()
+            return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Any,
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._lock:
+            thread_id = _thread_id(config)
+            self._ensure_loaded(thread_id)
+            super().put_writes(config, writes, task_id, task_path)
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            checkpoint_id = config["configurable"]["checkpoint_id"]
+            for (write_task, idx), (_, channel, (value_type, value), path) in self.writes[(thread_id, checkpoint_ns, checkpoint_id)].items():
+                if write_task == task_id:
+                    self._pending_writes.append(
+                        (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, value_type, value, path)
+                    )
+            self._pending_threads[thread_id] = self._clock()
+            self._maybe_flush()
+
+    def delete_thread(self, thread_id: str) -> None:
+        thread_id = str(thread_id)
+        with self._lock:
+            self._pending_threads.pop(thread_id, None)
+            self._pending_checkpoints = [row for row in self._pending_checkpoints if row[0] != thread_id]
+            self._pending_blobs = [row for row in self._pending_blobs if row[0] != thread_id]
+            self._pending_writes = [row for row in self._pending_writes if row[0] != thread_id]
+            super().delete_thread(thread_id)
+            with self._conn:
+                self._delete_rows(thread_id)
+
+    def close(self) -> None:
+        """Stop the flusher, write what is pending and release the connection; safe to call twice."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            disk_threads = self._conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+            return {**super().stats(), "disk_threads": disk_threads, "flushes": self.flushes}
+
+
+@lru_cache(maxsize=1)
+def get_checkpointer() -> BoundedInMemorySaver:
+    settings = get_settings()
+    if settings.plan_graph_checkpointer == "sqlite":
+        return SQLiteCheckpointSaver(
+            settings.plan_graph_checkpoint_path,
+            max_threads=settings.plan_graph_checkpoint_max_threads,
+            ttl_seconds=settings.plan_graph_checkpoint_ttl_seconds,
+        )
+    return BoundedInMemorySaver(
+        max_threads=settings.plan_graph_checkpoint_max_threads,
+        ttl_seconds=settings.plan_graph_checkpoint_ttl_seconds,
+    )
+
+
+def close_checkpointer() -> None:
+    """Flush and drop the process checkpointer, if one was created."""
+    if get_checkpointer.cache_info().currsize:
+        get_checkpointer().close()
+        get_checkpointer.cache_clear()
+
+
+def _checkpointer_samples() -> list[Sample]:
+    if not get_checkpointer.cache_info().currsize:
+        return []
+    stats = get_checkpointer().stats()
+    return [
+        ("plan_checkpoint_threads", "gauge", "Plan graph threads held in memory.", {}, stats["threads"]),
+        ("plan_checkpoint_evictions_total", "counter", "Threads evicted from memory.", {}, stats["evictions"]),
+        ("plan_checkpoint_disk_threads", "gauge", "Plan graph threads stored in SQLite.", {}, stats.get("disk_threads")),
+    ]
+
+
+METRICS.register_collector(_checkpointer_samples)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one upstream.
+
+    ``failure_threshold`` consecutive failures open the circuit; callers are
+    then refused without touching the network. After ``recovery_seconds``
+    the circuit turns half-open and lets ``half_open_max_calls`` probes
+    through: a success closes it, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        recovery_seconds: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self.opens = 0
+        self.rejected = 0
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through (does not reserve a probe)."""
+        with self._lock:
+            self._refresh()
+            return self._state == CLOSED or (self._state == HALF_OPEN and self._probes < self.half_open_max_calls)
+
+    def acquire(self) -> bool:
+        """Reserve permission for one call; counts a probe while half-open."""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open probe whose call was cancelled before finishing."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = CLOSED
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            # Late failures from calls already in flight must not push the recovery window back.
+            if self._state == OPEN:
+                return
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self.opens += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {"state": self.state, "opens": self.opens, "rejected": self.rejected}
@@ -1,8 +1,12 @@
 import json
+from collections.abc import AsyncIterator
+from time import perf_counter
 from typing import Any
 
 import httpx
 
+from .metrics import DEEPSEEK_HTTP_SECONDS, DEEPSEEK_PARSE_SECONDS
+from .prompt import TOKEN_STATS, PromptBudgetExceeded, build_messages
 from .settings import Settings
 
 
@@ -10,6 +14,10 @@ class DeepSeekClientError(RuntimeError):
     """Raised when DeepSeek API returns unexpected output."""
 
 
+class DeepSeekRequestError(DeepSeekClientError):
+    """Raised before any network call when the request cannot be sent (no API key, prompt over budget)."""
+
+
 def _build_endpoint(base: str, path: str) -> str:
     return f"{base.rstrip('/')}/{path.lstrip('/')}"
 
@@ -29,79 +37,212 @@ def _is_valid_plan(payload: dict[str, Any]) -> bool:
     return all(key in payload for key in required_top)
 
 
-def _build_messages(request_payload: dict[str, Any], baseline_plan: dict[str, Any]) -> list[dict[str, str]]:
-    schema = {
-        "status": "ok",
-        "request_summary": {
-            "destination": "string",
-            "days": 3,
-            "travelers": 2,
-            "budget_cny": 9000,
-            "preferences": ["美食", "轻松节奏"],
-        },
-        "itinerary": [
-            {"day": 1, "morning": "景点A", "afternoon": "景点B", "evening": "活动C"}
-        ],
-        "price_breakdown": {
-            "transport": 0,
-            "hotel": 0,
-            "tickets": 0,
-            "meals": 0,
-            "service_fee": 0,
-            "total": 0,
-        },
-        "risk_flags": ["budget_exceeded"],
-        "handoff_to_human": False,
-    }
-
-    system_prompt = (
-        "你是旅游规划SaaS后端助手。"
-        "必须仅返回JSON对象，不要解释、不要markdown代码块。"
-        "输出字段必须严格匹配给定schema，金额使用CNY数字。"
-        "行程节奏要合理，避免不现实的跨城安排。"
-    )
-    user_prompt = (
-        "请根据请求生成可售卖行程结果。\n"
-        f"请求:\n{json.dumps(request_payload, ensure_ascii=False)}\n"
-        f"可参考的基线方案:\n{json.dumps(baseline_plan, ensure_ascii=False)}\n"
-        f"返回schema:\n{json.dumps(schema, ensure_ascii=False)}"
-    )
-    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+def _build_messages(
+    request_payload: dict[str, Any],
+    baseline_plan: dict[str, Any],
+    token_budget: int = 0,
+) -> list[dict[str, str]]:
+    try:
+        messages, tokens, truncated = build_messages(request_payload, baseline_plan, token_budget=token_budget)
+    except PromptBudgetExceeded as exc:
+        TOKEN_STATS.record_over_budget()
+        raise DeepSeekRequestError(str(exc)) from exc
+    TOKEN_STATS.record_prompt(tokens, truncated)
+    return messages
 
 
-def generate_with_deepseek(
+def _build_request(
     request_payload: dict[str, Any],
     baseline_plan: dict[str, Any],
     settings: Settings,
-) -> dict[str, Any]:
+) -> tuple[str, dict[str, Any], dict[str, str]]:
     if not settings.deepseek_api_key:
-        raise DeepSeekClientError("DEEPSEEK_API_KEY is empty.")
+        raise DeepSeekRequestError("DEEPSEEK_API_KEY is empty.")
 
     endpoint = _build_endpoint(settings.deepseek_api_base, settings.deepseek_chat_path)
     body = {
         "model": settings.deepseek_model,
         "temperature": 0.2,
-        "messages": _build_messages(request_payload, baseline_plan),
+        "messages": _build_messages(request_payload, baseline_plan, settings.prompt_token_budget),
         "response_format": {"type": "json_object"},
     }
     headers = {"Authorization": f"Bearer {settings.deepseek_api_key}", "Content-Type": "application/json"}
+    return endpoint, body, headers
 
+
+def _timed_parse(response: httpx.Response, mode: str) -> dict[str, Any]:
+    started = perf_counter()
     try:
-        response = httpx.post(endpoint, json=body, headers=headers, timeout=settings.deepseek_timeout_seconds)
-        response.raise_for_status()
-    except httpx.HTTPError as exc:
-        raise DeepSeekClientError(f"DeepSeek request failed: {exc.__class__.__name__}") from exc
+        return _parse_response(response)
+    finally:
+        DEEPSEEK_PARSE_SECONDS.observe(perf_counter() - started, mode)
+
 
-    data = response.json()
+def _parse_response(response: httpx.Response) -> dict[str, Any]:
     try:
+        data = response.json()
+        TOKEN_STATS.record_usage(data.get("usage"))
         content = data["choices"][0]["message"]["content"]
+    # AttributeError: a non-object body; ValueError: bad JSON or non-numeric usage counts.
+    except (KeyError, IndexError, TypeError, AttributeError, ValueError) as exc:
+        raise DeepSeekClientError("DeepSeek response parsing failed.") from exc
+    return parse_plan_content(content)
+
+
+def parse_plan_content(content: str) -> dict[str, Any]:
+    try:
         parsed = _extract_json(content)
-    except (KeyError, IndexError, TypeError, json.JSONDecodeError) as exc:
+    except (TypeError, json.JSONDecodeError) as exc:
         raise DeepSeekClientError("DeepSeek response parsing failed.") from exc
 
-    if not _is_valid_plan(parsed):
+    if not isinstance(parsed, dict) or not _is_valid_plan(parsed):
         raise DeepSeekClientError("DeepSeek response missing required fields.")
 
     parsed["provider"] = "deepseek"
     return parsed
 
+
+def generate_with_deepseek(
+    request_payload: dict[str, Any],
+    baseline_plan: dict[str, Any],
+    settings: Settings,
+) -> dict[str, Any]:
+    endpoint, body, headers = _build_request(request_payload, baseline_plan, settings)
+
+    started = perf_counter()
+    try:
+        response = httpx.post(endpoint, json=body, headers=headers, timeout=settings.deepseek_timeout_seconds)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise DeepSeekClientError(f"DeepSeek request failed: {exc.__class__.__name__}") from exc
+    finally:
+        DEEPSEEK_HTTP_SECONDS.observe(perf_counter() - started, "sync")
+
+    return _timed_parse(response, "sync")
+
+
+_ASYNC_CLIENT: httpx.AsyncClient | None = None
+
+
+def create_async_client(settings: Settings) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.deepseek_max_connections,
+        max_keepalive_connections=settings.deepseek_max_keepalive_connections,
+        keepalive_expiry=settings.deepseek_keepalive_expiry_seconds,
+    )
+    return httpx.AsyncClient(
+        http2=settings.deepseek_http2,
+        limits=limits,
+        timeout=settings.deepseek_timeout_seconds,
+    )
+
+
+async def open_async_client(settings: Settings) -> httpx.AsyncClient:
+    """Create the process-wide pooled client; called from the FastAPI lifespan."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None or _ASYNC_CLIENT.is_closed:
+        _ASYNC_CLIENT = create_async_client(settings)
+    return _ASYNC_CLIENT
+
+
+async def close_async_client() -> None:
+    global _ASYNC_CLIENT
+    client, _ASYNC_CLIENT = _ASYNC_CLIENT, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def _apost(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    body: dict[str, Any],
+    headers: dict[str, str],
+    settings: Settings,
+) -> httpx.Response:
+    started = perf_counter()
+    try:
+        response = await client.post(endpoint, json=body, headers=headers, timeout=settings.deepseek_timeout_seconds)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise DeepSeekClientError(f"DeepSeek request failed: {exc.__class__.__name__}") from exc
+    finally:
+        DEEPSEEK_HTTP_SECONDS.observe(perf_counter() - started, "async")
+    return response
+
+
+async def generate_with_deepseek_async(
+    request_payload: dict[str, Any],
+    baseline_plan: dict[str, Any],
+    settings: Settings,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    endpoint, body, headers = _build_request(request_payload, baseline_plan, settings)
+
+    shared = client or _ASYNC_CLIENT
+    if shared is not None and not shared.is_closed:
+        response = await _apost(shared, endpoint, body, headers, settings)
+    else:
+        # No lifespan-managed pool (scripts, tests): use a short-lived client.
+        async with create_async_client(settings) as temporary:
+            response = await _apost(temporary, endpoint, body, headers, settings)
+
+    return _timed_parse(response, "async")
+
+
+def _parse_stream_line(line: str) -> str | None:
+    """Return the content delta of one SSE line, or None for non-content lines."""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    try:
+        chunk = json.loads(data)
+        if chunk.get("usage"):
+            TOKEN_STATS.record_usage(chunk["usage"])
+        if not chunk["choices"]:
+            return None
+        return chunk["choices"][0]["delta"].get("content") or None
+    except (KeyError, IndexError, TypeError, AttributeError, ValueError) as exc:
+        raise DeepSeekClientError("DeepSeek stream chunk parsing failed.") from exc
+
+
+async def _astream_lines(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    body: dict[str, Any],
+    headers: dict[str, str],
+    settings: Settings,
+) -> AsyncIterator[str]:
+    try:
+        async with client.stream(
+            "POST", endpoint, json=body, headers=headers, timeout=settings.deepseek_timeout_seconds
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                delta = _parse_stream_line(line)
+                if delta:
+                    yield delta
+    except httpx.HTTPError as exc:
+        raise DeepSeekClientError(f"DeepSeek request failed: {exc.__class__.__name__}") from exc
+
+
+async def astream_deepseek_content(
+    request_payload: dict[str, Any],
+    baseline_plan: dict[str, Any],
+    settings: Settings,
+    client: httpx.AsyncClient | None = None,
+) -> AsyncIterator[str]:
+    """Yield completion content deltas from a ``stream: true`` chat request."""
+    endpoint, body, headers = _build_request(request_payload, baseline_plan, settings)
+    body["stream"] = True
+    body["stream_options"] = {"include_usage": True}
+
+    shared = client or _ASYNC_CLIENT
+    if shared is not None and not shared.is_closed:
+        async for delta in _astream_lines(shared, endpoint, body, headers, settings):
+            yield delta
+    else:
+        async with create_async_client(settings) as temporary:
+            async for delta in _astream_lines(temporary, endpoint, body, headers, settings):
+                yield delta
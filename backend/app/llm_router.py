@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, replace
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any
+
+from .circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker
+from .deepseek_client import DeepSeekClientError, DeepSeekRequestError, _is_valid_plan
+from .metrics import METRICS, Sample
+from .settings import Settings, get_settings
+
+LOGGER = logging.getLogger(__name__)
+
+EWMA_ALPHA = 0.2
+LATENCY_WINDOW = 256
+MIN_HEDGE_SAMPLES = 20
+MIN_TIMEOUT_SAMPLES = 20
+TIMEOUT_MULTIPLIER = 2.0
+
+PlanCall = Callable[[dict[str, Any], dict[str, Any], Settings], dict[str, Any]]
+AsyncPlanCall = Callable[[dict[str, Any], dict[str, Any], Settings], Awaitable[dict[str, Any]]]
+StreamCall = Callable[[dict[str, Any], dict[str, Any], Settings], AsyncIterator[str]]
+
+
+@dataclass(frozen=True)
+class LLMProvider:
+    """One OpenAI-compatible endpoint, expressed as a Settings overlay."""
+
+    name: str
+    settings: Settings
+
+
+def load_providers(settings: Settings) -> list[LLMProvider]:
+    """Providers from ``LLM_PROVIDERS`` (JSON list), or the DEEPSEEK_* endpoint alone.
+
+    Each entry may set ``name``, ``api_base``, ``chat_path``, ``model``,
+    ``timeout_seconds`` and ``api_key`` or ``api_key_env``; missing fields
+    inherit the DEEPSEEK_* values.
+    """
+    if not settings.llm_providers:
+        return [LLMProvider("deepseek", settings)]
+
+    entries = json.loads(settings.llm_providers)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("LLM_PROVIDERS must be a non-empty JSON list.")
+
+    providers = []
+    for position, entry in enumerate(entries):
+        api_key = entry.get("api_key") or os.environ.get(entry.get("api_key_env", ""), "")
+        provider_settings = replace(
+            settings,
+            deepseek_api_base=entry.get("api_base", settings.deepseek_api_base),
+            deepseek_chat_path=entry.get("chat_path", settings.deepseek_chat_path),
+            deepseek_model=entry.get("model", settings.deepseek_model),
+            deepseek_timeout_seconds=float(entry.get("timeout_seconds", settings.deepseek_timeout_seconds)),
+            deepseek_api_key=(api_key or settings.deepseek_api_key).strip(),
+        )
+        providers.append(LLMProvider(entry.get("name") or f"provider{position}", provider_settings))
+    return providers
+
+
+class ProviderStats:
+    """EWMA latency and error rate, plus a window of latencies for percentiles."""
+
+    def __init__(self) -> None:
+        self.ewma_latency: float | None = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+            if not ok:
+                return
+            self._latencies.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += EWMA_ALPHA * (latency - self.ewma_latency)
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, fraction: float) -> float | None:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def score(self) -> float:
+        """Expected seconds per successful call; unmeasured providers rank last."""
+        if self.ewma_latency is None:
+            return math.inf
+        return self.ewma_latency / max(1.0 - self.error_rate, 0.05)
+
+
+class LLMRouter:
+    """Pick the fastest healthy provider and hedge its slow tail.
+
+    The primary gets the request first. If it has not answered within its
+    observed p95 latency, one hedged request goes to the next provider (or
+    the same one, when only one is configured); the first valid plan wins
+    and the other request is cancelled. Failed calls fail over to the next
+    provider in rank order; a lone provider is hedged but never retried.
+
+    Each provider can sit behind a circuit breaker: open providers are
+    skipped, and when every circuit is open the router reports itself
+    unavailable so callers fall back without waiting. Call timeouts adapt
+    to the provider's p99 latency, between ``min_timeout_seconds`` and the
+    configured timeout; half-open probes always get the full timeout.
+    ``DeepSeekRequestError`` never reached the network, so it is passed on
+    without touching the provider's stats or breaker.
+    """
+
+    def __init__(
+        self,
+        providers: list[LLMProvider],
+        *,
+        hedge_enabled: bool,
+        hedge_delay_seconds: float,
+        min_timeout_seconds: float = 0.0,
+        breaker_factory: Callable[[], CircuitBreaker] | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider.")
+        self.providers = providers
+        self.hedge_enabled = hedge_enabled
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.min_timeout_seconds = min_timeout_seconds
+        self.hedges = 0
+        self._clock = clock
+        self._stats = {provider.name: ProviderStats() for provider in providers}
+        self._breakers = {provider.name: breaker_factory() for provider in providers} if breaker_factory else {}
+
+    def ranked(self) -> list[LLMProvider]:
+        order = {provider.name: position for position, provider in enumerate(self.providers)}
+        return sorted(self.providers, key=lambda provider: (self._stats[provider.name].score(), order[provider.name]))
+
+    def _allowed(self, provider: LLMProvider) -> bool:
+        breaker = self._breakers.get(provider.name)
+        return breaker is None or breaker.available()
+
+    def available(self) -> bool:
+        """False when every provider's circuit is open."""
+        return any(self._allowed(provider) for provider in self.providers)
+
+    def candidates(self) -> list[LLMProvider]:
+        return [provider for provider in self.ranked() if self._allowed(provider)]
+
+    def acquire(self, provider: LLMProvider) -> bool:
+        breaker = self._breakers.get(provider.name)
+        return breaker is None or breaker.acquire()
+
+    def release(self, provider: LLMProvider) -> None:
+        breaker = self._breakers.get(provider.name)
+        if breaker is not None:
+            breaker.release()
+
+    def call_timeout(self, provider: LLMProvider) -> float:
+        ceiling = provider.settings.deepseek_timeout_seconds
+        breaker = self._breakers.get(provider.name)
+        stats = self._stats[provider.name]
+        if self.min_timeout_seconds <= 0 or stats.samples < MIN_TIMEOUT_SAMPLES:
+            return ceiling
+        if breaker is not None and breaker.state == HALF_OPEN:
+            return ceiling
+        p99 = stats.percentile(0.99) or ceiling
+        return min(ceiling, max(self.min_timeout_seconds, p99 * TIMEOUT_MULTIPLIER))
+
+    def _call_settings(self, provider: LLMProvider, timeout: float) -> Settings:
+        if timeout == provider.settings.deepseek_timeout_seconds:
+            return provider.settings
+        return replace(provider.settings, deepseek_timeout_seconds=timeout)
+
+    def record(self, provider: LLMProvider, latency: float, ok: bool, timeout: float | None = None) -> None:
+        stats = self._stats[provider.name]
+        stats.record(latency, ok)
+        if not ok and timeout is not None and latency >= timeout * 0.9:
+            # A timed-out call is a lower bound on latency; keep it so the
+            # adaptive timeout can grow back when the provider slows down.
+            stats.observe(latency)
+        breaker = self._breakers.get(provider.name)
+        if breaker is not None:
+            if ok:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    def hedge_delay(self, provider: LLMProvider) -> float:
+        stats = self._stats[provider.name]
+        p95 = stats.percentile(0.95) if stats.samples >= MIN_HEDGE_SAMPLES else None
+        delay = self.hedge_delay_seconds if p95 is None else p95
+        return min(delay, provider.settings.deepseek_timeout_seconds)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "hedges": self.hedges,
+            "providers": {
+                provider.name: {
+                    "calls": self._stats[provider.name].calls,
+                    "ewma_latency_seconds": self._stats[provider.name].ewma_latency,
+                    "error_rate": self._stats[provider.name].error_rate,
+                    "p95_seconds": self._stats[provider.name].percentile(0.95),
+                    "timeout_seconds": self.call_timeout(provider),
+                    "circuit": self._breakers[provider.name].stats() if provider.name in self._breakers else None,
+                }
+                for provider in self.providers
+            },
+        }
+
+    def generate(self, request: dict[str, Any], baseline: dict[str, Any], call: PlanCall) -> dict[str, Any]:
+        """Blocking path: try providers in rank order, without hedging."""
+        last_error: DeepSeekClientError | None = None
+        for provider in self.candidates():
+            if not self.acquire(provider):
+                continue
+            timeout = self.call_timeout(provider)
+            started = self._clock()
+            try:
+                result = call(request, baseline, self._call_settings(provider, timeout))
+                if not _is_valid_plan(result):
+                    raise DeepSeekClientError("DeepSeek response missing required fields.")
+            except DeepSeekRequestError as exc:
+                self.release(provider)
+                last_error = exc
+                continue
+            except DeepSeekClientError as exc:
+                self.record(provider, self._clock() - started, ok=False, timeout=timeout)
+                last_error = exc
+                continue
+            except BaseException:
+                # Unexpected errors are not the provider's fault, but must not strand a half-open probe.
+                self.release(provider)
+                raise
+            self.record(provider, self._clock() - started, ok=True)
+            return result
+        raise last_error or DeepSeekClientError("No LLM provider available (circuit open).")
+
+    async def _timed(
+        self,
+        provider: LLMProvider,
+        call: AsyncPlanCall,
+        request: dict[str, Any],
+        baseline: dict[str, Any],
+    ) -> dict[str, Any]:
+        timeout = self.call_timeout(provider)
+        started = self._clock()
+        try:
+            result = await call(request, baseline, self._call_settings(provider, timeout))
+            if not _is_valid_plan(result):
+                raise DeepSeekClientError("DeepSeek response missing required fields.")
+        except DeepSeekRequestError:
+            self.release(provider)
+            raise
+        except DeepSeekClientError:
+            self.record(provider, self._clock() - started, ok=False, timeout=timeout)
+            raise
+        except BaseException:
+            # Cancelled hedges and unexpected errors give the probe slot back.
+            self.release(provider)
+            raise
+        self.record(provider, self._clock() - started, ok=True)
+        return result
+
+    async def agenerate(self, request: dict[str, Any], baseline: dict[str, Any], call: AsyncPlanCall) -> dict[str, Any]:
+        candidates = deque(self.candidates())
+        tasks: dict[asyncio.Future[dict[str, Any]], LLMProvider] = {}
+
+        def launch(provider: LLMProvider) -> bool:
+            if not self.acquire(provider):
+                return False
+            task = asyncio.ensure_future(self._timed(provider, call, request, baseline))
+            # Losers may finish with an error nobody awaits; mark it retrieved.
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            tasks[task] = provider
+            return True
+
+        def launch_next() -> bool:
+            while candidates:
+                if launch(candidates.popleft()):
+                    return True
+            return False
+
+        if not launch_next():
+            raise DeepSeekClientError("No LLM provider available (circuit open).")
+        primary = next(iter(tasks.values()))
+        hedged = not self.hedge_enabled
+        last_error: DeepSeekClientError | None = None
+        try:
+            while tasks:
+                timeout = None if hedged else self.hedge_delay(primary)
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    if launch_next() or launch(primary):
+                        self.hedges += 1
+                        LOGGER.debug("hedging %s after %.2fs", primary.name, timeout)
+                    continue
+                for task in done:
+                    tasks.pop(task)
+                    try:
+                        return task.result()
+                    except DeepSeekClientError as exc:
+                        last_error = exc
+                if not tasks:
+                    hedged = True
+                    launch_next()
+            raise last_error or DeepSeekClientError("No LLM provider available (circuit open).")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def astream(self, request: dict[str, Any], baseline: dict[str, Any], stream: StreamCall) -> AsyncIterator[str]:
+        """Stream content deltas from the best available provider.
+
+        Deltas are forwarded as they arrive, so a stream is never hedged or
+        retried; its outcome still feeds the provider's stats and breaker.
+        """
+        provider = next((candidate for candidate in self.candidates() if self.acquire(candidate)), None)
+        if provider is None:
+            raise DeepSeekClientError("No LLM provider available (circuit open).")
+        timeout = self.call_timeout(provider)
+        started = self._clock()
+        try:
+            async for delta in stream(request, baseline, self._call_settings(provider, timeout)):
+                yield delta
+        except DeepSeekRequestError:
+            self.release(provider)
+            raise
+        except DeepSeekClientError:
+            self.record(provider, self._clock() - started, ok=False, timeout=timeout)
+            raise
+        except BaseException:
+            # Cancellation, an abandoned stream or an unexpected error give the probe slot back.
+            self.release(provider)
+            raise
+        self.record(provider, self._clock() - started, ok=True)
+
+
+def _breaker_factory(settings: Settings) -> Callable[[], CircuitBreaker] | None:
+    if not settings.circuit_breaker_enabled:
+        return None
+    return lambda: CircuitBreaker(
+        failure_threshold=settings.circuit_failure_threshold,
+        recovery_seconds=settings.circuit_recovery_seconds,
+    )
+
+
+_ROUTER: LLMRouter | None = None
+_ROUTER_SETTINGS: Settings | None = None
+
+
+def get_llm_router() -> LLMRouter:
+    """Process-wide router; rebuilt when the settings object changes."""
+    global _ROUTER, _ROUTER_SETTINGS
+    settings = get_settings()
+    if _ROUTER is None or _ROUTER_SETTINGS is not settings:
+        _ROUTER = LLMRouter(
+            load_providers(settings),
+            hedge_enabled=settings.llm_hedge_enabled,
+            hedge_delay_seconds=settings.llm_hedge_delay_seconds,
+            min_timeout_seconds=settings.deepseek_min_timeout_seconds,
+            breaker_factory=_breaker_factory(settings),
+        )
+        _ROUTER_SETTINGS = settings
+    return _ROUTER
+
+
+def _router_samples() -> list[Sample]:
+    if _ROUTER is None:
+        return []
+    stats = _ROUTER.stats()
+    samples: list[Sample] = [("llm_hedges_total", "counter", "Hedged LLM requests.", {}, stats["hedges"])]
+    for name, provider in stats["providers"].items():
+        labels = {"provider": name}
+        samples += [
+            ("llm_provider_calls_total", "counter", "LLM calls per provider.", labels, provider["calls"]),
+            ("llm_provider_ewma_latency_seconds", "gauge", "EWMA latency of successful calls.", labels, provider["ewma_latency_seconds"]),
+            ("llm_provider_error_rate", "gauge", "EWMA error rate.", labels, provider["error_rate"]),
+            ("llm_provider_p95_seconds", "gauge", "p95 latency over the recent window.", labels, provider["p95_seconds"]),
+            ("llm_provider_timeout_seconds", "gauge", "Current adaptive call timeout.", labels, provider["timeout_seconds"]),
+        ]
+        circuit = provider["circuit"]
+        if circuit is not None:
+            samples += [
+                ("llm_circuit_open", "gauge", "1 while the provider circuit is open or half-open.", labels, float(circuit["state"] != CLOSED)),
+                ("llm_circuit_opens_total", "counter", "Times the provider circuit opened.", labels, circuit["opens"]),
+                ("llm_circuit_rejected_total", "counter", "Calls refused by an open circuit.", labels, circuit["rejected"]),
+            ]
+    return samples
+
+
+METRICS.register_collector(_router_samples)
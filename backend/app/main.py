@@ -1,11 +1,28 @@
+import asyncio
+import json
+import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from time import perf_counter
 from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-from .plan_service import generate_plan
-from .schemas import HealthResponse, PlanRequest
+from .batch_service import astream_batch, iter_spooled_lines, spool_body
+from .checkpointers import close_checkpointer
+from .deepseek_client import close_async_client, open_async_client
+from .metrics import METRICS
+from .plan_json import PlanJSONResponse
+from .plan_graph import UnknownPlanThread
+from .plan_service import agenerate_plan_json, arevise_plan, astream_plan
+from .schemas import HealthResponse, PlanRequest, PlanRevisionRequest
+from .settings import get_settings
+from .warmup import WARMUP, warm_up
+
+LOGGER = logging.getLogger(__name__)
 
 
 def _cors_origins() -> list[str]:
@@ -13,10 +30,32 @@ def _cors_origins() -> list[str]:
     return [item.strip() for item in origins.split(",") if item.strip()]
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    warmup_task: asyncio.Task[None] | None = None
+    if settings.app_warmup:
+        # Serve health checks while warming; /api/ready reports 503 until it finishes.
+        warmup_task = asyncio.create_task(warm_up(settings))
+    else:
+        await open_async_client(settings)
+        WARMUP.mark_ready(0.0)
+    try:
+        yield
+    finally:
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await warmup_task
+        await close_async_client()
+        close_checkpointer()
+
+
 app = FastAPI(
     title="Travel SaaS MVP API",
     version="0.2.0",
     description="旅游规划 MVP 后端服务（FastAPI）",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -33,6 +72,62 @@ def health() -> HealthResponse:
     return HealthResponse(status="ok", service="travel-saas-mvp")
 
 
-@app.post("/api/plan")
-def create_plan(payload: PlanRequest) -> dict[str, Any]:
-    return generate_plan(payload.model_dump())
+@app.get("/api/ready")
+def ready() -> JSONResponse:
+    return JSONResponse(WARMUP.stats(), status_code=200 if WARMUP.ready else 503)
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.post("/api/plan", response_class=PlanJSONResponse)
+async def create_plan(payload: PlanRequest, thread_id: str | None = None) -> PlanJSONResponse:
+    started = perf_counter()
+    body = await agenerate_plan_json(payload.model_dump(), thread_id=thread_id)
+    WARMUP.observe_request(perf_counter() - started)
+    return PlanJSONResponse(body)
+
+
+@app.post("/api/plan/revise", response_class=PlanJSONResponse)
+async def revise_plan(payload: PlanRevisionRequest) -> PlanJSONResponse:
+    try:
+        plan = await arevise_plan(payload.thread_id, payload.patch.model_dump(exclude_none=True))
+    except UnknownPlanThread:
+        raise HTTPException(status_code=404, detail="unknown thread_id") from None
+    return PlanJSONResponse(plan)
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _plan_event_stream(payload: dict[str, Any]) -> AsyncIterator[str]:
+    try:
+        async for event, data in astream_plan(payload):
+            yield _sse(event, data)
+    except Exception:
+        LOGGER.exception("plan stream failed")
+        yield _sse("error", {"message": "plan stream failed"})
+        return
+    yield _sse("done", {})
+
+
+@app.post("/api/plan/stream")
+async def stream_plan(payload: PlanRequest) -> StreamingResponse:
+    return StreamingResponse(
+        _plan_event_stream(payload.model_dump()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/plan/batch")
+async def create_plan_batch(request: Request) -> StreamingResponse:
+    settings = get_settings()
+    spool = await spool_body(request.stream())
+    return StreamingResponse(
+        astream_batch(iter_spooled_lines(spool), concurrency=settings.plan_batch_concurrency),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+import math
+import threading
+from time import perf_counter
+from typing import Any
+
+# Seconds; spans a sub-millisecond local node up to a slow LLM completion.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (name, type, help, labels, value) produced by collectors at scrape time; None values are skipped.
+Sample = tuple[str, str, str, dict[str, str], float | None]
+
+# Cleared while the app runs synthetic traffic, so it does not show up as real plans.
+_RECORDING: ContextVar[bool] = ContextVar("metrics_recording", default=True)
+
+
+@contextmanager
+def recording_paused() -> Iterator[None]:
+    """Drop counter and histogram updates made in this context (and tasks/threads started from it)."""
+    token = _RECORDING.set(False)
+    try:
+        yield
+    finally:
+        _RECORDING.reset(token)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        if not _RECORDING.get():
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, labels)))} {_format_value(value)}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is one bisect and a locked increment."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: dict[tuple[str, ...], list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not _RECORDING.get():
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((labels, list(series[0]), series[1]) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total in items:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**base, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {cumulative}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Process metrics rendered in the Prometheus text format (0.0.4).
+
+    Counters and histograms are updated on the hot path; collectors are
+    callables polled at scrape time that turn existing ``stats()`` dicts
+    into samples.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        families: dict[str, tuple[str, str, list[str]]] = {}
+        for collector in self._collectors:
+            for name, kind, help_text, labels, value in collector():
+                if value is None:
+                    continue
+                family = families.setdefault(name, (kind, help_text, []))
+                family[2].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, (kind, help_text, samples) in families.items():
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *samples])
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+PLAN_NODE_SECONDS = METRICS.histogram("plan_graph_node_seconds", "Wall time per plan graph node.", ("node",))
+DEEPSEEK_HTTP_SECONDS = METRICS.histogram("deepseek_http_seconds", "Time waiting on the DeepSeek HTTP response.", ("mode",))
+DEEPSEEK_PARSE_SECONDS = METRICS.histogram("deepseek_parse_seconds", "Time parsing and validating DeepSeek output.", ("mode",))
+PLAN_RESULTS = METRICS.counter("plan_results_total", "Plans returned by the graph, by provider.", ("provider",))
+PLAN_CACHE_LOOKUPS = METRICS.counter("plan_cache_lookups_total", "Plan cache lookups, by result.", ("result",))
+
+
+def timed_node(name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a graph node (sync or async) to record its wall time."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(state: Any) -> Any:
+            started = perf_counter()
+            try:
+                return await func(state)
+            finally:
+                PLAN_NODE_SECONDS.observe(perf_counter() - started, name)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state: Any) -> Any:
+        started = perf_counter()
+        try:
+            return func(state)
+        finally:
+            PLAN_NODE_SECONDS.observe(perf_counter() - started, name)
+
+    return wrapper
@@ -0,0 +1,303 @@
+"""Fake OpenAI-compatible ``/chat/completions`` server for local load tests.
+
+Run from the repository root::
+
+    python -m backend.app.mock_llm --port 9100 --latency lognormal:0.8,0.5 --error-rate 0.05
+
+and point ``DEEPSEEK_API_BASE`` at ``http://127.0.0.1:9100``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import random
+import threading
+import time
+from typing import Any
+
+from mvp_travel_agent.engine import generate_plan as generate_plan_local
+
+_REQUEST_PREFIX = "请求:"
+
+OK = "ok"
+ERROR = "error"
+MALFORMED = "malformed"
+RATE_LIMITED = "rate_limited"
+
+LatencySampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> LatencySampler:
+    """Build a latency sampler (seconds) from a spec string.
+
+    ``0.2`` (fixed), ``uniform:low,high``, ``normal:mean,stddev``,
+    ``lognormal:median,sigma``, ``exponential:mean``. Samples are clipped at 0.
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        if not args:
+            fixed = float(kind)
+            return lambda _rng: max(0.0, fixed)
+        params = [float(value) for value in args.split(",")]
+    except ValueError as exc:
+        raise ValueError(f"Invalid latency spec {spec!r}.") from exc
+    samplers: dict[str, tuple[int, LatencySampler]] = {
+        "uniform": (2, lambda rng: rng.uniform(params[0], params[1])),
+        "normal": (2, lambda rng: rng.gauss(params[0], params[1])),
+        "lognormal": (2, lambda rng: rng.lognormvariate(math.log(params[0]), params[1])),
+        "exponential": (1, lambda rng: rng.expovariate(1.0 / params[0])),
+    }
+    if kind not in samplers or len(params) != samplers[kind][0]:
+        raise ValueError(f"Invalid latency spec {spec!r}.")
+    sampler = samplers[kind][1]
+    return lambda rng: max(0.0, sampler(rng))
+
+
+@dataclass(frozen=True)
+class MockLLMConfig:
+    latency: str = "0"
+    error_rate: float = 0.0
+    malformed_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    stream_chunk_chars: int = 32
+    stream_chunk_delay_seconds: float = 0.0
+    seed: int | None = None
+
+
+def _request_from_messages(messages: list[dict[str, Any]]) -> dict[str, Any]:
+    for message in messages:
+        if message.get("role") != "user":
+            continue
+        for line in str(message.get("content", "")).splitlines():
+            if line.startswith(_REQUEST_PREFIX):
+                return json.loads(line[len(_REQUEST_PREFIX) :])
+    raise ValueError("no request line in user message")
+
+
+def plan_content(messages: list[dict[str, Any]]) -> str:
+    """A schema-valid plan for the request embedded in ``messages``.
+
+    Chunk requests (``day_range``) get their days numbered from the range start.
+    """
+    request = _request_from_messages(messages)
+    plan = generate_plan_local({key: value for key, value in request.items() if key != "day_range"})
+    plan.pop("provider", None)
+    day_range = request.get("day_range")
+    if day_range and plan.get("status") == "ok":
+        plan["itinerary"] = [{**day, "day": day_range[0] + index} for index, day in enumerate(plan["itinerary"])]
+    return json.dumps(plan, ensure_ascii=False)
+
+
+def _usage(content: str) -> dict[str, int]:
+    completion = len(content) // 2
+    return {"prompt_tokens": 0, "completion_tokens": completion, "total_tokens": completion}
+
+
+def _completion(model: str, content: str) -> dict[str, Any]:
+    return {
+        "id": "mock-completion",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": _usage(content),
+    }
+
+
+def _stream_chunk(model: str, delta: dict[str, Any] | None, usage: dict[str, int] | None = None) -> dict[str, Any]:
+    return {
+        "id": "mock-completion",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": None}],
+        **({"usage": usage} if usage else {}),
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The stdlib default backlog of 5 refuses connections under load-test concurrency.
+    request_queue_size = 1024
+
+
+class MockLLMServer:
+    """Threaded server answering every POST like an OpenAI-compatible chat endpoint.
+
+    Each request sleeps for a latency drawn from ``config.latency``, then
+    fails with a 429 (``rate_limit_rate``), a 500 (``error_rate``), returns
+    truncated JSON content (``malformed_rate``) or returns a valid plan.
+    ``"stream": true`` requests get SSE chunks of ``stream_chunk_chars``.
+    Outcome counts are kept in ``outcomes``.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, config: MockLLMConfig | None = None) -> None:
+        self.config = config or MockLLMConfig()
+        self.outcomes: Counter[str] = Counter()
+        self._latency = parse_latency(self.config.latency)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = _Server((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def requests(self) -> int:
+        with self._lock:
+            return sum(self.outcomes.values())
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> tuple[float, str]:
+        config = self.config
+        with self._lock:
+            delay = self._latency(self._rng)
+            roll = self._rng.random()
+            if roll < config.rate_limit_rate:
+                outcome = RATE_LIMITED
+            elif roll < config.rate_limit_rate + config.error_rate:
+                outcome = ERROR
+            elif roll < config.rate_limit_rate + config.error_rate + config.malformed_rate:
+                outcome = MALFORMED
+            else:
+                outcome = OK
+            self.outcomes[outcome] += 1
+        return delay, outcome
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; with Nagle plus delayed ACK
+            # every keep-alive response would stall ~40 ms on top of the configured latency.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *_args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))) or b"{}")
+                delay, outcome = server._draw()
+                time.sleep(delay)
+                if outcome == RATE_LIMITED:
+                    error = {"error": {"message": "rate limited", "type": "rate_limit_error"}}
+                    self._send_json(429, error, {"Retry-After": str(server.config.retry_after_seconds)})
+                    return
+                if outcome == ERROR:
+                    self._send_json(500, {"error": {"message": "mock upstream error", "type": "server_error"}})
+                    return
+                try:
+                    content = plan_content(body.get("messages", []))
+                except (ValueError, KeyError, TypeError) as exc:
+                    self._send_json(400, {"error": {"message": str(exc), "type": "invalid_request_error"}})
+                    return
+                if outcome == MALFORMED:
+                    content = content[: len(content) // 2]
+                model = str(body.get("model", "mock"))
+                if body.get("stream"):
+                    self._send_stream(model, content, bool((body.get("stream_options") or {}).get("include_usage")))
+                else:
+                    self._send_json(200, _completion(model, content))
+
+            def _send_json(self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_event(self, payload: dict[str, Any] | str) -> None:
+                text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+                self._write_chunk(f"data: {text}\n\n".encode("utf-8"))
+
+            def _send_stream(self, model: str, content: str, include_usage: bool) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                step = max(1, server.config.stream_chunk_chars)
+                self._send_event(_stream_chunk(model, {"role": "assistant", "content": ""}))
+                for start in range(0, len(content), step):
+                    if start and server.config.stream_chunk_delay_seconds:
+                        time.sleep(server.config.stream_chunk_delay_seconds)
+                    self._send_event(_stream_chunk(model, {"content": content[start : start + step]}))
+                if include_usage:
+                    self._send_event(_stream_chunk(model, None, _usage(content)))
+                self._send_event("[DONE]")
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+    def start(self) -> MockLLMServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="mock-llm", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> MockLLMServer:
+        return self.start()
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default="0", help="e.g. 0.5, uniform:0.2,1.0, normal:0.8,0.2, lognormal:0.8,0.5, exponential:0.8")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of completions with truncated JSON")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--stream-chunk-chars", type=int, default=32)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.0, help="seconds between stream chunks")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    config = MockLLMConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        stream_chunk_chars=args.stream_chunk_chars,
+        stream_chunk_delay_seconds=args.stream_chunk_delay,
+        seed=args.seed,
+    )
+    server = MockLLMServer(args.host, args.port, config=config)
+    print(f"mock LLM listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(dict(server.outcomes))
+
+
+if __name__ == "__main__":
+    main()
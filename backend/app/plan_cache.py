@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Protocol
+
+from mvp_travel_agent.engine import _normalize_request
+
+from .plan_json import PreSerializedPlan, dump_plan_json
+from .settings import get_settings
+
+
+class PlanCacheBackend(Protocol):
+    def get(self, key: str) -> dict[str, Any] | None: ...
+
+    def set(self, key: str, plan: dict[str, Any], ttl_seconds: float) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+def build_cache_key(request: dict[str, Any], *, budget_bucket_cny: float, namespace: str = "") -> str:
+    """Key on the normalized request, with the budget collapsed into a bucket."""
+    req = _normalize_request(request)
+    budget = int(req.budget_cny // budget_bucket_cny) if budget_bucket_cny > 0 else req.budget_cny
+    parts = [namespace, req.destination, req.days, req.travelers, budget, sorted(set(req.preferences))]
+    return json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+
+
+class MemoryPlanCacheBackend:
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, plan = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return plan
+
+    def set(self, key: str, plan: dict[str, Any], ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl_seconds, plan)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLitePlanCacheBackend:
+    def __init__(self, path: str, max_entries: int, clock: Callable[[], float] = time.time) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plan_cache ("
+            "key TEXT PRIMARY KEY, plan TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS plan_cache_last_access ON plan_cache(last_access)")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute("SELECT plan, expires_at FROM plan_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM plan_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE plan_cache SET last_access = ? WHERE key = ?", (now, key))
+        return PreSerializedPlan(json.loads(row[0]), row[0].encode("utf-8"))
+
+    def set(self, key: str, plan: dict[str, Any], ttl_seconds: float) -> None:
+        now = self._clock()
+        encoded = dump_plan_json(plan).decode("utf-8")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plan_cache (key, plan, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, encoded, now + ttl_seconds, now),
+            )
+            self._conn.execute("DELETE FROM plan_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM plan_cache WHERE key IN ("
+                "SELECT key FROM plan_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM plan_cache")
+
+
+class PlanCache:
+    def __init__(self, backend: PlanCacheBackend, *, ttl_seconds: float) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        plan = self.backend.get(key)
+        if plan is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return plan
+
+    def set(self, key: str, plan: dict[str, Any]) -> None:
+        """Store ``plan`` with its JSON bytes, so hits are served without re-encoding."""
+        self.backend.set(key, PreSerializedPlan(plan), self.ttl_seconds)
+        self.stores += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def rebase_cached_plan(cached: dict[str, Any], local_plan: dict[str, Any]) -> dict[str, Any]:
+    """Adapt a cached LLM plan to the current request's summary and budget.
+
+    When nothing changes the cached object itself is returned, keeping any
+    pre-serialized bytes it carries.
+    """
+    summary = local_plan["request_summary"]
+    plan = {**cached, "request_summary": summary}
+    try:
+        total = float(cached["price_breakdown"]["total"])
+        budget = float(summary["budget_cny"])
+    except (KeyError, TypeError, ValueError):
+        return cached if cached.get("request_summary") == summary else plan
+
+    risk_flags = [flag for flag in cached.get("risk_flags", []) if flag != "budget_exceeded"]
+    if total > budget:
+        risk_flags.insert(0, "budget_exceeded")
+    plan["risk_flags"] = risk_flags
+    plan["handoff_to_human"] = bool(cached.get("handoff_to_human")) or total > budget * 1.2
+    if all(plan[field] == cached.get(field) for field in ("request_summary", "risk_flags", "handoff_to_human")):
+        return cached
+    return plan
+
+
+@lru_cache(maxsize=1)
+def get_plan_cache() -> PlanCache | None:
+    settings = get_settings()
+    if settings.plan_cache_backend == "memory":
+        backend: PlanCacheBackend = MemoryPlanCacheBackend(settings.plan_cache_max_entries)
+    elif settings.plan_cache_backend == "sqlite":
+        backend = SQLitePlanCacheBackend(settings.plan_cache_path, settings.plan_cache_max_entries)
+    else:
+        return None
+    return PlanCache(backend, ttl_seconds=settings.plan_cache_ttl_seconds)
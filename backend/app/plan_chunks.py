@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from mvp_travel_agent.engine import SERVICE_FEE_RATE
+
+from .plan_cache import rebase_cached_plan
+
+PER_DAY_COSTS = ("hotel", "tickets", "meals")
+PARTIAL_FALLBACK_FLAG = "llm_partial_fallback"
+_REQUEST_LEVEL_FLAGS = ("large_group_manual_review", "destination_fallback_template", "destination_fuzzy_match")
+
+
+def split_days(days: int, chunk_days: int) -> list[tuple[int, int]]:
+    """Cut ``1..days`` into near-equal inclusive ranges of at most ``chunk_days``."""
+    count = max(1, math.ceil(days / max(1, chunk_days)))
+    size, extra = divmod(days, count)
+    ranges = []
+    start = 1
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0) - 1
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+
+def _share(local_plan: dict[str, Any], start: int, end: int) -> float:
+    return (end - start + 1) / max(1, len(local_plan["itinerary"]))
+
+
+def chunk_request(request: dict[str, Any], start: int, end: int, total_days: int) -> dict[str, Any]:
+    days = end - start + 1
+    return {**request, "days": days, "budget_cny": request["budget_cny"] * days / total_days, "day_range": [start, end]}
+
+
+def chunk_baseline(local_plan: dict[str, Any], start: int, end: int) -> dict[str, Any]:
+    """The matching slice of the local baseline, with per-day costs pro-rated."""
+    share = _share(local_plan, start, end)
+    prices = dict(local_plan["price_breakdown"])
+    for column in PER_DAY_COSTS:
+        prices[column] = round(prices[column] * share, 2)
+    return {
+        "itinerary": local_plan["itinerary"][start - 1 : end],
+        "price_breakdown": prices,
+        "risk_flags": [],
+    }
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def merge_chunk_results(local_plan: dict[str, Any], results: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Stitch per-chunk LLM plans into one plan for the whole trip.
+
+    Days are renumbered from each chunk's range and padded from the baseline
+    if a chunk came back short; a failed chunk is filled entirely from the
+    baseline. Per-day costs add up across chunks, transport is one round
+    trip (the largest chunk quote), and the service fee and budget flags are
+    recomputed for the full trip. Returns None when every chunk failed.
+    """
+    ordered = sorted(results, key=lambda item: item["start"])
+    if all(item.get("plan") is None for item in ordered):
+        return None
+
+    itinerary: list[dict[str, Any]] = []
+    transport = 0.0
+    per_day = dict.fromkeys(PER_DAY_COSTS, 0.0)
+    flags = [flag for flag in local_plan.get("risk_flags", []) if flag in _REQUEST_LEVEL_FLAGS]
+    for item in ordered:
+        start, end = item["start"], item["end"]
+        baseline_days = local_plan["itinerary"][start - 1 : end]
+        plan = item.get("plan")
+        if plan is None:
+            itinerary.extend(baseline_days)
+            share = _share(local_plan, start, end)
+            transport = max(transport, _number(local_plan["price_breakdown"]["transport"]))
+            for column in PER_DAY_COSTS:
+                per_day[column] += _number(local_plan["price_breakdown"][column]) * share
+            flags.append(PARTIAL_FALLBACK_FLAG)
+            continue
+
+        llm_days = [day for day in plan.get("itinerary", []) if isinstance(day, dict)]
+        for offset, baseline_day in enumerate(baseline_days):
+            day = llm_days[offset] if offset < len(llm_days) else baseline_day
+            itinerary.append({**day, "day": start + offset})
+        prices = plan.get("price_breakdown") or {}
+        transport = max(transport, _number(prices.get("transport")))
+        for column in PER_DAY_COSTS:
+            per_day[column] += _number(prices.get(column))
+        flags.extend(str(flag) for flag in plan.get("risk_flags", []) if flag != "budget_exceeded")
+
+    subtotal = transport + sum(per_day.values())
+    service_fee = math.ceil(subtotal * SERVICE_FEE_RATE)
+    merged = {
+        "status": "ok",
+        "request_summary": local_plan["request_summary"],
+        "itinerary": itinerary,
+        "price_breakdown": {
+            "transport": round(transport, 2),
+            **{column: round(value, 2) for column, value in per_day.items()},
+            "service_fee": float(service_fee),
+            "total": round(subtotal + service_fee, 2),
+        },
+        "risk_flags": list(dict.fromkeys(flags)),
+        "handoff_to_human": "large_group_manual_review" in flags,
+        "provider": "deepseek",
+    }
+    return rebase_cached_plan(merged, local_plan)
@@ -1,29 +1,70 @@
 from __future__ import annotations
 
-from copy import deepcopy
+from collections.abc import AsyncIterator
 from functools import lru_cache
 import logging
-from typing import Any, Literal, TypedDict
+from time import perf_counter
+from typing import Annotated, Any, Literal, TypedDict
 from uuid import uuid4
 
-from langgraph.checkpoint.memory import InMemorySaver
+from langchain_core.runnables import RunnableLambda
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, START, StateGraph
-
-from mvp_travel_agent.engine import generate_plan as generate_plan_local
-
-from .deepseek_client import DeepSeekClientError, generate_with_deepseek
+from langgraph.types import Send
+
+from mvp_travel_agent.engine import build_plan, generate_plan as generate_plan_local
+
+from .checkpointers import get_checkpointer
+from .deepseek_client import (
+    DeepSeekClientError,
+    astream_deepseek_content,
+    generate_with_deepseek,
+    generate_with_deepseek_async,
+)
+from .llm_router import get_llm_router
+from .metrics import (
+    DEEPSEEK_HTTP_SECONDS,
+    DEEPSEEK_PARSE_SECONDS,
+    PLAN_CACHE_LOOKUPS,
+    PLAN_NODE_SECONDS,
+    PLAN_RESULTS,
+    timed_node,
+)
+from .plan_chunks import chunk_baseline, chunk_request, merge_chunk_results, split_days
+from .plan_cache import build_cache_key, get_plan_cache, rebase_cached_plan
+from .plan_revision import INCREMENTAL_FIELDS, carry_over_days, changed_fields, reprice_plan
 from .settings import get_settings
+from .stream_json import PlanStreamParser
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _collect_chunks(current: list[dict[str, Any]] | None, update: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    # None resets the list, so a reused checkpointer thread starts clean.
+    if update is None:
+        return []
+    return [*(current or []), *update]
+
+
 class PlanGraphState(TypedDict, total=False):
     request: dict[str, Any]
+    stream_tokens: bool
     provider_mode: str
     local_plan: dict[str, Any]
     use_deepseek: bool
+    cache_key: str
+    cache_hit: bool
     deepseek_error: str
-    final_plan: dict[str, Any]
+    chunk_results: Annotated[list[dict[str, Any]], _collect_chunks]
+    final_plan: dict[str, Any] | None
+
+
+class PlanChunkState(TypedDict):
+    request: dict[str, Any]
+    local_plan: dict[str, Any]
+    start: int
+    end: int
+    stream_tokens: bool
 
 
 def _load_provider_mode(_: PlanGraphState) -> dict[str, Any]:
@@ -34,25 +75,181 @@ def _load_provider_mode(_: PlanGraphState) -> dict[str, Any]:
 def _build_local_baseline(state: PlanGraphState) -> dict[str, Any]:
     local_plan = generate_plan_local(state["request"])
     use_deepseek = local_plan.get("status") == "ok" and state.get("provider_mode") != "local"
-    return {"local_plan": local_plan, "use_deepseek": use_deepseek}
-
-
-def _route_after_baseline(state: PlanGraphState) -> Literal["call_deepseek", "finalize_local"]:
+    # A reused checkpointer thread still holds the previous run's outputs; clear
+    # them so a failed LLM call cannot route the old final_plan to finish.
+    return {
+        "local_plan": local_plan,
+        "use_deepseek": use_deepseek,
+        "chunk_results": None,
+        "final_plan": None,
+        "deepseek_error": "",
+        "cache_hit": False,
+        "cache_key": "",
+    }
+
+
+def _route_after_baseline(state: PlanGraphState) -> Literal["lookup_plan_cache", "finalize_local"]:
     local_plan = state["local_plan"]
     if local_plan.get("status") != "ok":
         return "finalize_local"
     if not state.get("use_deepseek", False):
         return "finalize_local"
+    return "lookup_plan_cache"
+
+
+def _lookup_plan_cache(state: PlanGraphState) -> dict[str, Any]:
+    cache = get_plan_cache()
+    if cache is None:
+        return {"cache_hit": False}
+    settings = get_settings()
+    key = build_cache_key(
+        state["request"],
+        budget_bucket_cny=settings.plan_cache_budget_bucket_cny,
+        namespace=settings.deepseek_model,
+    )
+    cached = cache.get(key)
+    PLAN_CACHE_LOOKUPS.inc("miss" if cached is None else "hit")
+    if cached is None:
+        return {"cache_key": key, "cache_hit": False}
+    return {"cache_key": key, "cache_hit": True, "final_plan": rebase_cached_plan(cached, state["local_plan"])}
+
+
+def _route_after_cache(state: PlanGraphState) -> Literal["call_deepseek", "fallback_local", "finish"]:
+    if state.get("cache_hit", False):
+        return "finish"
+    if not get_llm_router().available():
+        # Every provider's circuit is open: answer locally instead of queueing on a dead upstream.
+        return "fallback_local"
     return "call_deepseek"
 
 
+def _route_after_cache_parallel(state: PlanGraphState) -> Literal["call_deepseek", "fallback_local", "finish"] | list[Send]:
+    route = _route_after_cache(state)
+    chunk_days = get_settings().plan_parallel_chunk_days
+    days = len(state["local_plan"]["itinerary"])
+    if route != "call_deepseek" or chunk_days <= 0 or days <= chunk_days:
+        return route
+    return [
+        Send(
+            "call_deepseek_chunk",
+            {
+                "request": state["request"],
+                "local_plan": state["local_plan"],
+                "start": start,
+                "end": end,
+                "stream_tokens": state.get("stream_tokens", False),
+            },
+        )
+        for start, end in split_days(days, chunk_days)
+    ]
+
+
+def _store_plan_cache(state: PlanGraphState, result: dict[str, Any]) -> None:
+    cache = get_plan_cache()
+    key = state.get("cache_key")
+    if cache is not None and key:
+        # Store the plan as an identical request would be served, so exact repeats reuse its bytes.
+        cache.set(key, rebase_cached_plan(result, state["local_plan"]))
+
+
 def _call_deepseek(state: PlanGraphState) -> dict[str, Any]:
-    settings = get_settings()
     try:
-        result = generate_with_deepseek(state["request"], state["local_plan"], settings)
-        return {"final_plan": result, "deepseek_error": ""}
+        result = get_llm_router().generate(state["request"], state["local_plan"], generate_with_deepseek)
     except DeepSeekClientError as exc:
         return {"deepseek_error": str(exc)}
+    _store_plan_cache(state, result)
+    return {"final_plan": result, "deepseek_error": ""}
+
+
+def _expected_days(state: PlanGraphState) -> int | None:
+    summary = state["local_plan"].get("request_summary") or {}
+    days = summary.get("days")
+    return days if isinstance(days, int) else None
+
+
+async def _astream_deepseek(state: PlanGraphState) -> dict[str, Any]:
+    writer = get_stream_writer()
+    parser = PlanStreamParser(expected_days=_expected_days(state))
+    closed_days: list[dict[str, Any]] = []
+
+    async def parsed_stream(request: dict[str, Any], baseline: dict[str, Any], settings: Any) -> AsyncIterator[str]:
+        # Parsing inside the routed stream makes an early abort count as a provider failure.
+        http_seconds = parse_seconds = 0.0
+        started = perf_counter()
+        try:
+            async for delta in astream_deepseek_content(request, baseline, settings):
+                received = perf_counter()
+                http_seconds += received - started
+                closed_days.extend(parser.feed(delta))
+                parse_seconds += perf_counter() - received
+                yield delta
+                started = perf_counter()
+        finally:
+            DEEPSEEK_HTTP_SECONDS.observe(http_seconds, "stream")
+            DEEPSEEK_PARSE_SECONDS.observe(parse_seconds, "stream")
+
+    async for delta in get_llm_router().astream(state["request"], state["local_plan"], parsed_stream):
+        writer(("delta", {"content": delta}))
+        for day in closed_days:
+            writer(("day", day))
+        closed_days.clear()
+    return parser.result()
+
+
+async def _acall_deepseek(state: PlanGraphState) -> dict[str, Any]:
+    try:
+        if state.get("stream_tokens", False):
+            result = await _astream_deepseek(state)
+        else:
+            result = await get_llm_router().agenerate(state["request"], state["local_plan"], generate_with_deepseek_async)
+    except DeepSeekClientError as exc:
+        return {"deepseek_error": str(exc)}
+    _store_plan_cache(state, result)
+    return {"final_plan": result, "deepseek_error": ""}
+
+
+def _chunk_call_args(chunk: PlanChunkState) -> tuple[dict[str, Any], dict[str, Any]]:
+    days = len(chunk["local_plan"]["itinerary"])
+    return (
+        chunk_request(chunk["request"], chunk["start"], chunk["end"], days),
+        chunk_baseline(chunk["local_plan"], chunk["start"], chunk["end"]),
+    )
+
+
+def _chunk_result(chunk: PlanChunkState, plan: dict[str, Any] | None, error: str = "") -> dict[str, Any]:
+    return {"chunk_results": [{"start": chunk["start"], "end": chunk["end"], "plan": plan, "error": error}]}
+
+
+def _call_deepseek_chunk(chunk: PlanChunkState) -> dict[str, Any]:
+    request, baseline = _chunk_call_args(chunk)
+    try:
+        plan = get_llm_router().generate(request, baseline, generate_with_deepseek)
+    except DeepSeekClientError as exc:
+        return _chunk_result(chunk, None, str(exc))
+    return _chunk_result(chunk, plan)
+
+
+async def _acall_deepseek_chunk(chunk: PlanChunkState) -> dict[str, Any]:
+    request, baseline = _chunk_call_args(chunk)
+    try:
+        plan = await get_llm_router().agenerate(request, baseline, generate_with_deepseek_async)
+    except DeepSeekClientError as exc:
+        return _chunk_result(chunk, None, str(exc))
+    if chunk["stream_tokens"]:
+        writer = get_stream_writer()
+        for offset, day in enumerate(plan.get("itinerary", [])[: chunk["end"] - chunk["start"] + 1]):
+            if isinstance(day, dict):
+                writer(("day", {**day, "day": chunk["start"] + offset}))
+    return _chunk_result(chunk, plan)
+
+
+def _merge_chunks(state: PlanGraphState) -> dict[str, Any]:
+    merged = merge_chunk_results(state["local_plan"], state.get("chunk_results", []))
+    if merged is None:
+        errors = {item["error"] for item in state.get("chunk_results", []) if item.get("error")}
+        return {"deepseek_error": "; ".join(sorted(errors)) or "all chunks failed"}
+    _store_plan_cache(state, merged)
+    return {"final_plan": merged, "deepseek_error": ""}
 
 
 def _route_after_deepseek(state: PlanGraphState) -> Literal["fallback_local", "finish"]:
@@ -62,35 +259,86 @@ def _route_after_deepseek(state: PlanGraphState) -> Literal["fallback_local", "f
     return "fallback_local"
 
 
+def _with_provider(plan: dict[str, Any], provider: str) -> dict[str, Any]:
+    # Shallow overlay: nested itinerary/price objects are shared with local_plan,
+    # which no node mutates after build_local_baseline.
+    return {**plan, "provider": provider}
+
+
 def _fallback_local(state: PlanGraphState) -> dict[str, Any]:
-    local_plan = deepcopy(state["local_plan"])
-    local_plan["provider"] = "local_fallback"
-    return {"final_plan": local_plan}
+    return {"final_plan": _with_provider(state["local_plan"], "local_fallback")}
 
 
 def _finalize_local(state: PlanGraphState) -> dict[str, Any]:
-    local_plan = deepcopy(state["local_plan"])
-    local_plan["provider"] = "local"
-    return {"final_plan": local_plan}
+    PLAN_RESULTS.inc("local")
+    return {"final_plan": _with_provider(state["local_plan"], "local")}
 
 
-def _finish(_: PlanGraphState) -> dict[str, Any]:
+def _finish(state: PlanGraphState) -> dict[str, Any]:
+    PLAN_RESULTS.inc(str((state.get("final_plan") or {}).get("provider", "")))
     return {}
 
 
-@lru_cache(maxsize=1)
-def _get_inmemory_saver():
-    return InMemorySaver()
+# One timing for the whole route: per-node wrappers cost several percent of a ~65 us walk.
+_LOCAL_ROUTE = (_load_provider_mode, _build_local_baseline, _finalize_local)
+LOCAL_ROUTE_NODE = "local_route"
+
+
+def run_local_route(payload: dict[str, Any]) -> PlanGraphState:
+    """Run the ``PLAN_PROVIDER=local`` walk of the graph as plain calls.
+
+    With a local provider ``_route_after_baseline`` always picks
+    ``finalize_local``, so the path is known before the request arrives.
+    Calling the same nodes in order skips channel bookkeeping and state
+    copies; ``local_plan`` and ``final_plan`` match what ``invoke`` produces.
+    The walk is recorded as a single ``local_route`` node timing.
+    """
+    started = perf_counter()
+    state: PlanGraphState = {"request": payload}
+    for node in _LOCAL_ROUTE:
+        state.update(node(state))
+    PLAN_NODE_SECONDS.observe(perf_counter() - started, LOCAL_ROUTE_NODE)
+    return state
+
+
+def run_local_route_json(payload: dict[str, Any]) -> bytes:
+    """``run_local_route`` for callers that only need the response body.
 
+    Serializes the engine's result objects straight to UTF-8 JSON, skipping
+    the ``local_plan``/``final_plan`` dicts; the bytes match
+    ``dump_plan_json(run_local_route(payload)["final_plan"])``.
+    """
+    started = perf_counter()
+    body = build_plan(payload).to_json_bytes("local")
+    PLAN_RESULTS.inc("local")
+    PLAN_NODE_SECONDS.observe(perf_counter() - started, LOCAL_ROUTE_NODE)
+    return body
 
-@lru_cache(maxsize=2)
-def get_plan_graph(use_checkpointer: bool = False):
+
+@lru_cache(maxsize=4)
+def get_plan_graph(use_checkpointer: bool = False, parallel_chunk_days: int = 0):
+    """Compile the plan graph.
+
+    With ``parallel_chunk_days > 0`` trips longer than that many days fan
+    out one ``call_deepseek_chunk`` per day range (LangGraph ``Send``) and
+    ``merge_chunks`` stitches the results; shorter trips keep the single
+    ``call_deepseek`` call.
+    """
     builder = StateGraph(PlanGraphState)
-    builder.add_node("load_provider_mode", _load_provider_mode)
-    builder.add_node("build_local_baseline", _build_local_baseline)
-    builder.add_node("call_deepseek", _call_deepseek)
-    builder.add_node("fallback_local", _fallback_local)
-    builder.add_node("finalize_local", _finalize_local)
+    builder.add_node("load_provider_mode", timed_node("load_provider_mode", _load_provider_mode))
+    builder.add_node("build_local_baseline", timed_node("build_local_baseline", _build_local_baseline))
+    builder.add_node("lookup_plan_cache", timed_node("lookup_plan_cache", _lookup_plan_cache))
+    # invoke/stream use the blocking client, ainvoke/astream the pooled async one.
+    builder.add_node(
+        "call_deepseek",
+        RunnableLambda(
+            timed_node("call_deepseek", _call_deepseek),
+            afunc=timed_node("call_deepseek", _acall_deepseek),
+            name="call_deepseek",
+        ),
+    )
+    builder.add_node("fallback_local", timed_node("fallback_local", _fallback_local))
+    builder.add_node("finalize_local", timed_node("finalize_local", _finalize_local))
     builder.add_node("finish", _finish)
 
     builder.add_edge(START, "load_provider_mode")
@@ -100,11 +348,46 @@ def get_plan_graph(use_checkpointer: bool = False):
         "build_local_baseline",
         _route_after_baseline,
         {
-            "call_deepseek": "call_deepseek",
+            "lookup_plan_cache": "lookup_plan_cache",
             "finalize_local": "finalize_local",
         },
     )
 
+    if parallel_chunk_days > 0:
+        builder.add_node(
+            "call_deepseek_chunk",
+            RunnableLambda(
+                timed_node("call_deepseek_chunk", _call_deepseek_chunk),
+                afunc=timed_node("call_deepseek_chunk", _acall_deepseek_chunk),
+                name="call_deepseek_chunk",
+            ),
+        )
+        builder.add_node("merge_chunks", timed_node("merge_chunks", _merge_chunks))
+        builder.add_conditional_edges(
+            "lookup_plan_cache",
+            _route_after_cache_parallel,
+            ["call_deepseek", "call_deepseek_chunk", "fallback_local", "finish"],
+        )
+        builder.add_edge("call_deepseek_chunk", "merge_chunks")
+        builder.add_conditional_edges(
+            "merge_chunks",
+            _route_after_deepseek,
+            {
+                "fallback_local": "fallback_local",
+                "finish": "finish",
+            },
+        )
+    else:
+        builder.add_conditional_edges(
+            "lookup_plan_cache",
+            _route_after_cache,
+            {
+                "call_deepseek": "call_deepseek",
+                "fallback_local": "fallback_local",
+                "finish": "finish",
+            },
+        )
+
     builder.add_conditional_edges(
         "call_deepseek",
         _route_after_deepseek,
@@ -118,7 +401,7 @@ def get_plan_graph(use_checkpointer: bool = False):
     builder.add_edge("finalize_local", END)
     builder.add_edge("finish", END)
     if use_checkpointer:
-        return builder.compile(checkpointer=_get_inmemory_saver())
+        return builder.compile(checkpointer=get_checkpointer())
     return builder.compile()
 
 
@@ -136,7 +419,7 @@ def _run_with_stream(
     config: dict[str, Any] | None,
 ) -> PlanGraphState:
     last_state: PlanGraphState | None = None
-    graph = get_plan_graph(use_checkpointer=use_checkpointer)
+    graph = get_plan_graph(use_checkpointer=use_checkpointer, parallel_chunk_days=get_settings().plan_parallel_chunk_days)
     stream_iter = graph.stream(initial_state, config=config, stream_mode="values") if config else graph.stream(initial_state, stream_mode="values")
     for index, state in enumerate(stream_iter):
         if isinstance(state, dict):
@@ -149,6 +432,28 @@ def _run_with_stream(
     return last_state
 
 
+async def _arun_with_stream(
+    initial_state: PlanGraphState,
+    *,
+    use_checkpointer: bool,
+    config: dict[str, Any] | None,
+) -> PlanGraphState:
+    last_state: PlanGraphState | None = None
+    graph = get_plan_graph(use_checkpointer=use_checkpointer, parallel_chunk_days=get_settings().plan_parallel_chunk_days)
+    stream_iter = graph.astream(initial_state, config=config, stream_mode="values") if config else graph.astream(initial_state, stream_mode="values")
+    index = 0
+    async for state in stream_iter:
+        if isinstance(state, dict):
+            last_state = state
+            LOGGER.debug("plan_graph.astream step=%s keys=%s", index, sorted(state.keys()))
+        else:
+            LOGGER.debug("plan_graph.astream step=%s type=%s", index, type(state).__name__)
+        index += 1
+    if last_state is None:
+        raise RuntimeError("LangGraph stream did not yield state.")
+    return last_state
+
+
 def run_plan_graph(
     payload: dict[str, Any],
     *,
@@ -164,10 +469,125 @@ def run_plan_graph(
             config=config,
         )
     else:
-        graph = get_plan_graph(use_checkpointer=use_checkpointer)
+        graph = get_plan_graph(use_checkpointer=use_checkpointer, parallel_chunk_days=get_settings().plan_parallel_chunk_days)
         result_state = graph.invoke({"request": payload}, config=config) if config else graph.invoke({"request": payload})
 
     final_plan = result_state.get("final_plan")
     if not isinstance(final_plan, dict):
         raise RuntimeError("LangGraph execution did not produce final_plan.")
     return final_plan
+
+
+async def arun_plan_graph(
+    payload: dict[str, Any],
+    *,
+    debug_stream: bool = False,
+    use_checkpointer: bool = False,
+    thread_id: str | None = None,
+) -> dict[str, Any]:
+    config = _build_graph_config(use_checkpointer=use_checkpointer, thread_id=thread_id)
+    if debug_stream:
+        result_state = await _arun_with_stream(
+            {"request": payload},
+            use_checkpointer=use_checkpointer,
+            config=config,
+        )
+    else:
+        graph = get_plan_graph(use_checkpointer=use_checkpointer, parallel_chunk_days=get_settings().plan_parallel_chunk_days)
+        result_state = await graph.ainvoke({"request": payload}, config=config) if config else await graph.ainvoke({"request": payload})
+
+    final_plan = result_state.get("final_plan")
+    if not isinstance(final_plan, dict):
+        raise RuntimeError("LangGraph execution did not produce final_plan.")
+    return final_plan
+
+
+async def astream_plan_events(
+    payload: dict[str, Any],
+    *,
+    use_checkpointer: bool = False,
+    thread_id: str | None = None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Yield ("baseline" | "delta" | "day" | "plan", data) events as the graph progresses."""
+    config = _build_graph_config(use_checkpointer=use_checkpointer, thread_id=thread_id)
+    graph = get_plan_graph(use_checkpointer=use_checkpointer, parallel_chunk_days=get_settings().plan_parallel_chunk_days)
+    initial_state: PlanGraphState = {"request": payload, "stream_tokens": True}
+    stream_modes = ["updates", "custom"]
+    stream_iter = graph.astream(initial_state, config=config, stream_mode=stream_modes) if config else graph.astream(initial_state, stream_mode=stream_modes)
+
+    final_plan: dict[str, Any] | None = None
+    async for mode, chunk in stream_iter:
+        if mode == "custom":
+            event, data = chunk
+            yield event, data
+            continue
+        for node, update in chunk.items():
+            if not isinstance(update, dict):
+                continue
+            if node == "build_local_baseline":
+                yield "baseline", update["local_plan"]
+            if isinstance(update.get("final_plan"), dict):
+                final_plan = update["final_plan"]
+
+    if final_plan is None:
+        raise RuntimeError("LangGraph execution did not produce final_plan.")
+    yield "plan", final_plan
+
+
+class UnknownPlanThread(LookupError):
+    """No finished plan is checkpointed under the given thread_id."""
+
+
+async def _agenerate_added_days(request: dict[str, Any], local_plan: dict[str, Any], start: int, end: int) -> dict[str, Any]:
+    days = len(local_plan["itinerary"])
+    try:
+        plan = await get_llm_router().agenerate(
+            chunk_request(request, start, end, days),
+            chunk_baseline(local_plan, start, end),
+            generate_with_deepseek_async,
+        )
+    except DeepSeekClientError as exc:
+        return {"start": start, "end": end, "plan": None, "error": str(exc)}
+    return {"start": start, "end": end, "plan": plan, "error": ""}
+
+
+async def arevise_plan_graph(thread_id: str, patch: dict[str, Any]) -> dict[str, Any]:
+    """Apply ``patch`` to the request checkpointed under ``thread_id``.
+
+    A budget-only change re-prices the previous plan without an LLM call.
+    A change of ``days`` on an LLM plan keeps the days already planned and
+    generates only the added ones. Anything else reruns the graph on the
+    same thread. Raises ``UnknownPlanThread`` if the thread has no plan.
+    """
+    graph = get_plan_graph(use_checkpointer=True, parallel_chunk_days=get_settings().plan_parallel_chunk_days)
+    config = _build_graph_config(use_checkpointer=True, thread_id=thread_id)
+    values = (await graph.aget_state(config)).values
+    previous_plan = values.get("final_plan")
+    if not isinstance(previous_plan, dict) or not isinstance(values.get("request"), dict):
+        raise UnknownPlanThread(thread_id)
+
+    request = {**values["request"], **patch}
+    changed = changed_fields(values["request"], request)
+    if not changed:
+        return previous_plan
+    local_plan = generate_plan_local(request)
+    incremental = (
+        local_plan.get("status") == "ok"
+        and previous_plan.get("status") == "ok"
+        and changed <= INCREMENTAL_FIELDS
+        and ("days" not in changed or previous_plan.get("provider") == "deepseek")
+    )
+    if not incremental:
+        return await arun_plan_graph(request, use_checkpointer=True, thread_id=thread_id)
+
+    if "days" in changed:
+        previous_days = len(previous_plan["itinerary"])
+        days = len(local_plan["itinerary"])
+        results = [carry_over_days(previous_plan, min(previous_days, days))]
+        if days > previous_days:
+            results.append(await _agenerate_added_days(request, local_plan, previous_days + 1, days))
+        plan = merge_chunk_results(local_plan, results)
+    else:
+        plan = reprice_plan(previous_plan, local_plan)
+    await graph.aupdate_state(config, {"request": request, "local_plan": local_plan, "final_plan": plan}, as_node="finish")
+    return plan
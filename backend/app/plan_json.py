@@ -0,0 +1,39 @@
+import json
+from typing import Any
+
+from fastapi.responses import Response
+
+# Same output as json.dumps(ensure_ascii=False, separators=(",", ":")), built once.
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+class PreSerializedPlan(dict):
+    """A plan dict that carries its own UTF-8 JSON encoding.
+
+    Cached plans keep the bytes they were stored with, so serving them again
+    skips serialization entirely. The dict contents must not be mutated.
+    """
+
+    __slots__ = ("json_bytes",)
+
+    def __init__(self, plan: dict[str, Any], json_bytes: bytes | None = None) -> None:
+        super().__init__(plan)
+        self.json_bytes = json_bytes if json_bytes is not None else dump_plan_json(plan)
+
+
+def dump_plan_json(plan: dict[str, Any]) -> bytes:
+    json_bytes = getattr(plan, "json_bytes", None)
+    if json_bytes is not None:
+        return json_bytes
+    return _ENCODER.encode(plan).encode("utf-8")
+
+
+class PlanJSONResponse(Response):
+    """JSON response that encodes plans once, skipping the jsonable_encoder walk."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_plan_json(content)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .plan_cache import rebase_cached_plan
+from .plan_chunks import chunk_baseline
+
+# Fields a revision can apply without regenerating the days already planned.
+INCREMENTAL_FIELDS = frozenset({"budget_cny", "days"})
+
+
+def changed_fields(previous: dict[str, Any], request: dict[str, Any]) -> set[str]:
+    return {field for field, value in request.items() if previous.get(field) != value}
+
+
+def reprice_plan(previous_plan: dict[str, Any], local_plan: dict[str, Any]) -> dict[str, Any]:
+    """Re-check ``previous_plan``'s budget flags against a new budget; days and prices stay."""
+    flags = previous_plan.get("risk_flags", [])
+    # Clear handoff caused by the old budget; rebase re-derives it from the new one.
+    base = {**previous_plan, "handoff_to_human": "large_group_manual_review" in flags}
+    return rebase_cached_plan(base, local_plan)
+
+
+def carry_over_days(previous_plan: dict[str, Any], days: int) -> dict[str, Any]:
+    """The first ``days`` days of ``previous_plan`` as a ``merge_chunk_results`` entry."""
+    kept = chunk_baseline(previous_plan, 1, days)
+    kept["risk_flags"] = list(previous_plan.get("risk_flags", []))
+    return {"start": 1, "end": days, "plan": kept, "error": ""}
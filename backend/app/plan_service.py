@@ -1,14 +1,105 @@
+import json
+from collections.abc import AsyncIterator
 from typing import Any
 
-from .plan_graph import run_plan_graph
-from .settings import get_settings
+from .metrics import METRICS, Sample
+from .plan_graph import (
+    arevise_plan_graph,
+    arun_plan_graph,
+    astream_plan_events,
+    run_local_route,
+    run_local_route_json,
+    run_plan_graph,
+)
+from .plan_json import dump_plan_json
+from .settings import Settings, get_settings
+from .single_flight import SingleFlight
+
+PLAN_FLIGHTS = SingleFlight()
+
+
+def _flight_key(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _local_fast_path(settings: Settings) -> bool:
+    """True when the graph's route is fixed and nothing needs its checkpoints or debug stream."""
+    return settings.plan_provider == "local" and not settings.plan_graph_debug_stream and not settings.plan_graph_use_checkpointer
 
 
 def generate_plan(payload: dict[str, Any]) -> dict[str, Any]:
     settings = get_settings()
-    return run_plan_graph(
+    if _local_fast_path(settings):
+        return run_local_route(payload)["final_plan"]
+
+    def run() -> dict[str, Any]:
+        return run_plan_graph(
+            payload,
+            debug_stream=settings.plan_graph_debug_stream,
+            use_checkpointer=settings.plan_graph_use_checkpointer,
+            thread_id=settings.plan_graph_debug_thread_id or None,
+        )
+
+    if not settings.plan_single_flight:
+        return run()
+    return PLAN_FLIGHTS.do(_flight_key(payload), run)
+
+
+async def agenerate_plan(payload: dict[str, Any], thread_id: str | None = None) -> dict[str, Any]:
+    settings = get_settings()
+    if thread_id:
+        # A named thread is checkpointed so it can be revised later; it is never shared with other callers.
+        return await arun_plan_graph(payload, use_checkpointer=True, thread_id=thread_id)
+    if _local_fast_path(settings):
+        # The engine runs in microseconds: cheaper inline than coalescing or a thread hop.
+        return run_local_route(payload)["final_plan"]
+
+    async def run() -> dict[str, Any]:
+        return await arun_plan_graph(
+            payload,
+            debug_stream=settings.plan_graph_debug_stream,
+            use_checkpointer=settings.plan_graph_use_checkpointer,
+            thread_id=settings.plan_graph_debug_thread_id or None,
+        )
+
+    if not settings.plan_single_flight:
+        return await run()
+    return await PLAN_FLIGHTS.ado(_flight_key(payload), run)
+
+
+async def agenerate_plan_json(payload: dict[str, Any], thread_id: str | None = None) -> bytes:
+    """``agenerate_plan`` encoded as the /api/plan response body."""
+    if not thread_id and _local_fast_path(get_settings()):
+        return run_local_route_json(payload)
+    return dump_plan_json(await agenerate_plan(payload, thread_id=thread_id))
+
+
+async def arevise_plan(thread_id: str, patch: dict[str, Any]) -> dict[str, Any]:
+    return await arevise_plan_graph(thread_id, patch)
+
+
+async def astream_plan(payload: dict[str, Any]) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    settings = get_settings()
+    if _local_fast_path(settings):
+        state = run_local_route(payload)
+        yield "baseline", state["local_plan"]
+        yield "plan", state["final_plan"]
+        return
+    async for event in astream_plan_events(
         payload,
-        debug_stream=settings.plan_graph_debug_stream,
         use_checkpointer=settings.plan_graph_use_checkpointer,
         thread_id=settings.plan_graph_debug_thread_id or None,
-    )
+    ):
+        yield event
+
+
+def _flight_samples() -> list[Sample]:
+    stats = PLAN_FLIGHTS.stats()
+    return [
+        ("plan_single_flight_leaders_total", "counter", "Plan requests that ran the graph as a flight leader.", {}, stats["leaders"]),
+        ("plan_single_flight_coalesced_total", "counter", "Plan requests that waited on an identical in-flight request.", {}, stats["coalesced"]),
+        ("plan_single_flight_in_flight", "gauge", "Single-flight plan executions currently running.", {}, stats["in_flight"]),
+    ]
+
+
+METRICS.register_collector(_flight_samples)
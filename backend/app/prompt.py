@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from typing import Any
+
+from .metrics import METRICS, Sample
+
+_SCHEMA = {
+    "status": "ok",
+    "request_summary": {"destination": "string", "days": 3, "travelers": 2, "budget_cny": 9000, "preferences": ["美食"]},
+    "itinerary": [{"day": 1, "morning": "景点A", "afternoon": "景点B", "evening": "活动C"}],
+    "price_breakdown": {"transport": 0, "hotel": 0, "tickets": 0, "meals": 0, "service_fee": 0, "total": 0},
+    "risk_flags": ["budget_exceeded"],
+    "handoff_to_human": False,
+}
+
+# Identical on every call and sent first, so providers with prefix caching
+# (DeepSeek bills cache hits separately) reuse it across requests.
+SYSTEM_PROMPT = (
+    "你是旅游规划SaaS后端助手。"
+    "必须仅返回JSON对象，不要解释、不要markdown代码块。"
+    "输出字段必须严格匹配给定schema，金额使用CNY数字。"
+    "行程节奏要合理，避免不现实的跨城安排。\n"
+    f"schema:{json.dumps(_SCHEMA, ensure_ascii=False, separators=(',', ':'))}\n"
+    "用户消息格式：请求为JSON；基线行程每行为“天|上午|下午|晚上”，空字段表示与前一天相同；"
+    "价格为基线报价；风险为基线风险标记。基线仅供参考。"
+)
+
+# Per-message framing tokens in chat templates.
+_MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~0.3 per ASCII char, ~0.6 per CJK char (DeepSeek's published ratios)."""
+    extra_bytes = len(text.encode("utf-8")) - len(text)
+    wide = extra_bytes // 2
+    return math.ceil((len(text) - wide) * 0.3 + wide * 0.6)
+
+
+def estimate_messages_tokens(messages: list[dict[str, str]]) -> int:
+    return sum(estimate_tokens(message["content"]) + _MESSAGE_OVERHEAD for message in messages)
+
+
+def _itinerary_rows(itinerary: list[dict[str, Any]]) -> list[str]:
+    """One row per day; a field equal to the previous day's is left empty."""
+    rows = []
+    previous: dict[str, Any] = {}
+    for item in itinerary:
+        fields = [
+            "" if item.get(slot) == previous.get(slot) else str(item.get(slot, ""))
+            for slot in ("morning", "afternoon", "evening")
+        ]
+        rows.append("|".join([str(item.get("day", "")), *fields]))
+        previous = item
+    return rows
+
+
+def _user_prompt(request_payload: dict[str, Any], baseline_plan: dict[str, Any], rows: list[str] | None) -> str:
+    lines = [
+        "请根据请求生成可售卖行程结果。",
+        f"请求:{json.dumps(request_payload, ensure_ascii=False, separators=(',', ':'))}",
+    ]
+    day_range = request_payload.get("day_range")
+    if day_range:
+        lines.append(
+            f"本次只生成整段行程中第{day_range[0]}-{day_range[1]}天：itinerary的day从{day_range[0]}编号，"
+            "住宿、门票、餐饮只计这几天，交通按整趟往返计。"
+        )
+    if rows is not None:
+        prices = baseline_plan.get("price_breakdown")
+        if prices:
+            lines.append(f"价格:{json.dumps(prices, ensure_ascii=False, separators=(',', ':'))}")
+        if baseline_plan.get("risk_flags"):
+            lines.append(f"风险:{','.join(map(str, baseline_plan['risk_flags']))}")
+        if rows:
+            lines.append("基线行程:")
+            lines.extend(rows)
+        itinerary = baseline_plan.get("itinerary") or []
+        if len(rows) < len(itinerary):
+            lines.append(f"第{len(rows) + 1}天起无基线，请自行安排。")
+    return "\n".join(lines)
+
+
+class PromptBudgetExceeded(ValueError):
+    """Raised when even the request alone does not fit the token budget."""
+
+
+def build_messages(
+    request_payload: dict[str, Any],
+    baseline_plan: dict[str, Any],
+    *,
+    token_budget: int,
+) -> tuple[list[dict[str, str]], int, bool]:
+    """Return ``(messages, estimated_tokens, truncated)`` within ``token_budget``.
+
+    Over budget, baseline days are dropped from the end, then the baseline
+    as a whole; ``token_budget <= 0`` disables the limit.
+    """
+    rows = _itinerary_rows(baseline_plan.get("itinerary") or [])
+    system_tokens = estimate_tokens(SYSTEM_PROMPT) + _MESSAGE_OVERHEAD
+    truncated = False
+    keep: list[str] | None = rows
+    while True:
+        user_prompt = _user_prompt(request_payload, baseline_plan, keep)
+        tokens = system_tokens + estimate_tokens(user_prompt) + _MESSAGE_OVERHEAD
+        if token_budget <= 0 or tokens <= token_budget:
+            break
+        if keep is None:
+            raise PromptBudgetExceeded(f"Prompt needs ~{tokens} tokens, budget is {token_budget}.")
+        truncated = True
+        keep = keep[:-1] if keep else None
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}]
+    return messages, tokens, truncated
+
+
+class TokenStats:
+    """Estimated prompt sizes per call plus provider-reported ``usage``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.estimated_prompt_tokens = 0
+            self.max_estimated_prompt_tokens = 0
+            self.truncated = 0
+            self.over_budget = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.prompt_cache_hit_tokens = 0
+
+    def record_prompt(self, tokens: int, truncated: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.estimated_prompt_tokens += tokens
+            self.max_estimated_prompt_tokens = max(self.max_estimated_prompt_tokens, tokens)
+            self.truncated += int(truncated)
+
+    def record_over_budget(self) -> None:
+        with self._lock:
+            self.over_budget += 1
+
+    def record_usage(self, usage: Any) -> None:
+        if not isinstance(usage, dict):
+            return
+        with self._lock:
+            self.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+            self.completion_tokens += int(usage.get("completion_tokens") or 0)
+            self.prompt_cache_hit_tokens += int(usage.get("prompt_cache_hit_tokens") or 0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "estimated_prompt_tokens": self.estimated_prompt_tokens,
+                "max_estimated_prompt_tokens": self.max_estimated_prompt_tokens,
+                "truncated": self.truncated,
+                "over_budget": self.over_budget,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "prompt_cache_hit_tokens": self.prompt_cache_hit_tokens,
+            }
+
+
+TOKEN_STATS = TokenStats()
+
+
+def _token_samples() -> list[Sample]:
+    stats = TOKEN_STATS.stats()
+    return [
+        ("llm_prompts_total", "counter", "Prompts built for LLM calls.", {}, stats["calls"]),
+        ("llm_prompts_truncated_total", "counter", "Prompts whose baseline was cut to fit the budget.", {}, stats["truncated"]),
+        ("llm_prompts_over_budget_total", "counter", "Requests refused for exceeding the prompt budget.", {}, stats["over_budget"]),
+        ("llm_estimated_prompt_tokens_total", "counter", "Estimated prompt tokens sent.", {}, stats["estimated_prompt_tokens"]),
+        ("llm_prompt_tokens_total", "counter", "Prompt tokens reported by providers.", {}, stats["prompt_tokens"]),
+        ("llm_completion_tokens_total", "counter", "Completion tokens reported by providers.", {}, stats["completion_tokens"]),
+        ("llm_prompt_cache_hit_tokens_total", "counter", "Prompt tokens served from the provider prefix cache.", {}, stats["prompt_cache_hit_tokens"]),
+    ]
+
+
+METRICS.register_collector(_token_samples)
@@ -9,6 +9,19 @@ class PlanRequest(BaseModel):
     preferences: list[str] = Field(default_factory=list, description="偏好标签")
 
 
+class PlanPatch(BaseModel):
+    destination: str | None = Field(default=None, min_length=1, description="目的地城市")
+    days: int | None = Field(default=None, ge=1, le=15, description="出行天数")
+    travelers: int | None = Field(default=None, ge=1, le=20, description="出行人数")
+    budget_cny: float | None = Field(default=None, gt=0, description="预算（人民币）")
+    preferences: list[str] | None = Field(default=None, description="偏好标签")
+
+
+class PlanRevisionRequest(BaseModel):
+    thread_id: str = Field(min_length=1, description="创建方案时使用的线程 ID")
+    patch: PlanPatch
+
+
 class HealthResponse(BaseModel):
     status: str
     service: str
@@ -11,14 +11,39 @@ load_dotenv()
 @dataclass(frozen=True)
 class Settings:
     plan_provider: str
+    app_warmup: bool
     plan_graph_debug_stream: bool
     plan_graph_use_checkpointer: bool
     plan_graph_debug_thread_id: str
+    plan_graph_checkpointer: str
+    plan_graph_checkpoint_max_threads: int
+    plan_graph_checkpoint_ttl_seconds: float
+    plan_graph_checkpoint_path: str
+    plan_single_flight: bool
+    plan_batch_concurrency: int
+    plan_parallel_chunk_days: int
     deepseek_api_key: str
     deepseek_api_base: str
     deepseek_chat_path: str
     deepseek_model: str
     deepseek_timeout_seconds: float
+    deepseek_http2: bool
+    deepseek_max_connections: int
+    deepseek_max_keepalive_connections: int
+    deepseek_keepalive_expiry_seconds: float
+    llm_providers: str
+    llm_hedge_enabled: bool
+    llm_hedge_delay_seconds: float
+    deepseek_min_timeout_seconds: float
+    prompt_token_budget: int
+    circuit_breaker_enabled: bool
+    circuit_failure_threshold: int
+    circuit_recovery_seconds: float
+    plan_cache_backend: str
+    plan_cache_ttl_seconds: float
+    plan_cache_max_entries: int
+    plan_cache_path: str
+    plan_cache_budget_bucket_cny: float
 
 
 def _to_bool(value: str | None, default: bool = False) -> bool:
@@ -31,12 +56,37 @@ def _to_bool(value: str | None, default: bool = False) -> bool:
 def get_settings() -> Settings:
     return Settings(
         plan_provider=os.environ.get("PLAN_PROVIDER", "deepseek").strip().lower(),
+        app_warmup=_to_bool(os.environ.get("APP_WARMUP"), default=True),
         plan_graph_debug_stream=_to_bool(os.environ.get("PLAN_GRAPH_DEBUG_STREAM"), default=False),
         plan_graph_use_checkpointer=_to_bool(os.environ.get("PLAN_GRAPH_USE_CHECKPOINTER"), default=False),
         plan_graph_debug_thread_id=os.environ.get("PLAN_GRAPH_DEBUG_THREAD_ID", "").strip(),
+        plan_graph_checkpointer=os.environ.get("PLAN_GRAPH_CHECKPOINTER", "memory").strip().lower(),
+        plan_graph_checkpoint_max_threads=int(os.environ.get("PLAN_GRAPH_CHECKPOINT_MAX_THREADS", "10000")),
+        plan_graph_checkpoint_ttl_seconds=float(os.environ.get("PLAN_GRAPH_CHECKPOINT_TTL_SECONDS", "86400")),
+        plan_graph_checkpoint_path=os.environ.get("PLAN_GRAPH_CHECKPOINT_PATH", ".cache/plan_checkpoints.sqlite3").strip(),
+        plan_single_flight=_to_bool(os.environ.get("PLAN_SINGLE_FLIGHT"), default=True),
+        plan_batch_concurrency=max(1, int(os.environ.get("PLAN_BATCH_CONCURRENCY", "32"))),
+        plan_parallel_chunk_days=max(0, int(os.environ.get("PLAN_PARALLEL_CHUNK_DAYS", "0"))),
         deepseek_api_key=os.environ.get("DEEPSEEK_API_KEY", "").strip(),
         deepseek_api_base=os.environ.get("DEEPSEEK_API_BASE", "https://api.deepseek.com").strip(),
         deepseek_chat_path=os.environ.get("DEEPSEEK_CHAT_PATH", "/chat/completions").strip(),
         deepseek_model=os.environ.get("DEEPSEEK_MODEL", "deepseek-chat").strip(),
         deepseek_timeout_seconds=float(os.environ.get("DEEPSEEK_TIMEOUT_SECONDS", "30")),
+        deepseek_http2=_to_bool(os.environ.get("DEEPSEEK_HTTP2"), default=True),
+        deepseek_max_connections=int(os.environ.get("DEEPSEEK_MAX_CONNECTIONS", "200")),
+        deepseek_max_keepalive_connections=int(os.environ.get("DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS", "50")),
+        deepseek_keepalive_expiry_seconds=float(os.environ.get("DEEPSEEK_KEEPALIVE_EXPIRY_SECONDS", "60")),
+        llm_providers=os.environ.get("LLM_PROVIDERS", "").strip(),
+        llm_hedge_enabled=_to_bool(os.environ.get("LLM_HEDGE"), default=True),
+        llm_hedge_delay_seconds=float(os.environ.get("LLM_HEDGE_DELAY_SECONDS", "8")),
+        deepseek_min_timeout_seconds=float(os.environ.get("DEEPSEEK_MIN_TIMEOUT_SECONDS", "5")),
+        prompt_token_budget=int(os.environ.get("PROMPT_TOKEN_BUDGET", "1500")),
+        circuit_breaker_enabled=_to_bool(os.environ.get("CIRCUIT_BREAKER_ENABLED"), default=True),
+        circuit_failure_threshold=int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5")),
+        circuit_recovery_seconds=float(os.environ.get("CIRCUIT_RECOVERY_SECONDS", "30")),
+        plan_cache_backend=os.environ.get("PLAN_CACHE_BACKEND", "none").strip().lower(),
+        plan_cache_ttl_seconds=float(os.environ.get("PLAN_CACHE_TTL_SECONDS", "3600")),
+        plan_cache_max_entries=int(os.environ.get("PLAN_CACHE_MAX_ENTRIES", "4096")),
+        plan_cache_path=os.environ.get("PLAN_CACHE_PATH", ".cache/plan_cache.sqlite3").strip(),
+        plan_cache_budget_bucket_cny=float(os.environ.get("PLAN_CACHE_BUDGET_BUCKET_CNY", "1000")),
     )
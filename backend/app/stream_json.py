@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from .deepseek_client import DeepSeekClientError, parse_plan_content
+
+DAY_KEYS = ("day", "morning", "afternoon", "evening")
+
+_STRING_STOP = re.compile(r'["\\]')
+_LITERAL_CHARS = frozenset("0123456789+-.eEtrufalsn")
+_LITERAL = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_WHITESPACE = frozenset(" \t\r\n")
+
+# Container parse states.
+_KEY_OR_END, _KEY, _COLON, _VALUE, _VALUE_OR_END, _COMMA_OR_END = range(6)
+
+
+class PlanStreamParser:
+    """Incremental parser for a streamed plan completion.
+
+    ``feed`` takes content deltas as they arrive and checks the JSON
+    grammar on the fly, so a completion that goes off the rails (prose
+    instead of an object, broken syntax, a day missing its slots, more days
+    than requested, runaway length) raises ``DeepSeekClientError`` right
+    away instead of after the whole generation. Each top-level
+    ``itinerary`` entry is decoded the moment its object closes and
+    returned from that ``feed`` call. ``result`` parses and validates the
+    finished plan.
+    """
+
+    def __init__(self, *, expected_days: int | None = None, max_chars: int = 64_000) -> None:
+        self.expected_days = expected_days
+        self.max_chars = max_chars
+        self.text = ""
+        self.days: list[dict[str, Any]] = []
+        self._pos = 0
+        self._started = False
+        self._in_fence = False
+        self._done = False
+        # Stack of [kind, state, key]; kind is "{" or "[".
+        self._stack: list[list[Any]] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._literal_start = -1
+        self._item_start = -1
+
+    def _fail(self, reason: str) -> None:
+        raise DeepSeekClientError(f"DeepSeek stream aborted: {reason}.")
+
+    def feed(self, delta: str) -> list[dict[str, Any]]:
+        """Consume ``delta``; return itinerary days completed by it."""
+        self.text += delta
+        if len(self.text) > self.max_chars:
+            self._fail("completion too long")
+        known = len(self.days)
+        self._scan()
+        return self.days[known:]
+
+    @property
+    def complete(self) -> bool:
+        return self._done
+
+    def result(self) -> dict[str, Any]:
+        if not self._done:
+            self._fail("completion ended before the JSON object closed")
+        return parse_plan_content(self.text)
+
+    def _scan(self) -> None:
+        text = self.text
+        pos = self._pos
+        end = len(text)
+        while pos < end and not self._done:
+            if self._in_string:
+                pos = self._scan_string(text, pos)
+                continue
+            char = text[pos]
+            if self._literal_start >= 0:
+                if char in _LITERAL_CHARS:
+                    pos += 1
+                    continue
+                self._end_literal(text, pos)
+            if not self._started:
+                pos = self._scan_prefix(text, pos, char)
+                continue
+            if char in _WHITESPACE:
+                pos += 1
+                continue
+            self._structural(text, pos, char)
+            pos += 1
+        self._pos = pos
+
+    def _scan_prefix(self, text: str, pos: int, char: str) -> int:
+        # Tolerate whitespace and a ```json fence line before the object.
+        if self._in_fence:
+            if char == "\n":
+                self._in_fence = False
+            return pos + 1
+        if char in _WHITESPACE:
+            return pos + 1
+        if char == "`":
+            self._in_fence = True
+            return pos + 1
+        if char != "{":
+            self._fail("output does not start with a JSON object")
+        self._started = True
+        return pos
+
+    def _scan_string(self, text: str, pos: int) -> int:
+        if self._escape:
+            self._escape = False
+            return pos + 1
+        match = _STRING_STOP.search(text, pos)
+        if match is None:
+            return len(text)
+        stop = match.start()
+        if text[stop] == "\\":
+            self._escape = True
+            return stop + 1
+        self._in_string = False
+        self._end_string(text, stop)
+        return stop + 1
+
+    def _end_string(self, text: str, stop: int) -> None:
+        frame = self._stack[-1]
+        if frame[0] == "{" and frame[1] in (_KEY_OR_END, _KEY):
+            frame[2] = json.loads(text[self._string_start : stop + 1]) if len(self._stack) == 1 else None
+            frame[1] = _COLON
+        else:
+            self._value_done()
+
+    def _end_literal(self, text: str, pos: int) -> None:
+        token = text[self._literal_start : pos]
+        self._literal_start = -1
+        if not _LITERAL.fullmatch(token):
+            self._fail(f"invalid literal {token[:20]!r}")
+        self._value_done()
+
+    def _expect_value(self) -> None:
+        if self._stack and self._stack[-1][1] not in (_VALUE, _VALUE_OR_END):
+            self._fail("unexpected value")
+
+    def _structural(self, text: str, pos: int, char: str) -> None:
+        frame = self._stack[-1] if self._stack else None
+        if char == '"':
+            if frame is None:
+                self._fail("unexpected string")
+            if not (frame[0] == "{" and frame[1] in (_KEY_OR_END, _KEY)):
+                self._expect_value()
+            self._in_string = True
+            self._string_start = pos
+        elif char in "{[":
+            self._expect_value()
+            if self._is_itinerary_item_start(char):
+                self._item_start = pos
+            self._stack.append([char, _KEY_OR_END if char == "{" else _VALUE_OR_END, None])
+        elif char in "}]":
+            expected_state = _KEY_OR_END if char == "}" else _VALUE_OR_END
+            if frame is None or frame[0] != ("{" if char == "}" else "[") or frame[1] not in (expected_state, _COMMA_OR_END):
+                self._fail(f"unexpected {char!r}")
+            self._stack.pop()
+            if char == "}" and self._item_start >= 0 and len(self._stack) == 2:
+                self._close_day(text[self._item_start : pos + 1])
+            if not self._stack:
+                self._done = True
+                return
+            self._value_done()
+        elif char == ":":
+            if frame is None or frame[0] != "{" or frame[1] != _COLON:
+                self._fail("unexpected ':'")
+            frame[1] = _VALUE
+        elif char == ",":
+            if frame is None or frame[1] != _COMMA_OR_END:
+                self._fail("unexpected ','")
+            frame[1] = _KEY if frame[0] == "{" else _VALUE
+        elif char in _LITERAL_CHARS:
+            self._expect_value()
+            if frame is None:
+                self._fail("unexpected literal")
+            self._literal_start = pos
+        else:
+            self._fail(f"unexpected character {char!r}")
+
+    def _value_done(self) -> None:
+        self._stack[-1][1] = _COMMA_OR_END
+
+    def _is_itinerary_item_start(self, char: str) -> bool:
+        return (
+            char == "{"
+            and len(self._stack) == 2
+            and self._stack[1][0] == "["
+            and self._stack[0][2] == "itinerary"
+        )
+
+    def _close_day(self, raw: str) -> None:
+        self._item_start = -1
+        day = json.loads(raw)
+        missing = [key for key in DAY_KEYS if key not in day]
+        if missing:
+            self._fail(f"itinerary day missing {', '.join(missing)}")
+        self.days.append(day)
+        if self.expected_days is not None and len(self.days) > self.expected_days:
+            self._fail(f"more than {self.expected_days} itinerary days")
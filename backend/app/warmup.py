@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any
+
+from . import IMPORTED_AT
+from .checkpointers import get_checkpointer
+from .deepseek_client import open_async_client
+from .llm_router import get_llm_router
+from .metrics import METRICS, Sample, recording_paused
+from .plan_cache import get_plan_cache
+from .plan_graph import get_plan_graph, run_local_route
+from .settings import Settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Valid request for the engine; the invalid one routes the graph to finalize_local, so no LLM is called.
+_SYNTHETIC_REQUEST = {"destination": "成都", "days": 3, "travelers": 2, "budget_cny": 9000, "preferences": ["美食"]}
+_SYNTHETIC_INVALID_REQUEST = {"destination": "成都", "days": 0, "travelers": 2, "budget_cny": 9000}
+
+
+class WarmupState:
+    """Readiness plus the timings of the last warm-up and of the first plan served after it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.ready = False
+            self.error = ""
+            self.steps: dict[str, float] = {}
+            self.warmup_seconds: float | None = None
+            self.startup_seconds: float | None = None
+            self.first_request_seconds: float | None = None
+
+    def record_step(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.steps[name] = seconds
+
+    def mark_ready(self, warmup_seconds: float) -> None:
+        with self._lock:
+            self.ready = True
+            self.warmup_seconds = warmup_seconds
+            self.startup_seconds = time.monotonic() - IMPORTED_AT
+
+    def observe_request(self, seconds: float) -> None:
+        if self.first_request_seconds is not None:
+            return
+        with self._lock:
+            if self.first_request_seconds is not None:
+                return
+            self.first_request_seconds = seconds
+        LOGGER.info("first plan request after startup took %.1f ms", seconds * 1e3)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "error": self.error,
+                "startup_seconds": self.startup_seconds,
+                "warmup_seconds": self.warmup_seconds,
+                "steps": dict(self.steps),
+                "first_request_seconds": self.first_request_seconds,
+            }
+
+
+WARMUP = WarmupState()
+
+
+def _prepare(settings: Settings) -> None:
+    # The checkpointed variant (and the SQLite file / flusher behind it) is only
+    # built up front when every plan uses it; thread_id requests build it lazily.
+    started = time.perf_counter()
+    get_plan_graph(parallel_chunk_days=settings.plan_parallel_chunk_days)
+    if settings.plan_graph_use_checkpointer:
+        get_plan_graph(use_checkpointer=True, parallel_chunk_days=settings.plan_parallel_chunk_days)
+    WARMUP.record_step("compile_graphs", time.perf_counter() - started)
+
+    started = time.perf_counter()
+    get_llm_router()
+    get_plan_cache()
+    if settings.plan_graph_use_checkpointer:
+        get_checkpointer()
+    WARMUP.record_step("providers", time.perf_counter() - started)
+
+
+async def warm_up(settings: Settings) -> None:
+    """Open the HTTP pool, compile the plan graph, build providers and run a synthetic plan.
+
+    Blocking steps run in a worker thread so health probes are answered
+    meanwhile; ``WARMUP.ready`` flips once everything has run. A failed
+    step is logged and recorded, and the app is marked ready anyway so a
+    warm-up bug cannot keep a working instance out of rotation. The
+    synthetic plan is kept out of the plan and node-timing metrics.
+    """
+    WARMUP.reset()
+    started = time.perf_counter()
+    try:
+        step = time.perf_counter()
+        await open_async_client(settings)
+        WARMUP.record_step("http_pool", time.perf_counter() - step)
+
+        await asyncio.to_thread(_prepare, settings)
+
+        step = time.perf_counter()
+        with recording_paused():
+            await asyncio.to_thread(run_local_route, _SYNTHETIC_REQUEST)
+            graph = get_plan_graph(parallel_chunk_days=settings.plan_parallel_chunk_days)
+            await graph.ainvoke({"request": _SYNTHETIC_INVALID_REQUEST})
+        WARMUP.record_step("synthetic_plan", time.perf_counter() - step)
+    except Exception as exc:
+        LOGGER.exception("warm-up failed")
+        WARMUP.error = f"{exc.__class__.__name__}: {exc}"
+    WARMUP.mark_ready(time.perf_counter() - started)
+    stats = WARMUP.stats()
+    LOGGER.info(
+        "warm-up finished in %.1f ms (startup %.1f ms): %s",
+        stats["warmup_seconds"] * 1e3,
+        stats["startup_seconds"] * 1e3,
+        ", ".join(f"{name}={seconds * 1e3:.1f}ms" for name, seconds in stats["steps"].items()),
+    )
+
+
+def _warmup_samples() -> list[Sample]:
+    stats = WARMUP.stats()
+    samples: list[Sample] = [
+        ("app_ready", "gauge", "1 once warm-up has finished.", {}, float(stats["ready"])),
+        ("app_startup_seconds", "gauge", "Package import to end of warm-up.", {}, stats["startup_seconds"]),
+        ("app_warmup_seconds", "gauge", "Duration of the warm-up stage.", {}, stats["warmup_seconds"]),
+        ("app_first_request_seconds", "gauge", "Latency of the first /api/plan request.", {}, stats["first_request_seconds"]),
+    ]
+    samples += [
+        ("app_warmup_step_seconds", "gauge", "Duration of each warm-up step.", {"step": name}, seconds)
+        for name, seconds in stats["steps"].items()
+    ]
+    return samples
+
+
+METRICS.register_collector(_warmup_samples)
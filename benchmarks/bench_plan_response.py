@@ -0,0 +1,48 @@
+"""Compare response rendering for ``/api/plan``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_plan_response
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.app.plan_json import PlanJSONResponse, PreSerializedPlan
+from mvp_travel_agent import generate_plan
+
+
+def _plan(days: int) -> dict:
+    plan = generate_plan(
+        {"destination": "成都", "days": days, "travelers": 2, "budget_cny": 12000, "preferences": ["美食", "文化"]}
+    )
+    return {**plan, "provider": "deepseek"}
+
+
+def main(number: int = 20000) -> None:
+    print(f"{'case':<34}{'days':>6}{'us/op':>10}{'speedup':>10}")
+    for days in (2, 7, 14):
+        plan = _plan(days)
+        cached = PreSerializedPlan(plan)
+        cases = {
+            "jsonable_encoder + JSONResponse": lambda: JSONResponse(jsonable_encoder(plan)),
+            "PlanJSONResponse (fresh dict)": lambda: PlanJSONResponse(plan),
+            "PlanJSONResponse (cached bytes)": lambda: PlanJSONResponse(cached),
+        }
+        baseline = None
+        for name, case in cases.items():
+            seconds = min(timeit.repeat(case, number=number, repeat=3)) / number
+            baseline = baseline or seconds
+            print(f"{name:<34}{days:>6}{seconds * 1e6:>10.2f}{baseline / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Run the benchmark suite and compare against a stored baseline.
+
+Run from the repository root::
+
+    python -m benchmarks.run                       # all suites, compare with benchmarks/baseline.json
+    python -m benchmarks.run --suite graph --quick
+    python -m benchmarks.run --output results.json --save-baseline
+
+Exits with status 1 when a metric regresses by more than its threshold: the
+metric's own ``"threshold"`` if it has one, else ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from .suite import SUITES
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+FORMAT_VERSION = 1
+
+
+def run_suites(names: list[str], *, quick: bool = False) -> dict[str, Any]:
+    metrics: dict[str, Any] = {}
+    for name in names:
+        started = time.perf_counter()
+        metrics.update(SUITES[name](quick=quick))
+        print(f"[{name}] done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return {
+        "format": FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "metrics": metrics,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """One row per metric present in both; ``regressed`` when worse by more than the metric's threshold.
+
+    Metrics without a ``"threshold"`` of their own use ``threshold``.
+    """
+    rows = []
+    for name, current in results["metrics"].items():
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None or not previous["value"]:
+            continue
+        change = (current["value"] - previous["value"]) / abs(previous["value"])
+        worse = change if current["better"] == "lower" else -change
+        limit = current.get("threshold", threshold)
+        rows.append(
+            {
+                "metric": name,
+                "baseline": previous["value"],
+                "current": current["value"],
+                "change": change,
+                "threshold": limit,
+                "regressed": worse > limit,
+            }
+        )
+    return rows
+
+
+def _print_table(results: dict[str, Any], rows: list[dict[str, Any]]) -> None:
+    by_name = {row["metric"]: row for row in rows}
+    print(f"{'metric':<36}{'value':>12} {'unit':<6}{'baseline':>12}{'change':>9}")
+    for name, metric in results["metrics"].items():
+        row = by_name.get(name)
+        baseline = f"{row['baseline']:>12.3f}{row['change']:>+8.1%}" if row else f"{'-':>12}{'':>9}"
+        flag = "  REGRESSION" if row and row["regressed"] else ""
+        print(f"{name:<36}{metric['value']:>12.3f} {metric['unit']:<6}{baseline}{flag}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Travel planner benchmark suite.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="suite to run (repeatable; default all)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown for metrics without their own threshold")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    args = parser.parse_args(argv)
+
+    results = run_suites(args.suite or list(SUITES), quick=args.quick)
+    rows: list[dict[str, Any]] = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("quick") == results["quick"]:
+            rows = compare(results, baseline, args.threshold)
+        else:
+            print("baseline was recorded with a different --quick setting; not comparing", file=sys.stderr)
+    _print_table(results, rows)
+    text = json.dumps(results, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text)
+    if args.save_baseline:
+        args.baseline.write_text(text)
+        return 0
+    regressions = [f"{row['metric']} (>{row['threshold']:.0%})" for row in rows if row["regressed"]]
+    if regressions:
+        print(f"regressions: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Benchmark cases run by ``python -m benchmarks.run``.
+
+Each case returns ``{metric: {"value": float, "unit": str, "better": "lower" | "higher"}}``,
+plus an optional per-metric ``"threshold"`` that overrides ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import os
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from mvp_travel_agent.engine import generate_plan
+
+Metrics = dict[str, dict[str, Any]]
+
+DESTINATIONS = ("成都", "北京", "成都市", "不存在的城市")
+DAYS = (1, 3, 7, 15)
+TRAVELERS = (1, 4, 10)
+PREFERENCES = ((), ("美食",), ("文化", "自然", "购物"))
+
+# Absolute timings drift with machine load by tens of percent between runs, so
+# they only flag a doubling. Ratios of timings taken in the same interleaved
+# rounds cancel that drift and are held to the run's --threshold.
+ABSOLUTE_THRESHOLD = 1.0
+
+
+def request_shapes() -> list[dict[str, Any]]:
+    """Known, fuzzy-matched and unknown destinations across day, group and preference sizes."""
+    return [
+        {"destination": destination, "days": days, "travelers": travelers, "budget_cny": 3000.0 * days, "preferences": list(prefs)}
+        for destination, days, travelers, prefs in itertools.product(DESTINATIONS, DAYS, TRAVELERS, PREFERENCES)
+    ]
+
+
+def _interleaved_us(cases: dict[str, Callable[[], Any]], number: int, rounds: int) -> dict[str, float]:
+    """Min-of-``rounds`` microseconds per call; every case runs once per round so load drift hits all alike."""
+    best = dict.fromkeys(cases, math.inf)
+    for _ in range(rounds):
+        for name, func in cases.items():
+            best[name] = min(best[name], timeit.timeit(func, number=number) / number * 1e6)
+    return best
+
+
+def _lower(value: float, unit: str = "us", threshold: float | None = ABSOLUTE_THRESHOLD) -> dict[str, Any]:
+    metric = {"value": round(value, 3), "unit": unit, "better": "lower"}
+    if threshold is not None:
+        metric["threshold"] = threshold
+    return metric
+
+
+def _higher(value: float, unit: str, threshold: float | None = ABSOLUTE_THRESHOLD) -> dict[str, Any]:
+    metric = {"value": round(value, 3), "unit": unit, "better": "higher"}
+    if threshold is not None:
+        metric["threshold"] = threshold
+    return metric
+
+
+def _ratio(value: float, better: str = "lower") -> dict[str, Any]:
+    return {"value": round(value, 3), "unit": "x", "better": better}
+
+
+def _set_env(**values: str) -> dict[str, str | None]:
+    from backend.app.plan_graph import get_plan_graph
+    from backend.app.settings import get_settings
+
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    get_settings.cache_clear()
+    get_plan_graph.cache_clear()
+    return previous
+
+
+def _restore_env(previous: dict[str, str | None]) -> None:
+    from backend.app.plan_graph import get_plan_graph
+    from backend.app.settings import get_settings
+
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    get_settings.cache_clear()
+    get_plan_graph.cache_clear()
+
+
+def bench_engine(quick: bool = False) -> Metrics:
+    shapes = request_shapes()
+    number, rounds = (1, 5) if quick else (1, 31)
+    cases: dict[str, Callable[[], Any]] = {}
+    sizes: dict[str, int] = {}
+    for days in DAYS:
+        subset = [shape for shape in shapes if shape["days"] == days]
+        cases[f"days_{days}"] = lambda subset=subset: [generate_plan(shape) for shape in subset]
+        sizes[f"days_{days}"] = len(subset)
+    cases["all_shapes"] = lambda: [generate_plan(shape) for shape in shapes]
+    sizes["all_shapes"] = len(shapes)
+    timings = {name: value / sizes[name] for name, value in _interleaved_us(cases, number, rounds).items()}
+    metrics: Metrics = {f"engine.generate_plan.{name}": _lower(value) for name, value in timings.items()}
+    metrics["engine.generate_plan.days_15_vs_days_1"] = _ratio(timings[f"days_{DAYS[-1]}"] / timings[f"days_{DAYS[0]}"])
+    return metrics
+
+
+def bench_graph(quick: bool = False) -> Metrics:
+    from backend.app import plan_service
+    from backend.app.checkpointers import close_checkpointer
+    from backend.app.plan_graph import run_plan_graph
+
+    request = {"destination": "成都", "days": 5, "travelers": 2, "budget_cny": 9000, "preferences": ["美食"]}
+    number, rounds = (20, 5) if quick else (40, 31)
+    previous = _set_env(PLAN_PROVIDER="local", PLAN_GRAPH_CHECKPOINTER="memory")
+    try:
+        run_plan_graph(request)
+        timings = _interleaved_us(
+            {
+                "engine": lambda: generate_plan(request),
+                "invoke": lambda: run_plan_graph(request),
+                "debug_stream": lambda: run_plan_graph(request, debug_stream=True),
+                "checkpointer": lambda: run_plan_graph(request, use_checkpointer=True),
+                "fast_path": lambda: plan_service.generate_plan(request),
+            },
+            number,
+            rounds,
+        )
+    finally:
+        close_checkpointer()
+        _restore_env(previous)
+    engine, invoke = timings["engine"], timings["invoke"]
+    return {
+        "graph.engine_direct": _lower(engine),
+        "graph.invoke": _lower(invoke),
+        "graph.invoke_overhead": _lower(invoke - engine),
+        "graph.debug_stream": _lower(timings["debug_stream"]),
+        "graph.checkpointer": _lower(timings["checkpointer"]),
+        "graph.local_fast_path": _lower(timings["fast_path"]),
+        "graph.invoke_overhead_ratio": _ratio((invoke - engine) / engine),
+        "graph.debug_stream_ratio": _ratio(timings["debug_stream"] / invoke),
+        "graph.checkpointer_ratio": _ratio(timings["checkpointer"] / invoke),
+        "graph.local_fast_path_ratio": _ratio(timings["fast_path"] / engine),
+        "graph.local_fast_path_speedup": _ratio(invoke / timings["fast_path"], "higher"),
+    }
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _drive_api(total: int, concurrency: int) -> tuple[float, list[float]]:
+    import httpx
+
+    from backend.app.main import app
+
+    latencies: list[float] = []
+    queue = iter(range(total))
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            for index in queue:
+                # Distinct budgets keep single-flight from coalescing the requests.
+                payload = {"destination": "成都", "days": 3, "travelers": 2, "budget_cny": 9000 + index, "preferences": []}
+                started = perf_counter()
+                response = await client.post("/api/plan", json=payload)
+                latencies.append(perf_counter() - started)
+                if response.status_code != 200 or response.json().get("provider") != "deepseek":
+                    raise RuntimeError(f"unexpected /api/plan response: {response.status_code} {response.text[:200]}")
+
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return perf_counter() - started, latencies
+
+
+def bench_api(quick: bool = False, latency: str = "0.02") -> Metrics:
+    from backend.app.mock_llm import MockLLMConfig, MockLLMServer
+
+    total, concurrency = (100, 16) if quick else (600, 32)
+    with MockLLMServer(config=MockLLMConfig(latency=latency)) as server:
+        previous = _set_env(
+            PLAN_PROVIDER="deepseek",
+            DEEPSEEK_API_BASE=server.base_url,
+            DEEPSEEK_API_KEY="bench",
+            LLM_PROVIDERS="",
+            LLM_HEDGE="false",
+            PLAN_CACHE_BACKEND="none",
+        )
+        try:
+            elapsed, latencies = asyncio.run(_drive_api(total, concurrency))
+        finally:
+            _restore_env(previous)
+    ordered = sorted(latencies)
+    return {
+        "api.plan.rps": _higher(total / elapsed, "req/s"),
+        "api.plan.p50": _lower(_percentile(ordered, 0.50) * 1e3, "ms"),
+        "api.plan.p95": _lower(_percentile(ordered, 0.95) * 1e3, "ms"),
+        "api.plan.p99": _lower(_percentile(ordered, 0.99) * 1e3, "ms"),
+        "api.plan.mean": _lower(statistics.fmean(ordered) * 1e3, "ms"),
+    }
+
+
+SUITES: dict[str, Callable[..., Metrics]] = {
+    "engine": bench_engine,
+    "graph": bench_graph,
+    "api": bench_api,
+}
@@ -37,7 +37,7 @@ function renderNeedMoreInfo(payload) {
   `;
 }
 
-function renderSuccess(payload) {
+function renderSuccess(payload, draft = false) {
   const total = payload.price_breakdown.total;
   const budget = payload.request_summary.budget_cny;
   const budgetState = total <= budget ? "预算内" : "预算超出";
@@ -65,7 +65,7 @@ function renderSuccess(payload) {
 
   resultRoot.innerHTML = `
     <div class="result-head">
-      <h2>规划结果</h2>
+      <h2>${draft ? "规划初稿（AI 优化中…）" : "规划结果"}</h2>
       <span class="status-pill ${budgetClass}">${budgetState}</span>
     </div>
     <div class="cards">
@@ -86,6 +86,60 @@ function renderSuccess(payload) {
   `;
 }
 
+function renderPlan(result, draft = false) {
+  resultRoot.classList.remove("hidden");
+  if (result.status === "need_more_info") {
+    renderNeedMoreInfo(result);
+  } else {
+    renderSuccess(result, draft);
+  }
+}
+
+async function readPlanStream(response) {
+  // Server-Sent Events over POST: baseline first, refined days as they close, then the plan.
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let draft = null;
+  let finalPlan = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      const eventName = (block.match(/^event: (.*)$/m) || [])[1];
+      const data = (block.match(/^data: (.*)$/m) || [])[1];
+      if (eventName === "baseline") {
+        draft = JSON.parse(data);
+        renderPlan(draft, true);
+      } else if (eventName === "day" && draft && draft.itinerary) {
+        const day = JSON.parse(data);
+        const index = draft.itinerary.findIndex((item) => item.day === day.day);
+        if (index !== -1) {
+          draft.itinerary[index] = day;
+          renderPlan(draft, true);
+        }
+      } else if (eventName === "plan") {
+        finalPlan = JSON.parse(data);
+        renderPlan(finalPlan);
+      } else if (eventName === "error") {
+        throw new Error(JSON.parse(data).message);
+      }
+    }
+  }
+
+  if (!finalPlan) {
+    throw new Error("规划流提前结束");
+  }
+}
+
 async function submitPlan(event) {
   event.preventDefault();
   submitBtn.disabled = true;
@@ -104,7 +158,7 @@ async function submitPlan(event) {
   };
 
   try {
-    const response = await fetch(`${apiBase}/api/plan`, {
+    const response = await fetch(`${apiBase}/api/plan/stream`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(payload),
@@ -115,14 +169,7 @@ async function submitPlan(event) {
       throw new Error(`HTTP ${response.status}: ${detail}`);
     }
 
-    const result = await response.json();
-    resultRoot.classList.remove("hidden");
-
-    if (result.status === "need_more_info") {
-      renderNeedMoreInfo(result);
-    } else {
-      renderSuccess(result);
-    }
+    await readPlanStream(response);
   } catch (error) {
     resultRoot.classList.remove("hidden");
     resultRoot.innerHTML = `
@@ -1,5 +1,5 @@
 """Travel SaaS MVP package."""
 
-from .engine import generate_plan
+from .engine import build_plan, generate_plan
 
-__all__ = ["generate_plan"]
+__all__ = ["build_plan", "generate_plan"]
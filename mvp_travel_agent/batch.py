@@ -0,0 +1,81 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from .catalog import get_catalog
+from .engine import build_plan
+
+
+def plan_jsonl_line(line_no: int, line: str) -> str:
+    try:
+        payload = json.loads(line)
+    except json.JSONDecodeError:
+        return f'{{"line":{line_no},"error":"invalid_json"}}'
+    if not isinstance(payload, dict):
+        return f'{{"line":{line_no},"error":"invalid_request"}}'
+    try:
+        # Serialize straight from the frozen result; no intermediate dicts.
+        result = build_plan(payload).to_json()
+    except Exception as exc:
+        # One bad line must not take down its chunk (or the whole run) with it.
+        record = {"line": line_no, "error": "plan_failed", "detail": f"{exc.__class__.__name__}: {exc}"}
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return f'{{"line":{line_no},"result":{result}}}'
+
+
+def _plan_chunk(chunk: list[tuple[int, str]]) -> list[str]:
+    return [plan_jsonl_line(line_no, line) for line_no, line in chunk]
+
+
+def _numbered(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    for line_no, line in enumerate(lines, start=1):
+        if line.strip():
+            yield line_no, line
+
+
+def _chunks(items: Iterator[tuple[int, str]], size: int) -> Iterator[list[tuple[int, str]]]:
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def run_local_batch(
+    lines: Iterable[str],
+    out: TextIO,
+    *,
+    workers: int | None = None,
+    chunk_size: int = 256,
+) -> int:
+    """Plan every JSONL request in ``lines`` and write JSONL results in input order.
+
+    Chunks are fanned out to a process pool with at most ``2 * workers``
+    chunks in flight, so memory stays flat regardless of input size.
+    ``workers=0`` plans inline without a pool.
+    """
+    chunks = _chunks(_numbered(lines), chunk_size)
+    written = 0
+
+    def write(records: list[str]) -> None:
+        nonlocal written
+        for record in records:
+            out.write(record + "\n")
+        written += len(records)
+
+    if workers == 0:
+        for chunk in chunks:
+            write(_plan_chunk(chunk))
+        return written
+
+    workers = workers or os.cpu_count() or 1
+    get_catalog()  # compile before forking so workers share the catalog pages
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[list[str]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_plan_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return written
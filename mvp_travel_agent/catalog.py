@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "data" / "destinations.json"
+DEFAULT_SPOT = {"lat": 0.0, "lon": 0.0, "duration_hours": 3.0, "tags": (), "open_hour": 8.0, "close_hour": 18.0}
+COST_COLUMNS = (
+    "transport_per_person",
+    "hotel_per_night",
+    "ticket_per_day_per_person",
+    "meal_per_day_per_person",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DestinationCatalog:
+    """Destination data compiled into id-indexed columns.
+
+    Costs live in flat ``array`` buffers rather than per-city dicts, so a
+    catalog loaded before workers fork stays shared copy-on-write (no
+    per-value refcounts to touch) and every lookup is one hash plus an
+    index.
+    """
+
+    names: tuple[str, ...]
+    index: dict[str, int]
+    aliases: tuple[tuple[str, ...], ...]
+    pinyin: tuple[str, ...]
+    latin: tuple[tuple[str, ...], ...]
+    spots: tuple[tuple[str, ...], ...]
+    spot_offsets: array
+    spot_lat: array
+    spot_lon: array
+    spot_duration_hours: array
+    spot_open_hour: array
+    spot_close_hour: array
+    spot_tags: tuple[frozenset[str], ...]
+    transport_per_person: array
+    hotel_per_night: array
+    ticket_per_day_per_person: array
+    meal_per_day_per_person: array
+    fallback_id: int
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, name: str) -> int | None:
+        return self.index.get(name)
+
+    def id_or_fallback(self, name: str) -> int:
+        return self.index.get(name, self.fallback_id)
+
+    def spot_range(self, city_id: int) -> range:
+        """Flat spot indexes of one city (CSR layout over the ``spot_*`` columns)."""
+        return range(self.spot_offsets[city_id], self.spot_offsets[city_id + 1])
+
+
+def _interned(values: list[Any]) -> tuple[str, ...]:
+    return tuple(sys.intern(str(value)) for value in values)
+
+
+def _spot_fields(spot: str | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(spot, str):
+        return {**DEFAULT_SPOT, "name": spot}
+    return {**DEFAULT_SPOT, **spot}
+
+
+def compile_catalog(raw: dict[str, Any]) -> DestinationCatalog:
+    entries = raw["destinations"]
+    names = _interned([entry["name"] for entry in entries])
+    index = {name: city_id for city_id, name in enumerate(names)}
+    if len(index) != len(names):
+        raise ValueError("Destination catalog contains duplicate names.")
+
+    fallback = raw.get("fallback", names[0])
+    if fallback not in index:
+        raise ValueError(f"Fallback destination {fallback!r} is not in the catalog.")
+
+    spot_offsets = array("q", [0])
+    spot_columns = {key: array("d") for key in ("lat", "lon", "duration_hours", "open_hour", "close_hour")}
+    spot_names: list[tuple[str, ...]] = []
+    spot_tags: list[frozenset[str]] = []
+    for entry in entries:
+        fields = [_spot_fields(spot) for spot in entry["spots"]]
+        if not fields:
+            raise ValueError(f"{entry['name']}: at least one spot is required.")
+        spot_names.append(_interned([spot["name"] for spot in fields]))
+        for spot in fields:
+            for key, column in spot_columns.items():
+                column.append(float(spot[key]))
+            spot_tags.append(frozenset(_interned(spot["tags"])))
+        spot_offsets.append(spot_offsets[-1] + len(fields))
+
+    columns = {column: array("q", (int(entry[column]) for entry in entries)) for column in COST_COLUMNS}
+    return DestinationCatalog(
+        names=names,
+        index=index,
+        aliases=tuple(_interned(entry.get("aliases", [])) for entry in entries),
+        pinyin=_interned([entry.get("pinyin", "") for entry in entries]),
+        latin=tuple(_interned(entry.get("latin", [])) for entry in entries),
+        spots=tuple(spot_names),
+        spot_offsets=spot_offsets,
+        spot_lat=spot_columns["lat"],
+        spot_lon=spot_columns["lon"],
+        spot_duration_hours=spot_columns["duration_hours"],
+        spot_open_hour=spot_columns["open_hour"],
+        spot_close_hour=spot_columns["close_hour"],
+        spot_tags=tuple(spot_tags),
+        fallback_id=index[fallback],
+        **columns,
+    )
+
+
+def load_catalog(path: str | Path) -> DestinationCatalog:
+    return compile_catalog(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> DestinationCatalog:
+    return load_catalog(os.environ.get("TRAVEL_DESTINATION_CATALOG") or DEFAULT_CATALOG_PATH)
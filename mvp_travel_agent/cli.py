@@ -1,15 +1,39 @@
 import argparse
 import json
+import sys
 from pathlib import Path
 
+from .batch import run_local_batch
 from .engine import generate_plan
 
 
+def _run_batch(args: argparse.Namespace) -> None:
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    target = sys.stdout if args.output in (None, "-") else open(args.output, "w", encoding="utf-8")
+    try:
+        count = run_local_batch(source, target, workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"planned {count} requests", file=sys.stderr)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Travel SaaS MVP CLI")
-    parser.add_argument("--input", required=True, help="Path to request JSON file")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--input", help="Path to request JSON file")
+    mode.add_argument("--batch", help="Path to JSONL requests, one per line ('-' for stdin)")
+    parser.add_argument("--output", help="Batch mode: JSONL output path (default stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Batch mode: worker processes (0 = inline)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Batch mode: requests per worker task")
     args = parser.parse_args()
 
+    if args.batch:
+        _run_batch(args)
+        return
+
     input_path = Path(args.input)
     payload = json.loads(input_path.read_text(encoding="utf-8"))
     result = generate_plan(payload)
@@ -18,4 +42,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
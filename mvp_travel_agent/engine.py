@@ -1,43 +1,26 @@
 import math
 from typing import Any
 
-from .models import DayPlan, TravelRequest
-
-
-DESTINATION_DATA = {
-    "北京": {
-        "spots": ["故宫", "天坛", "颐和园", "南锣鼓巷", "798艺术区"],
-        "transport_per_person": 1200,
-        "hotel_per_night": 480,
-        "ticket_per_day_per_person": 140,
-        "meal_per_day_per_person": 180,
-    },
-    "上海": {
-        "spots": ["外滩", "豫园", "上海博物馆", "武康路", "迪士尼小镇"],
-        "transport_per_person": 1100,
-        "hotel_per_night": 520,
-        "ticket_per_day_per_person": 160,
-        "meal_per_day_per_person": 200,
-    },
-    "成都": {
-        "spots": ["宽窄巷子", "锦里", "杜甫草堂", "大熊猫基地", "都江堰"],
-        "transport_per_person": 1000,
-        "hotel_per_night": 420,
-        "ticket_per_day_per_person": 130,
-        "meal_per_day_per_person": 170,
-    },
-}
+from .catalog import get_catalog
+from .models import DayPlan, NeedMoreInfo, PlanResult, PriceBreakdown, TravelRequest
+from .optimizer import optimize_day_slots
+from .resolver import resolve_destination
+
 
 REQUIRED_FIELDS = ["destination", "days", "travelers", "budget_cny"]
+SERVICE_FEE_RATE = 0.08
 
 
 def _normalize_request(raw: dict[str, Any]) -> TravelRequest:
+    destination = str(raw["destination"]).strip()
+    resolution = resolve_destination(destination)
     return TravelRequest(
-        destination=str(raw["destination"]).strip(),
+        destination=resolution.name if resolution else destination,
         days=int(raw["days"]),
         travelers=int(raw["travelers"]),
         budget_cny=float(raw["budget_cny"]),
-        preferences=list(raw.get("preferences", [])),
+        preferences=tuple(raw.get("preferences", [])),
+        destination_match=resolution.method if resolution else "",
     )
 
 
@@ -70,42 +53,37 @@ def _validate_request(raw: dict[str, Any]) -> list[str]:
     return missing
 
 
-def _build_itinerary(req: TravelRequest) -> list[dict[str, Any]]:
-    city_data = DESTINATION_DATA.get(req.destination, DESTINATION_DATA["北京"])
-    spots = city_data["spots"]
-    itinerary: list[dict[str, Any]] = []
-
-    for day in range(1, req.days + 1):
-        base = (day - 1) * 2
-        morning = spots[base % len(spots)]
-        afternoon = spots[(base + 1) % len(spots)]
-        evening = "本地特色美食 + 自由活动"
-        day_plan = DayPlan(day=day, morning=morning, afternoon=afternoon, evening=evening)
-        itinerary.append(day_plan.to_dict())
-
-    return itinerary
+def _build_itinerary(req: TravelRequest) -> tuple[DayPlan, ...]:
+    catalog = get_catalog()
+    city_id = catalog.id_or_fallback(req.destination)
+    evening = "本地特色美食 + 自由活动"
+    return tuple(
+        DayPlan(day=day, morning=morning, afternoon=afternoon, evening=evening)
+        for day, (morning, afternoon) in enumerate(optimize_day_slots(catalog, city_id, req.days, req.preferences), start=1)
+    )
 
 
-def _estimate_price(req: TravelRequest) -> dict[str, float]:
-    city_data = DESTINATION_DATA.get(req.destination, DESTINATION_DATA["北京"])
+def _estimate_price(req: TravelRequest) -> PriceBreakdown:
+    catalog = get_catalog()
+    city_id = catalog.id_or_fallback(req.destination)
     nights = max(req.days - 1, 1)
 
-    transport = city_data["transport_per_person"] * req.travelers
-    hotel = city_data["hotel_per_night"] * nights
-    tickets = city_data["ticket_per_day_per_person"] * req.days * req.travelers
-    meals = city_data["meal_per_day_per_person"] * req.days * req.travelers
+    transport = catalog.transport_per_person[city_id] * req.travelers
+    hotel = catalog.hotel_per_night[city_id] * nights
+    tickets = catalog.ticket_per_day_per_person[city_id] * req.days * req.travelers
+    meals = catalog.meal_per_day_per_person[city_id] * req.days * req.travelers
     subtotal = transport + hotel + tickets + meals
-    service_fee = math.ceil(subtotal * 0.08)
+    service_fee = math.ceil(subtotal * SERVICE_FEE_RATE)
     total = subtotal + service_fee
 
-    return {
-        "transport": float(transport),
-        "hotel": float(hotel),
-        "tickets": float(tickets),
-        "meals": float(meals),
-        "service_fee": float(service_fee),
-        "total": float(total),
-    }
+    return PriceBreakdown(
+        transport=float(transport),
+        hotel=float(hotel),
+        tickets=float(tickets),
+        meals=float(meals),
+        service_fee=float(service_fee),
+        total=float(total),
+    )
 
 
 def _evaluate_risk(req: TravelRequest, total_price: float) -> tuple[list[str], bool]:
@@ -124,37 +102,35 @@ def _evaluate_risk(req: TravelRequest, total_price: float) -> tuple[list[str], b
         risk_flags.append("large_group_manual_review")
         handoff_to_human = True
 
-    if req.destination not in DESTINATION_DATA:
+    if get_catalog().lookup(req.destination) is None:
         risk_flags.append("destination_fallback_template")
+    elif req.destination_match == "fuzzy":
+        risk_flags.append("destination_fuzzy_match")
 
     return risk_flags, handoff_to_human
 
 
-def generate_plan(raw_request: dict[str, Any]) -> dict[str, Any]:
+def build_plan(raw_request: dict[str, Any]) -> PlanResult | NeedMoreInfo:
     missing_fields = _validate_request(raw_request)
     if missing_fields:
-        return {
-            "status": "need_more_info",
-            "missing_fields": missing_fields,
-            "message": "请求信息不完整或不合法，请补充后重试。",
-        }
+        return NeedMoreInfo(
+            missing_fields=tuple(missing_fields),
+            message="请求信息不完整或不合法，请补充后重试。",
+        )
 
     req = _normalize_request(raw_request)
     itinerary = _build_itinerary(req)
     price_breakdown = _estimate_price(req)
-    risk_flags, handoff_to_human = _evaluate_risk(req, price_breakdown["total"])
-
-    return {
-        "status": "ok",
-        "request_summary": {
-            "destination": req.destination,
-            "days": req.days,
-            "travelers": req.travelers,
-            "budget_cny": req.budget_cny,
-            "preferences": req.preferences,
-        },
-        "itinerary": itinerary,
-        "price_breakdown": price_breakdown,
-        "risk_flags": risk_flags,
-        "handoff_to_human": handoff_to_human,
-    }
+    risk_flags, handoff_to_human = _evaluate_risk(req, price_breakdown.total)
+
+    return PlanResult(
+        request=req,
+        itinerary=itinerary,
+        price_breakdown=price_breakdown,
+        risk_flags=tuple(risk_flags),
+        handoff_to_human=handoff_to_human,
+    )
+
+
+def generate_plan(raw_request: dict[str, Any]) -> dict[str, Any]:
+    return build_plan(raw_request).to_dict()
@@ -1,17 +1,63 @@
-from dataclasses import dataclass, field
+import json
+import math
+from dataclasses import dataclass
 from typing import Any
 
+# C-accelerated string encoder without ASCII escaping (json.dumps(ensure_ascii=False)).
+_encode_str = json.encoder.encode_basestring
 
-@dataclass
+
+def _json_value(value: Any) -> str:
+    if isinstance(value, str):
+        return _encode_str(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float) and math.isfinite(value):
+        return float.__repr__(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_array(values: tuple[Any, ...]) -> str:
+    return "[" + ",".join(_json_value(value) for value in values) + "]"
+
+
+def _with_provider(body: str, provider: str | None) -> str:
+    if provider is None:
+        return body
+    return f'{body[:-1]},"provider":{_encode_str(provider)}}}'
+
+
+@dataclass(frozen=True, slots=True)
 class TravelRequest:
     destination: str
     days: int
     travelers: int
     budget_cny: float
-    preferences: list[str] = field(default_factory=list)
+    preferences: tuple[Any, ...] = ()
+    destination_match: str = ""
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "destination": self.destination,
+            "days": self.days,
+            "travelers": self.travelers,
+            "budget_cny": self.budget_cny,
+            "preferences": list(self.preferences),
+        }
+
+    def to_json(self) -> str:
+        return (
+            f'{{"destination":{_encode_str(self.destination)},"days":{self.days},'
+            f'"travelers":{self.travelers},"budget_cny":{_json_value(self.budget_cny)},'
+            f'"preferences":{_json_array(self.preferences)}}}'
+        )
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class DayPlan:
     day: int
     morning: str
@@ -26,3 +72,93 @@ class DayPlan:
             "evening": self.evening,
         }
 
+    def to_json(self) -> str:
+        return (
+            f'{{"day":{self.day},"morning":{_encode_str(self.morning)},'
+            f'"afternoon":{_encode_str(self.afternoon)},"evening":{_encode_str(self.evening)}}}'
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PriceBreakdown:
+    transport: float
+    hotel: float
+    tickets: float
+    meals: float
+    service_fee: float
+    total: float
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "transport": self.transport,
+            "hotel": self.hotel,
+            "tickets": self.tickets,
+            "meals": self.meals,
+            "service_fee": self.service_fee,
+            "total": self.total,
+        }
+
+    def to_json(self) -> str:
+        return (
+            f'{{"transport":{_json_value(self.transport)},"hotel":{_json_value(self.hotel)},'
+            f'"tickets":{_json_value(self.tickets)},"meals":{_json_value(self.meals)},'
+            f'"service_fee":{_json_value(self.service_fee)},"total":{_json_value(self.total)}}}'
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PlanResult:
+    request: TravelRequest
+    itinerary: tuple[DayPlan, ...]
+    price_breakdown: PriceBreakdown
+    risk_flags: tuple[str, ...]
+    handoff_to_human: bool
+    status: str = "ok"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "request_summary": self.request.to_dict(),
+            "itinerary": [day.to_dict() for day in self.itinerary],
+            "price_breakdown": self.price_breakdown.to_dict(),
+            "risk_flags": list(self.risk_flags),
+            "handoff_to_human": self.handoff_to_human,
+        }
+
+    def to_json(self, provider: str | None = None) -> str:
+        """Compact JSON, byte-identical to ``json.dumps(to_dict(), ensure_ascii=False, separators=(",", ":"))``."""
+        body = (
+            f'{{"status":{_encode_str(self.status)},"request_summary":{self.request.to_json()},'
+            f'"itinerary":[{",".join(day.to_json() for day in self.itinerary)}],'
+            f'"price_breakdown":{self.price_breakdown.to_json()},'
+            f'"risk_flags":{_json_array(self.risk_flags)},'
+            f'"handoff_to_human":{_json_value(self.handoff_to_human)}}}'
+        )
+        return _with_provider(body, provider)
+
+    def to_json_bytes(self, provider: str | None = None) -> bytes:
+        return self.to_json(provider).encode("utf-8")
+
+
+@dataclass(frozen=True, slots=True)
+class NeedMoreInfo:
+    missing_fields: tuple[str, ...]
+    message: str
+    status: str = "need_more_info"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "missing_fields": list(self.missing_fields),
+            "message": self.message,
+        }
+
+    def to_json(self, provider: str | None = None) -> str:
+        body = (
+            f'{{"status":{_encode_str(self.status)},"missing_fields":{_json_array(self.missing_fields)},'
+            f'"message":{_encode_str(self.message)}}}'
+        )
+        return _with_provider(body, provider)
+
+    def to_json_bytes(self, provider: str | None = None) -> bytes:
+        return self.to_json(provider).encode("utf-8")
@@ -0,0 +1,105 @@
+import math
+from typing import Sequence
+
+from .catalog import DestinationCatalog
+
+MORNING_WINDOW = (9.0, 12.5)
+AFTERNOON_WINDOW = (13.5, 18.0)
+
+
+def _preference_score(tags: frozenset[str], preferences: Sequence[str]) -> float:
+    score = 1.0
+    for preference in preferences:
+        if not isinstance(preference, str):
+            continue
+        if preference in tags or any(preference in tag or tag in preference for tag in tags):
+            score += 1.0
+    return score
+
+
+def _slot_penalty(catalog: DestinationCatalog, spot: int, window: tuple[float, float]) -> float:
+    start, end = window
+    closed = max(0.0, catalog.spot_open_hour[spot] - start) + max(0.0, end - catalog.spot_close_hour[spot])
+    overrun = max(0.0, catalog.spot_duration_hours[spot] - (end - start))
+    return closed + overrun
+
+
+def _route(points: list[tuple[float, float]]) -> list[int]:
+    """Open path through ``points``: nearest-neighbour seed, then 2-opt until no gain."""
+    count = len(points)
+    if count <= 2:
+        return list(range(count))
+
+    dist = [[math.hypot(ax - bx, ay - by) for bx, by in points] for ax, ay in points]
+
+    path = [0]
+    remaining = set(range(1, count))
+    while remaining:
+        row = dist[path[-1]]
+        nearest = min(remaining, key=lambda candidate: (row[candidate], candidate))
+        path.append(nearest)
+        remaining.remove(nearest)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, count - 1):
+            for j in range(i + 1, count):
+                before = dist[path[i - 1]][path[i]]
+                after = dist[path[i - 1]][path[j]]
+                if j + 1 < count:
+                    before += dist[path[j]][path[j + 1]]
+                    after += dist[path[i]][path[j + 1]]
+                if after < before - 1e-12:
+                    path[i : j + 1] = reversed(path[i : j + 1])
+                    improved = True
+    return path
+
+
+def optimize_day_slots(
+    catalog: DestinationCatalog,
+    city_id: int,
+    days: int,
+    preferences: Sequence[str],
+) -> list[tuple[str, str]]:
+    """Pick (morning, afternoon) spots per day.
+
+    The highest-scoring spots for ``preferences`` are routed with a TSP
+    heuristic and the route is cut into consecutive pairs, so each day
+    stays in one area (route first, cluster second). Within a day the pair
+    is oriented to fit opening hours and visit durations. When a city has
+    fewer spots than slots, the day pairs repeat; an odd spot left at the end
+    of the route is paired with its nearest neighbour.
+    """
+    candidates = list(catalog.spot_range(city_id))
+    slots = days * 2
+    ranked = sorted(candidates, key=lambda spot: (-_preference_score(catalog.spot_tags[spot], preferences), spot))
+    selected = ranked[: min(slots, len(ranked))]
+
+    mean_lat = math.radians(sum(catalog.spot_lat[spot] for spot in selected) / len(selected))
+    scale = math.cos(mean_lat)
+    points = [(catalog.spot_lon[spot] * scale, catalog.spot_lat[spot]) for spot in selected]
+    order = _route(points)
+    pairs = [(order[index], order[index + 1]) for index in range(0, len(order) - 1, 2)]
+    if len(order) % 2:
+        # The leftover end of the route gets its nearest spot, not the far start of the route.
+        last = order[-1]
+        lx, ly = points[last]
+        nearest = min(
+            (index for index in order if index != last),
+            key=lambda index: (math.hypot(points[index][0] - lx, points[index][1] - ly), index),
+            default=last,
+        )
+        pairs.append((last, nearest))
+
+    names = catalog.spots[city_id]
+    offset = catalog.spot_offsets[city_id]
+    day_slots: list[tuple[str, str]] = []
+    for day in range(days):
+        first, second = (selected[index] for index in pairs[day % len(pairs)])
+        keep = _slot_penalty(catalog, first, MORNING_WINDOW) + _slot_penalty(catalog, second, AFTERNOON_WINDOW)
+        swap = _slot_penalty(catalog, second, MORNING_WINDOW) + _slot_penalty(catalog, first, AFTERNOON_WINDOW)
+        if swap < keep:
+            first, second = second, first
+        day_slots.append((names[first - offset], names[second - offset]))
+    return day_slots
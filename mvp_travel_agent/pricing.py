@@ -0,0 +1,74 @@
+from typing import Any, Sequence
+
+from .catalog import COST_COLUMNS, get_catalog
+from .engine import SERVICE_FEE_RATE
+from .resolver import get_resolver
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the scalar engine stays stdlib-only.
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Vectorized pricing requires numpy: pip install numpy")
+
+
+def _cost_table() -> Any:
+    catalog = get_catalog()
+    # Views over the catalog's array buffers; stacking is O(cities), not O(rows).
+    return np.stack([np.frombuffer(getattr(catalog, column), dtype=np.int64) for column in COST_COLUMNS], axis=1)
+
+
+def _destination_row(name: Any) -> int:
+    resolution = get_resolver().resolve(str(name).strip())
+    return resolution.city_id if resolution else get_catalog().fallback_id
+
+
+def _destination_rows(destinations: Sequence[str] | Any) -> Any:
+    # Resolve each distinct name once, then broadcast back to every row.
+    unique, inverse = np.unique(np.asarray(destinations), return_inverse=True)
+    rows = np.fromiter((_destination_row(name) for name in unique), dtype=np.intp, count=len(unique))
+    return rows[inverse.reshape(-1)]
+
+
+def estimate_prices(
+    destinations: Sequence[str] | Any,
+    days: Sequence[int] | Any,
+    travelers: Sequence[int] | Any,
+    budgets: Sequence[float] | Any,
+) -> dict[str, Any]:
+    """Price N requests at once and return the breakdown and budget flags as columns.
+
+    Every price column is float64 and equals ``float(...)`` of the scalar
+    engine result for the same row.
+    """
+    _require_numpy()
+    days_arr = np.asarray(days, dtype=np.int64)
+    travelers_arr = np.asarray(travelers, dtype=np.int64)
+    budgets_arr = np.asarray(budgets, dtype=np.float64)
+    costs = _cost_table()[_destination_rows(destinations)]
+
+    nights = np.maximum(days_arr - 1, 1)
+    transport = costs[:, 0] * travelers_arr
+    hotel = costs[:, 1] * nights
+    tickets = costs[:, 2] * days_arr * travelers_arr
+    meals = costs[:, 3] * days_arr * travelers_arr
+    subtotal = transport + hotel + tickets + meals
+    service_fee = np.ceil(subtotal * SERVICE_FEE_RATE)
+    total = subtotal + service_fee
+
+    budget_exceeded = total > budgets_arr
+    budget_handoff = total > budgets_arr * 1.2
+    return {
+        "transport": transport.astype(np.float64),
+        "hotel": hotel.astype(np.float64),
+        "tickets": tickets.astype(np.float64),
+        "meals": meals.astype(np.float64),
+        "service_fee": service_fee,
+        "total": total,
+        "budget_exceeded": budget_exceeded,
+        "budget_handoff": budget_handoff,
+        "handoff_to_human": budget_handoff | (travelers_arr >= 8),
+    }
@@ -0,0 +1,131 @@
+import unicodedata
+from dataclasses import dataclass
+
+from .catalog import DestinationCatalog, get_catalog
+
+_ADMIN_SUFFIXES = ("特别行政区", "自治州", "地区", "市", "省", "县", "city")
+_STRIP_CHARS = str.maketrans("", "", " -_'’·.")
+
+
+@dataclass(frozen=True, slots=True)
+class Resolution:
+    city_id: int
+    name: str
+    method: str
+    distance: int = 0
+
+
+def normalize_place(text: str) -> str:
+    key = unicodedata.normalize("NFKC", text).strip().lower().translate(_STRIP_CHARS)
+    for suffix in _ADMIN_SUFFIXES:
+        if key.endswith(suffix) and len(key) > len(suffix) + 1:
+            return key[: -len(suffix)]
+    return key
+
+
+def _max_distance(key: str) -> int:
+    # Short names are too dense to guess at: one substitution turns 北京 into 南京.
+    if key.isascii():
+        return 2 if len(key) >= 6 else 1 if len(key) >= 4 else 0
+    return 1 if len(key) >= 4 else 0
+
+
+def _deletes(key: str, distance: int) -> set[str]:
+    variants = {key}
+    frontier = {key}
+    for _ in range(distance):
+        frontier = {word[:index] + word[index + 1 :] for word in frontier if len(word) > 1 for index in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+def _edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal-string-alignment distance, giving up early once it exceeds ``limit``."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous_previous: list[int] = []
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, start=1):
+        current = [i] + [0] * len(right)
+        for j, right_char in enumerate(right, start=1):
+            cost = 0 if left_char == right_char else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and left_char == right[j - 2] and left[i - 2] == right_char:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class DestinationResolver:
+    """Resolve free-text destinations to catalog ids.
+
+    Names, aliases, pinyin and latin spellings go into one hash index.
+    Typos are matched through a symmetric-delete index, so a lookup only
+    checks the few candidates that share a deletion variant and never
+    scans the catalog.
+    """
+
+    def __init__(self, catalog: DestinationCatalog) -> None:
+        self.catalog = catalog
+        self._exact: dict[str, tuple[int, str]] = {}
+        self._deleted: dict[str, list[str]] = {}
+
+        for city_id, name in enumerate(catalog.names):
+            self._add(name, city_id, "exact")
+            for alias in catalog.aliases[city_id]:
+                self._add(alias, city_id, "alias")
+            for spelling in (catalog.pinyin[city_id], *catalog.latin[city_id]):
+                if spelling:
+                    self._add(spelling, city_id, "latin")
+
+        for key in self._exact:
+            for variant in _deletes(key, _max_distance(key)):
+                self._deleted.setdefault(variant, []).append(key)
+
+    def _add(self, text: str, city_id: int, method: str) -> None:
+        key = normalize_place(text)
+        if key:
+            self._exact.setdefault(key, (city_id, method))
+
+    def resolve(self, text: str) -> Resolution | None:
+        if text in self.catalog.index:
+            city_id = self.catalog.index[text]
+            return Resolution(city_id, self.catalog.names[city_id], "exact")
+
+        key = normalize_place(text)
+        if not key:
+            return None
+        hit = self._exact.get(key)
+        if hit is not None:
+            city_id, method = hit
+            return Resolution(city_id, self.catalog.names[city_id], method)
+
+        limit = _max_distance(key)
+        candidates = {candidate for variant in _deletes(key, limit) for candidate in self._deleted.get(variant, ())}
+        best: tuple[int, int] | None = None
+        for candidate in candidates:
+            distance = _edit_distance(key, candidate, limit)
+            if distance <= limit:
+                match = (distance, self._exact[candidate][0])
+                if best is None or match < best:
+                    best = match
+        if best is None:
+            return None
+        return Resolution(best[1], self.catalog.names[best[1]], "fuzzy", best[0])
+
+
+_RESOLVER: DestinationResolver | None = None
+
+
+def get_resolver() -> DestinationResolver:
+    global _RESOLVER
+    catalog = get_catalog()
+    if _RESOLVER is None or _RESOLVER.catalog is not catalog:
+        _RESOLVER = DestinationResolver(catalog)
+    return _RESOLVER
+
+
+def resolve_destination(text: str) -> Resolution | None:
+    return get_resolver().resolve(text)
@@ -1,8 +1,9 @@
+import json
 import os
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -11,6 +12,7 @@ if str(PROJECT_ROOT) not in sys.path:
 try:
     from fastapi.testclient import TestClient
 
+    from backend.app import batch_service
     from backend.app.deepseek_client import DeepSeekClientError
     from backend.app.main import app
     from backend.app.plan_graph import get_plan_graph
@@ -35,6 +37,13 @@ class TestAPI(unittest.TestCase):
         payload = response.json()
         self.assertEqual(payload["status"], "ok")
 
+    def test_metrics_exposes_prometheus_text(self) -> None:
+        self.client.post("/api/plan", json={"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []})
+        response = self.client.get("/api/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('plan_graph_node_seconds_bucket{node="local_route",le="+Inf"}', response.text)
+
     def test_plan_contract(self) -> None:
         response = self.client.post(
             "/api/plan",
@@ -51,8 +60,10 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(payload["status"], "ok")
         self.assertIn("itinerary", payload)
         self.assertIn("price_breakdown", payload)
+        self.assertTrue(response.headers["content-type"].startswith("application/json"))
+        self.assertEqual(response.content, json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
 
-    @patch("backend.app.plan_graph.generate_with_deepseek")
+    @patch("backend.app.plan_graph.generate_with_deepseek_async", new_callable=AsyncMock)
     def test_plan_deepseek_fallback_contract(self, mock_generate) -> None:
         os.environ["PLAN_PROVIDER"] = "deepseek"
         get_settings.cache_clear()
@@ -73,6 +84,124 @@ class TestAPI(unittest.TestCase):
         payload = response.json()
         self.assertEqual(payload["status"], "ok")
         self.assertEqual(payload["provider"], "local_fallback")
+        mock_generate.assert_awaited_once()
+
+    @patch("backend.app.plan_graph.generate_with_deepseek_async", new_callable=AsyncMock)
+    def test_plan_deepseek_success_contract(self, mock_generate) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+        mock_generate.return_value = {
+            "status": "ok",
+            "request_summary": {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": ["文化"]},
+            "itinerary": [{"day": 1, "morning": "故宫", "afternoon": "天坛", "evening": "活动"}],
+            "price_breakdown": {"transport": 1000, "hotel": 500, "tickets": 300, "meals": 300, "service_fee": 100, "total": 2200},
+            "risk_flags": [],
+            "handoff_to_human": False,
+            "provider": "deepseek",
+        }
+
+        response = self.client.post(
+            "/api/plan",
+            json={"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": ["文化"]},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["provider"], "deepseek")
+
+    @patch("backend.app.plan_graph.astream_deepseek_content")
+    def test_plan_stream_emits_baseline_then_llm_plan(self, mock_stream) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+        content = json.dumps(
+            {
+                "status": "ok",
+                "request_summary": {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []},
+                "itinerary": [{"day": 1, "morning": "故宫", "afternoon": "天坛", "evening": "活动"}],
+                "price_breakdown": {"transport": 1, "hotel": 1, "tickets": 1, "meals": 1, "service_fee": 1, "total": 5},
+                "risk_flags": [],
+                "handoff_to_human": False,
+            },
+            ensure_ascii=False,
+        )
+
+        async def fake_stream(*_args, **_kwargs):
+            for start in range(0, len(content), 40):
+                yield content[start : start + 40]
+
+        mock_stream.side_effect = fake_stream
+
+        response = self.client.post(
+            "/api/plan/stream",
+            json={"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+
+        events = []
+        for block in response.text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n")
+            events.append((event_line[len("event: ") :], json.loads(data_line[len("data: ") :])))
+
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "baseline")
+        self.assertEqual(events[0][1]["status"], "ok")
+        self.assertIn("delta", names)
+        self.assertEqual([data["day"] for name, data in events if name == "day"], [1])
+        self.assertEqual(names[-2:], ["plan", "done"])
+        self.assertEqual(events[-2][1]["provider"], "deepseek")
+        self.assertEqual("".join(data["content"] for name, data in events if name == "delta"), content)
+
+    def test_plan_revise_reprices_named_thread(self) -> None:
+        request = {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 80000, "preferences": []}
+        created = self.client.post("/api/plan", params={"thread_id": "api-revise"}, json=request)
+        self.assertEqual(created.status_code, 200)
+
+        revised = self.client.post("/api/plan/revise", json={"thread_id": "api-revise", "patch": {"budget_cny": 1000}})
+        self.assertEqual(revised.status_code, 200)
+        self.assertEqual(revised.json()["itinerary"], created.json()["itinerary"])
+        self.assertIn("budget_exceeded", revised.json()["risk_flags"])
+
+        missing = self.client.post("/api/plan/revise", json={"thread_id": "no-such-thread", "patch": {"days": 3}})
+        self.assertEqual(missing.status_code, 404)
+
+    def test_plan_batch_streams_jsonl_in_order(self) -> None:
+        lines = [
+            json.dumps({"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000}, ensure_ascii=False),
+            json.dumps({"destination": "上海", "days": 0, "travelers": 2, "budget_cny": 8000}, ensure_ascii=False),
+            "",
+            json.dumps({"destination": "成都", "days": 3, "travelers": 1, "budget_cny": 5000}, ensure_ascii=False),
+        ]
+        response = self.client.post(
+            "/api/plan/batch",
+            content="\n".join(lines).encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        self.assertEqual(response.status_code, 200)
+        records = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([record["line"] for record in records], [1, 2, 4])
+        self.assertEqual(records[0]["result"]["provider"], "local")
+        self.assertEqual(records[1]["error"], "invalid_request")
+        self.assertEqual(records[2]["result"]["request_summary"]["destination"], "成都")
+
+    def test_plan_batch_reports_failed_line_and_continues(self) -> None:
+        real_agenerate_plan = batch_service.agenerate_plan
+
+        async def flaky(payload):
+            if payload["destination"] == "上海":
+                raise RuntimeError("boom")
+            return await real_agenerate_plan(payload)
+
+        lines = [
+            json.dumps({"destination": city, "days": 2, "travelers": 2, "budget_cny": 8000}, ensure_ascii=False)
+            for city in ("北京", "上海", "成都")
+        ]
+        with patch("backend.app.batch_service.agenerate_plan", side_effect=flaky):
+            response = self.client.post("/api/plan/batch", content="\n".join(lines).encode("utf-8"))
+        records = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([record["line"] for record in records], [1, 2, 3])
+        self.assertEqual(records[1], {"line": 2, "error": "plan_failed", "detail": "RuntimeError: boom"})
+        self.assertEqual(records[2]["result"]["request_summary"]["destination"], "成都")
 
 
 if __name__ == "__main__":
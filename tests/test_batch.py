@@ -0,0 +1,57 @@
+import io
+import json
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from mvp_travel_agent.batch import run_local_batch
+from mvp_travel_agent.engine import generate_plan
+
+
+def _lines() -> list[str]:
+    requests = [
+        {"destination": city, "days": days, "travelers": travelers, "budget_cny": 9000}
+        for city in ["北京", "上海", "成都"]
+        for days in range(1, 4)
+        for travelers in range(1, 3)
+    ]
+    lines = [json.dumps(item, ensure_ascii=False) + "\n" for item in requests]
+    return [*lines[:3], "\n", "{broken\n", *lines[3:]]
+
+
+class TestLocalBatch(unittest.TestCase):
+    def _run(self, workers: int) -> list[dict]:
+        out = io.StringIO()
+        count = run_local_batch(_lines(), out, workers=workers, chunk_size=4)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, len(records))
+        return records
+
+    def test_inline_batch_keeps_order_and_reports_bad_lines(self) -> None:
+        records = self._run(workers=0)
+        self.assertEqual(len(records), 19)
+        self.assertEqual([record["line"] for record in records], sorted(record["line"] for record in records))
+        self.assertEqual(records[3], {"line": 5, "error": "invalid_json"})
+        self.assertEqual(records[0]["result"], generate_plan(json.loads(_lines()[0])))
+
+    def test_failing_line_is_reported_and_batch_continues(self) -> None:
+        bad = '{"destination":"成都","days":3,"travelers":2,"budget_cny":1000,"preferences":5}\n'
+        lines = [_lines()[0], bad, _lines()[1]]
+        for workers in (0, 2):
+            out = io.StringIO()
+            self.assertEqual(run_local_batch(lines, out, workers=workers, chunk_size=4), 3)
+            records = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual([record["line"] for record in records], [1, 2, 3])
+            self.assertEqual(records[1]["error"], "plan_failed")
+            self.assertIn("result", records[2])
+
+    def test_process_pool_matches_inline(self) -> None:
+        self.assertEqual(self._run(workers=2), self._run(workers=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.run import compare
+from benchmarks.suite import request_shapes
+
+
+def _results(**metrics: tuple[float, str]) -> dict:
+    return {"metrics": {name: {"value": value, "unit": "us", "better": better} for name, (value, better) in metrics.items()}}
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_flags_slowdowns_beyond_threshold(self) -> None:
+        baseline = _results(fast=(100.0, "lower"), rps=(100.0, "higher"), same=(100.0, "lower"))
+        current = _results(fast=(130.0, "lower"), rps=(70.0, "higher"), same=(110.0, "lower"), new=(1.0, "lower"))
+
+        rows = {row["metric"]: row for row in compare(current, baseline, threshold=0.25)}
+        self.assertTrue(rows["fast"]["regressed"])
+        self.assertTrue(rows["rps"]["regressed"])
+        self.assertFalse(rows["same"]["regressed"])
+        self.assertNotIn("new", rows)
+
+    def test_metric_threshold_overrides_default(self) -> None:
+        baseline = _results(noisy=(100.0, "lower"), ratio=(1.0, "lower"))
+        current = _results(noisy=(150.0, "lower"), ratio=(1.5, "lower"))
+        current["metrics"]["noisy"]["threshold"] = 1.0
+
+        rows = {row["metric"]: row for row in compare(current, baseline, threshold=0.25)}
+        self.assertFalse(rows["noisy"]["regressed"])
+        self.assertEqual(rows["noisy"]["threshold"], 1.0)
+        self.assertTrue(rows["ratio"]["regressed"])
+
+    def test_improvements_are_not_regressions(self) -> None:
+        rows = compare(_results(x=(50.0, "lower"), y=(200.0, "higher")), _results(x=(100.0, "lower"), y=(100.0, "higher")), 0.1)
+        self.assertFalse(any(row["regressed"] for row in rows))
+
+    def test_request_shapes_cover_destination_kinds(self) -> None:
+        destinations = {shape["destination"] for shape in request_shapes()}
+        self.assertIn("不存在的城市", destinations)
+        self.assertEqual({shape["days"] for shape in request_shapes()}, {1, 3, 7, 15})
+
+
+if __name__ == "__main__":
+    unittest.main()
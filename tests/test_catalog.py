@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from mvp_travel_agent.catalog import compile_catalog, get_catalog
+from mvp_travel_agent.engine import generate_plan
+
+
+def _entry(name: str, **overrides) -> dict:
+    entry = {
+        "name": name,
+        "spots": ["景点A", "景点B"],
+        "transport_per_person": 100,
+        "hotel_per_night": 200,
+        "ticket_per_day_per_person": 10,
+        "meal_per_day_per_person": 20,
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestDestinationCatalog(unittest.TestCase):
+    def tearDown(self) -> None:
+        os.environ.pop("TRAVEL_DESTINATION_CATALOG", None)
+        get_catalog.cache_clear()
+
+    def test_default_catalog_indexes_packaged_cities(self) -> None:
+        catalog = get_catalog()
+        city_id = catalog.lookup("成都")
+        self.assertIsNotNone(city_id)
+        self.assertEqual(catalog.hotel_per_night[city_id], 420)
+        self.assertEqual(catalog.names[catalog.fallback_id], "北京")
+        self.assertIsNone(catalog.lookup("杭州"))
+        self.assertEqual(catalog.id_or_fallback("杭州"), catalog.fallback_id)
+
+    def test_engine_uses_external_catalog_file(self) -> None:
+        raw = {"fallback": "杭州", "destinations": [_entry("杭州")]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "catalog.json"
+            path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+            os.environ["TRAVEL_DESTINATION_CATALOG"] = str(path)
+            get_catalog.cache_clear()
+
+            result = generate_plan({"destination": "杭州", "days": 2, "travelers": 1, "budget_cny": 9000})
+            self.assertEqual(result["itinerary"][0]["morning"], "景点A")
+            self.assertEqual(result["price_breakdown"]["hotel"], 200.0)
+            self.assertNotIn("destination_fallback_template", result["risk_flags"])
+
+    def test_duplicate_names_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            compile_catalog({"destinations": [_entry("北京"), _entry("北京")]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import TypedDict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from langgraph.graph import END, START, StateGraph
+
+from backend.app.checkpointers import BoundedInMemorySaver, SQLiteCheckpointSaver, close_checkpointer, get_checkpointer
+from backend.app.plan_graph import get_plan_graph, run_plan_graph
+from backend.app.settings import get_settings
+
+
+class _State(TypedDict):
+    count: int
+
+
+def _counter_graph(saver):
+    builder = StateGraph(_State)
+    builder.add_node("inc", lambda state: {"count": state["count"] + 1})
+    builder.add_edge(START, "inc")
+    builder.add_edge("inc", END)
+    return builder.compile(checkpointer=saver)
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBoundedInMemorySaver(unittest.TestCase):
+    def test_least_recently_used_thread_is_evicted(self) -> None:
+        saver = BoundedInMemorySaver(max_threads=2, ttl_seconds=3600)
+        graph = _counter_graph(saver)
+        graph.invoke({"count": 0}, _config("a"))
+        graph.invoke({"count": 0}, _config("b"))
+        graph.get_state(_config("a"))
+        graph.invoke({"count": 0}, _config("c"))
+
+        self.assertIsNotNone(saver.get_tuple(_config("a")))
+        self.assertIsNone(saver.get_tuple(_config("b")))
+        self.assertFalse([key for key in saver.blobs if key[0] == "b"])
+        self.assertFalse([key for key in saver.writes if key[0] == "b"])
+        self.assertEqual(saver.evictions, 1)
+
+    def test_idle_thread_expires(self) -> None:
+        clock = _Clock()
+        saver = BoundedInMemorySaver(max_threads=10, ttl_seconds=60, clock=clock)
+        graph = _counter_graph(saver)
+        graph.invoke({"count": 0}, _config("a"))
+        clock.now += 61
+
+        self.assertIsNone(saver.get_tuple(_config("a")))
+        self.assertEqual(saver.stats()["evictions"], 1)
+
+
+class TestSQLiteCheckpointSaver(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self._tmp.name) / "checkpoints.sqlite3")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_thread_survives_restart(self) -> None:
+        saver = SQLiteCheckpointSaver(self.path, max_threads=10, ttl_seconds=3600, batch_size=1000, flush_interval_seconds=60)
+        _counter_graph(saver).invoke({"count": 1}, _config("trip"))
+        saver.close()
+
+        reopened = SQLiteCheckpointSaver(self.path, max_threads=10, ttl_seconds=3600)
+        graph = _counter_graph(reopened)
+        self.assertEqual(graph.get_state(_config("trip")).values, {"count": 2})
+        graph.invoke({"count": 5}, _config("trip"))
+        self.assertEqual(len(list(reopened.list(_config("trip")))), 6)
+        reopened.close()
+
+    def test_close_stops_flusher_and_releases_connection(self) -> None:
+        saver = SQLiteCheckpointSaver(self.path, max_threads=10, ttl_seconds=3600, flush_interval_seconds=0.01)
+        _counter_graph(saver).invoke({"count": 1}, _config("trip"))
+        saver.close()
+        saver.close()
+
+        self.assertFalse(saver._flusher.is_alive())
+        with self.assertRaises(sqlite3.ProgrammingError):
+            saver._conn.execute("SELECT 1")
+
+    def test_retention_prunes_disk_and_delete_thread(self) -> None:
+        clock = _Clock()
+        saver = SQLiteCheckpointSaver(self.path, max_threads=2, ttl_seconds=3600, memory_threads=1, batch_size=1, clock=clock)
+        graph = _counter_graph(saver)
+        for thread_id in ("a", "b", "c"):
+            clock.now += 1
+            graph.invoke({"count": 0}, _config(thread_id))
+        saver.flush()
+
+        self.assertEqual(saver.stats()["disk_threads"], 2)
+        self.assertIsNone(saver.get_tuple(_config("a")))
+        self.assertEqual(graph.get_state(_config("b")).values, {"count": 1})
+
+        saver.delete_thread("b")
+        self.assertEqual(saver.stats()["disk_threads"], 1)
+        self.assertIsNone(saver.get_tuple(_config("b")))
+        saver.close()
+
+
+class TestPlanGraphCheckpointer(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        os.environ["PLAN_PROVIDER"] = "local"
+        os.environ["PLAN_GRAPH_CHECKPOINTER"] = "sqlite"
+        os.environ["PLAN_GRAPH_CHECKPOINT_PATH"] = str(Path(self._tmp.name) / "plan.sqlite3")
+        get_settings.cache_clear()
+        close_checkpointer()
+        get_plan_graph.cache_clear()
+
+    def tearDown(self) -> None:
+        close_checkpointer()
+        os.environ.pop("PLAN_GRAPH_CHECKPOINTER", None)
+        os.environ.pop("PLAN_GRAPH_CHECKPOINT_PATH", None)
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+        self._tmp.cleanup()
+
+    def test_plan_graph_uses_configured_checkpointer(self) -> None:
+        request = {"destination": "成都", "days": 2, "travelers": 2, "budget_cny": 6000, "preferences": []}
+        result = run_plan_graph(request, use_checkpointer=True, thread_id="trip-1")
+
+        saver = get_checkpointer()
+        self.assertIsInstance(saver, SQLiteCheckpointSaver)
+        state = get_plan_graph(use_checkpointer=True).get_state(_config("trip-1"))
+        self.assertEqual(state.values["final_plan"]["itinerary"], result["itinerary"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from backend.app.deepseek_client import DeepSeekClientError
+from backend.app.llm_router import LLMProvider, LLMRouter, get_llm_router
+from backend.app.plan_graph import get_plan_graph, run_plan_graph
+from backend.app.settings import get_settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_half_opens_and_closes(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=10, clock=clock)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.acquire())
+
+        clock.now = 10
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.acquire())
+        self.assertFalse(breaker.acquire())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        clock.now = 20
+        self.assertTrue(breaker.acquire())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats(), {"state": CLOSED, "opens": 2, "rejected": 2})
+
+    def test_failures_while_open_keep_recovery_window(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 8
+        breaker.record_failure()
+        clock.now = 10
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertEqual(breaker.opens, 1)
+
+    def test_unexpected_error_releases_half_open_probe(self) -> None:
+        clock = FakeClock()
+        router = LLMRouter(
+            [LLMProvider("p", get_settings())],
+            hedge_enabled=False,
+            hedge_delay_seconds=1,
+            breaker_factory=lambda: CircuitBreaker(failure_threshold=1, recovery_seconds=10, clock=clock),
+        )
+        provider = router.providers[0]
+        router.record(provider, 0.1, ok=False)
+
+        def call(_request, _baseline, _settings):
+            raise AttributeError("bug")
+
+        async def acall(_request, _baseline, _settings):
+            raise AttributeError("bug")
+
+        async def stream(_request, _baseline, _settings):
+            raise AttributeError("bug")
+            yield ""
+
+        async def drain():
+            async for _ in router.astream({}, {}, stream):
+                pass
+
+        clock.now = 10
+        for attempt in (lambda: router.generate({}, {}, call), lambda: asyncio.run(router.agenerate({}, {}, acall)), lambda: asyncio.run(drain())):
+            with self.assertRaises(AttributeError):
+                attempt()
+            self.assertEqual(router.stats()["providers"]["p"]["circuit"]["state"], HALF_OPEN)
+            self.assertTrue(router.available())
+
+    def test_adaptive_timeout_follows_latency(self) -> None:
+        settings = replace(get_settings(), deepseek_timeout_seconds=30)
+        router = LLMRouter([LLMProvider("p", settings)], hedge_enabled=False, hedge_delay_seconds=1, min_timeout_seconds=2)
+        provider = router.providers[0]
+        self.assertEqual(router.call_timeout(provider), 30)
+        for _ in range(50):
+            router.record(provider, 0.5, ok=True)
+        self.assertEqual(router.call_timeout(provider), 2)
+        for _ in range(50):
+            router.record(provider, 4.0, ok=True)
+        self.assertEqual(router.call_timeout(provider), 8.0)
+
+
+class TestCircuitBreakerGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        os.environ["CIRCUIT_FAILURE_THRESHOLD"] = "2"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def tearDown(self) -> None:
+        os.environ.pop("CIRCUIT_FAILURE_THRESHOLD", None)
+        os.environ.pop("PROMPT_TOKEN_BUDGET", None)
+        get_settings.cache_clear()
+
+    @patch("backend.app.plan_graph.generate_with_deepseek")
+    def test_open_circuit_skips_deepseek(self, mock_generate) -> None:
+        mock_generate.side_effect = DeepSeekClientError("upstream down")
+        request = {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []}
+        for _ in range(4):
+            self.assertEqual(run_plan_graph(request)["provider"], "local_fallback")
+        self.assertEqual(mock_generate.call_count, 2)
+
+    def test_over_budget_prompt_does_not_trip_circuit(self) -> None:
+        os.environ["PROMPT_TOKEN_BUDGET"] = "10"
+        get_settings.cache_clear()
+        request = {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []}
+        for _ in range(4):
+            self.assertEqual(run_plan_graph(request)["provider"], "local_fallback")
+
+        provider = get_llm_router().stats()["providers"]["deepseek"]
+        self.assertEqual(provider["circuit"]["state"], CLOSED)
+        self.assertEqual(provider["calls"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import sys
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.deepseek_client import (
+    DeepSeekClientError,
+    astream_deepseek_content,
+    generate_with_deepseek_async,
+    parse_plan_content,
+)
+from backend.app.settings import get_settings
+
+
+def _plan_content() -> str:
+    return json.dumps(
+        {
+            "status": "ok",
+            "request_summary": {"destination": "北京", "days": 1, "travelers": 1, "budget_cny": 3000, "preferences": []},
+            "itinerary": [{"day": 1, "morning": "故宫", "afternoon": "天坛", "evening": "活动"}],
+            "price_breakdown": {"transport": 1, "hotel": 1, "tickets": 1, "meals": 1, "service_fee": 1, "total": 5},
+            "risk_flags": [],
+            "handoff_to_human": False,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _settings():
+    get_settings.cache_clear()
+    return replace(get_settings(), deepseek_api_key="test-key", deepseek_api_base="http://deepseek.test")
+
+
+class TestDeepSeekClientAsync(unittest.TestCase):
+    def _run(self, handler) -> dict:
+        async def scenario() -> dict:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await generate_with_deepseek_async({"destination": "北京"}, {}, _settings(), client=client)
+
+        return asyncio.run(scenario())
+
+    def test_pooled_client_parses_plan(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.assertEqual(request.url.path, "/chat/completions")
+            return httpx.Response(200, json={"choices": [{"message": {"content": _plan_content()}}]})
+
+        result = self._run(handler)
+        self.assertEqual(result["provider"], "deepseek")
+        self.assertEqual(result["status"], "ok")
+
+    def test_http_error_raises_client_error(self) -> None:
+        with self.assertRaises(DeepSeekClientError):
+            self._run(lambda request: httpx.Response(503))
+
+    def test_malformed_body_raises_client_error(self) -> None:
+        for body in ([], "x", {"usage": {"prompt_tokens": "many"}, "choices": []}):
+            with self.subTest(body=body), self.assertRaises(DeepSeekClientError):
+                self._run(lambda request, body=body: httpx.Response(200, json=body))
+
+    def test_stream_yields_content_deltas(self) -> None:
+        content = _plan_content()
+        lines = [
+            "data: " + json.dumps({"choices": [{"delta": {"content": content[start : start + 50]}}]}, ensure_ascii=False)
+            for start in range(0, len(content), 50)
+        ]
+        body = "\n\n".join([*lines, "data: [DONE]"]) + "\n\n"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.assertTrue(json.loads(request.content)["stream"])
+            return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+        async def scenario() -> list[str]:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return [delta async for delta in astream_deepseek_content({}, {}, _settings(), client=client)]
+
+        deltas = asyncio.run(scenario())
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual(parse_plan_content("".join(deltas))["provider"], "deepseek")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import dataclasses
+import json
 import sys
 import unittest
 from pathlib import Path
@@ -6,7 +8,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from mvp_travel_agent.engine import generate_plan
+from mvp_travel_agent.engine import build_plan, generate_plan
 
 
 class TestTravelMVP(unittest.TestCase):
@@ -44,6 +46,24 @@ class TestTravelMVP(unittest.TestCase):
         self.assertIn("budget_exceeded", result["risk_flags"])
         self.assertTrue(result["handoff_to_human"])
 
+    def test_frozen_result_serializes_like_dict_path(self) -> None:
+        requests = [
+            {"destination": "成都", "days": 4, "travelers": 3, "budget_cny": 12000.5, "preferences": ["美食", "亲子"]},
+            {"destination": "杭州\"西湖", "days": 1, "travelers": 9, "budget_cny": 100},
+            {"destination": "北京"},
+        ]
+        for request in requests:
+            plan = build_plan(request)
+            self.assertEqual(plan.to_dict(), generate_plan(request))
+            expected = json.dumps({**plan.to_dict(), "provider": "local"}, ensure_ascii=False, separators=(",", ":"))
+            self.assertEqual(plan.to_json_bytes(provider="local"), expected.encode("utf-8"))
+
+    def test_plan_result_is_immutable(self) -> None:
+        plan = build_plan({"destination": "上海", "days": 2, "travelers": 2, "budget_cny": 8000})
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            plan.itinerary[0].morning = "别处"
+        self.assertIsInstance(plan.itinerary, tuple)
+
 
 if __name__ == "__main__":
     unittest.main()
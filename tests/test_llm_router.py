@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sys
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.deepseek_client import DeepSeekClientError
+from backend.app.llm_router import LLMProvider, LLMRouter, load_providers
+from backend.app.settings import get_settings
+
+
+def _plan(provider_name: str) -> dict:
+    return {
+        "status": "ok",
+        "request_summary": {},
+        "itinerary": [],
+        "price_breakdown": {"total": 1},
+        "risk_flags": [],
+        "handoff_to_human": False,
+        "provider": "deepseek",
+        "served_by": provider_name,
+    }
+
+
+def _providers(*names: str) -> list[LLMProvider]:
+    settings = get_settings()
+    return [LLMProvider(name, replace(settings, deepseek_api_base=f"https://{name}.test")) for name in names]
+
+
+class TestLLMRouter(unittest.TestCase):
+    def test_load_providers_defaults_and_json(self) -> None:
+        settings = replace(get_settings(), deepseek_api_key="base-key")
+        self.assertEqual([provider.name for provider in load_providers(settings)], ["deepseek"])
+
+        configured = replace(
+            settings,
+            llm_providers=json.dumps([{"name": "a", "api_base": "https://a.test"}, {"model": "m2", "api_key": "k2"}]),
+        )
+        providers = load_providers(configured)
+        self.assertEqual([provider.name for provider in providers], ["a", "provider1"])
+        self.assertEqual(providers[0].settings.deepseek_api_base, "https://a.test")
+        self.assertEqual(providers[0].settings.deepseek_api_key, "base-key")
+        self.assertEqual(providers[1].settings.deepseek_model, "m2")
+        self.assertEqual(providers[1].settings.deepseek_api_key, "k2")
+
+    def test_slow_primary_is_hedged_and_cancelled(self) -> None:
+        router = LLMRouter(_providers("slow", "fast"), hedge_enabled=True, hedge_delay_seconds=0.02)
+        cancelled = []
+
+        async def call(_request, _baseline, settings):
+            if settings.deepseek_api_base == "https://slow.test":
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append("slow")
+                    raise
+            return _plan(settings.deepseek_api_base)
+
+        result = asyncio.run(router.agenerate({}, {}, call))
+        self.assertEqual(result["served_by"], "https://fast.test")
+        self.assertEqual(cancelled, ["slow"])
+        self.assertEqual(router.stats()["hedges"], 1)
+
+    def test_errors_fail_over_and_demote_provider(self) -> None:
+        router = LLMRouter(_providers("flaky", "steady"), hedge_enabled=False, hedge_delay_seconds=1)
+
+        def call(_request, _baseline, settings):
+            if settings.deepseek_api_base == "https://flaky.test":
+                raise DeepSeekClientError("down")
+            return _plan(settings.deepseek_api_base)
+
+        self.assertEqual(router.generate({}, {}, call)["served_by"], "https://steady.test")
+        self.assertEqual([provider.name for provider in router.ranked()], ["steady", "flaky"])
+
+    def test_invalid_plan_is_not_accepted(self) -> None:
+        router = LLMRouter(_providers("only"), hedge_enabled=True, hedge_delay_seconds=1)
+
+        async def call(_request, _baseline, _settings):
+            return {"status": "ok"}
+
+        with self.assertRaises(DeepSeekClientError):
+            asyncio.run(router.agenerate({}, {}, call))
+        self.assertEqual(router.stats()["providers"]["only"]["error_rate"], 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
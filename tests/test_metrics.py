@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.metrics import METRICS, PLAN_NODE_SECONDS, PLAN_RESULTS, MetricsRegistry, recording_paused, timed_node
+from backend.app.plan_graph import get_plan_graph, run_plan_graph
+from backend.app.settings import get_settings
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.histogram("demo_seconds", "Demo.", ("node",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "a")
+
+        text = registry.render()
+        self.assertIn('demo_seconds_bucket{node="a",le="0.1"} 1', text)
+        self.assertIn('demo_seconds_bucket{node="a",le="1.0"} 3', text)
+        self.assertIn('demo_seconds_bucket{node="a",le="+Inf"} 4', text)
+        self.assertIn('demo_seconds_count{node="a"} 4', text)
+        self.assertIn('demo_seconds_sum{node="a"} 6.05', text)
+
+    def test_collectors_escape_labels_and_skip_missing_values(self) -> None:
+        registry = MetricsRegistry()
+        registry.register_collector(
+            lambda: [
+                ("demo_gauge", "gauge", "Demo.", {"name": 'a"b'}, 2),
+                ("demo_gauge", "gauge", "Demo.", {"name": "c"}, None),
+            ]
+        )
+        text = registry.render()
+        self.assertEqual(text.count("# TYPE demo_gauge gauge"), 1)
+        self.assertIn('demo_gauge{name="a\\"b"} 2.0', text)
+        self.assertNotIn('name="c"', text)
+
+    def test_recording_paused_drops_updates(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.counter("demo_total", "Demo.")
+        histogram = registry.histogram("demo_pause_seconds", "Demo.")
+        with recording_paused():
+            counter.inc()
+            histogram.observe(0.1)
+        counter.inc()
+        self.assertEqual(counter.value(), 1)
+        self.assertEqual(histogram.count(), 0)
+
+    def test_timed_node_keeps_async_nodes_async(self) -> None:
+        async def node(state):
+            return {"value": state["value"] + 1}
+
+        wrapped = timed_node("demo_async_node", node)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped))
+        self.assertEqual(asyncio.run(wrapped({"value": 1})), {"value": 2})
+        self.assertEqual(PLAN_NODE_SECONDS.count("demo_async_node"), 1)
+
+
+class TestPlanGraphMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "local"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def tearDown(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def test_local_plan_records_node_timings(self) -> None:
+        before = PLAN_NODE_SECONDS.count("build_local_baseline")
+        local_before = PLAN_RESULTS.value("local")
+        run_plan_graph({"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []})
+
+        self.assertEqual(PLAN_NODE_SECONDS.count("build_local_baseline"), before + 1)
+        self.assertEqual(PLAN_RESULTS.value("local"), local_before + 1)
+        text = METRICS.render()
+        self.assertIn('plan_graph_node_seconds_count{node="finalize_local"}', text)
+        self.assertIn("# TYPE llm_prompts_total counter", text)
+
+    def test_single_flight_counters_are_exported(self) -> None:
+        from backend.app.plan_service import PLAN_FLIGHTS
+
+        PLAN_FLIGHTS.do("metrics-test", lambda: None)
+        text = METRICS.render()
+        self.assertIn(f"plan_single_flight_leaders_total {float(PLAN_FLIGHTS.leaders)}", text)
+        self.assertIn("# TYPE plan_single_flight_coalesced_total counter", text)
+        self.assertIn("plan_single_flight_in_flight 0.0", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import random
+import statistics
+import sys
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+
+from backend.app.deepseek_client import DeepSeekClientError, astream_deepseek_content, generate_with_deepseek
+from backend.app.mock_llm import MALFORMED, RATE_LIMITED, MockLLMConfig, MockLLMServer, parse_latency
+from backend.app.settings import get_settings
+from backend.app.stream_json import PlanStreamParser
+from mvp_travel_agent import generate_plan
+
+REQUEST = {"destination": "成都", "days": 3, "travelers": 2, "budget_cny": 9000, "preferences": []}
+
+
+def _settings(server: MockLLMServer):
+    return replace(get_settings(), deepseek_api_base=server.base_url, deepseek_api_key="test")
+
+
+class TestMockLLMServer(unittest.TestCase):
+    def test_serves_schema_valid_plan_for_prompted_request(self) -> None:
+        baseline = generate_plan(REQUEST)
+        with MockLLMServer() as server:
+            plan = generate_with_deepseek(REQUEST, baseline, _settings(server))
+            self.assertEqual(server.requests, 1)
+
+        self.assertEqual(plan["provider"], "deepseek")
+        self.assertEqual(plan["itinerary"], baseline["itinerary"])
+
+    def test_streams_sse_chunks_that_parse_incrementally(self) -> None:
+        baseline = generate_plan(REQUEST)
+        parser = PlanStreamParser(expected_days=3)
+
+        async def consume(server: MockLLMServer) -> list[dict]:
+            days = []
+            async for delta in astream_deepseek_content(REQUEST, baseline, _settings(server)):
+                days.extend(parser.feed(delta))
+            return days
+
+        with MockLLMServer(config=MockLLMConfig(stream_chunk_chars=8)) as server:
+            days = asyncio.run(consume(server))
+
+        self.assertEqual(days, baseline["itinerary"])
+        self.assertEqual(parser.result()["itinerary"], baseline["itinerary"])
+
+    def test_keep_alive_responses_do_not_stall(self) -> None:
+        # Nagle plus delayed ACK would add ~40 ms to each response on a reused connection.
+        body = {"messages": [{"role": "user", "content": "请求:" + '{"destination": "成都", "days": 1, "travelers": 1, "budget_cny": 900}'}]}
+        with MockLLMServer() as server, httpx.Client() as client:
+            timings = []
+            for _ in range(10):
+                started = time.perf_counter()
+                client.post(f"{server.base_url}/chat/completions", json=body).raise_for_status()
+                timings.append(time.perf_counter() - started)
+        self.assertLess(statistics.median(timings), 0.02)
+
+    def test_injected_failures(self) -> None:
+        baseline = generate_plan(REQUEST)
+        with MockLLMServer(config=MockLLMConfig(rate_limit_rate=1.0, retry_after_seconds=3)) as server:
+            response = httpx.post(f"{server.base_url}/chat/completions", json={"messages": []})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers["Retry-After"], "3")
+            self.assertEqual(server.outcomes[RATE_LIMITED], 1)
+
+        for config in (MockLLMConfig(error_rate=1.0), MockLLMConfig(malformed_rate=1.0)):
+            with MockLLMServer(config=config) as server, self.assertRaises(DeepSeekClientError):
+                generate_with_deepseek(REQUEST, baseline, _settings(server))
+        self.assertEqual(server.outcomes[MALFORMED], 1)
+
+    def test_latency_specs(self) -> None:
+        rng = random.Random(7)
+        self.assertEqual(parse_latency("0.25")(rng), 0.25)
+        self.assertTrue(0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2)
+        samples = [parse_latency("lognormal:0.5,0.3")(rng) for _ in range(2000)]
+        self.assertAlmostEqual(sorted(samples)[1000], 0.5, delta=0.05)
+        self.assertGreaterEqual(min(parse_latency("normal:0,1")(rng) for _ in range(100)), 0.0)
+        with self.assertRaises(ValueError):
+            parse_latency("gamma:1,2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from mvp_travel_agent.catalog import compile_catalog
+from mvp_travel_agent.optimizer import optimize_day_slots
+
+
+def _catalog(spots: list[dict]):
+    return compile_catalog(
+        {
+            "destinations": [
+                {
+                    "name": "测试城",
+                    "spots": spots,
+                    "transport_per_person": 1,
+                    "hotel_per_night": 1,
+                    "ticket_per_day_per_person": 1,
+                    "meal_per_day_per_person": 1,
+                }
+            ]
+        }
+    )
+
+
+def _spot(name: str, lat: float, lon: float, tags=(), open_hour: float = 8, close_hour: float = 20) -> dict:
+    return {"name": name, "lat": lat, "lon": lon, "tags": list(tags), "open_hour": open_hour, "close_hour": close_hour}
+
+
+class TestItineraryOptimizer(unittest.TestCase):
+    def test_preferences_choose_spots(self) -> None:
+        catalog = _catalog(
+            [
+                _spot("博物馆", 30.0, 104.0, ["文化"]),
+                _spot("小吃街", 30.01, 104.0, ["美食"]),
+                _spot("夜市", 30.02, 104.0, ["美食", "夜景"]),
+                _spot("古镇", 30.03, 104.0, ["文化"]),
+            ]
+        )
+        (morning, afternoon), = optimize_day_slots(catalog, 0, 1, ["美食"])
+        self.assertEqual({morning, afternoon}, {"小吃街", "夜市"})
+
+    def test_days_stay_within_one_area(self) -> None:
+        west = [_spot(f"西{i}", 30.0 + i * 0.01, 103.0) for i in range(4)]
+        east = [_spot(f"东{i}", 30.0 + i * 0.01, 105.0) for i in range(4)]
+        catalog = _catalog([west[0], east[0], west[1], east[1], west[2], east[2], west[3], east[3]])
+        for morning, afternoon in optimize_day_slots(catalog, 0, 4, []):
+            self.assertEqual(morning[0], afternoon[0], (morning, afternoon))
+
+    def test_opening_hours_orient_the_day(self) -> None:
+        catalog = _catalog([_spot("夜景台", 30.0, 104.0, open_hour=14, close_hour=23), _spot("早市", 30.0, 104.01, open_hour=6, close_hour=12)])
+        self.assertEqual(optimize_day_slots(catalog, 0, 1, []), [("早市", "夜景台")])
+
+    def test_short_catalog_cycles_spots(self) -> None:
+        catalog = _catalog([_spot("甲", 30.0, 104.0), _spot("乙", 30.0, 104.01), _spot("丙", 30.0, 104.02)])
+        day_slots = optimize_day_slots(catalog, 0, 15, [])
+        self.assertEqual(len(day_slots), 15)
+        self.assertEqual({name for pair in day_slots for name in pair}, {"甲", "乙", "丙"})
+
+    def test_short_catalog_does_not_wrap_route_end_to_start(self) -> None:
+        catalog = _catalog([_spot(name, 30.0, 104.0 + index * 0.01) for index, name in enumerate("甲乙丙丁戊")])
+        day_slots = optimize_day_slots(catalog, 0, 4, [])
+        self.assertEqual([set(pair) for pair in day_slots], [{"甲", "乙"}, {"丙", "丁"}, {"戊", "丁"}, {"甲", "乙"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
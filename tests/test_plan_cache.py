@@ -0,0 +1,120 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.plan_cache import (
+    MemoryPlanCacheBackend,
+    SQLitePlanCacheBackend,
+    build_cache_key,
+    get_plan_cache,
+)
+from backend.app.plan_graph import get_plan_graph, run_plan_graph
+from backend.app.plan_json import PreSerializedPlan
+from backend.app.settings import get_settings
+
+
+def _request(budget: float = 8000) -> dict:
+    return {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": budget, "preferences": ["文化"]}
+
+
+def _deepseek_plan() -> dict:
+    return {
+        "status": "ok",
+        "request_summary": _request(),
+        "itinerary": [{"day": 1, "morning": "故宫", "afternoon": "天坛", "evening": "活动"}],
+        "price_breakdown": {"transport": 1000, "hotel": 500, "tickets": 300, "meals": 300, "service_fee": 100, "total": 8200},
+        "risk_flags": ["budget_exceeded"],
+        "handoff_to_human": False,
+        "provider": "deepseek",
+    }
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPlanCacheBackends(unittest.TestCase):
+    def test_key_buckets_budget_and_sorts_preferences(self) -> None:
+        first = build_cache_key({**_request(8100), "preferences": ["美食", "文化"]}, budget_bucket_cny=1000)
+        second = build_cache_key({**_request(8900), "preferences": ["文化", "美食"]}, budget_bucket_cny=1000)
+        third = build_cache_key(_request(9100), budget_bucket_cny=1000)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+
+    def test_memory_backend_ttl_and_lru(self) -> None:
+        clock = FakeClock()
+        backend = MemoryPlanCacheBackend(max_entries=2, clock=clock)
+        backend.set("a", {"v": 1}, ttl_seconds=10)
+        backend.set("b", {"v": 2}, ttl_seconds=10)
+        self.assertIsNotNone(backend.get("a"))
+        backend.set("c", {"v": 3}, ttl_seconds=10)
+        self.assertIsNone(backend.get("b"))
+        clock.now = 11
+        self.assertIsNone(backend.get("a"))
+
+    def test_sqlite_backend_round_trip_and_eviction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            clock = FakeClock()
+            backend = SQLitePlanCacheBackend(str(Path(tmp) / "cache.sqlite3"), max_entries=1, clock=clock)
+            backend.set("a", {"城市": "北京"}, ttl_seconds=10)
+            cached = backend.get("a")
+            self.assertEqual(cached, {"城市": "北京"})
+            self.assertEqual(cached.json_bytes, '{"城市":"北京"}'.encode("utf-8"))
+            clock.now = 1
+            backend.set("b", {"v": 2}, ttl_seconds=10)
+            self.assertIsNone(backend.get("a"))
+            clock.now = 20
+            self.assertIsNone(backend.get("b"))
+
+
+class TestPlanCacheGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        os.environ["PLAN_CACHE_BACKEND"] = "memory"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+        get_plan_cache.cache_clear()
+
+    def tearDown(self) -> None:
+        os.environ.pop("PLAN_CACHE_BACKEND", None)
+        get_settings.cache_clear()
+        get_plan_cache.cache_clear()
+
+    @patch("backend.app.plan_graph.generate_with_deepseek")
+    def test_similar_request_served_from_cache(self, mock_generate) -> None:
+        mock_generate.return_value = _deepseek_plan()
+        first = run_plan_graph(_request(8000))
+        second = run_plan_graph(_request(8500))
+
+        self.assertEqual(mock_generate.call_count, 1)
+        self.assertEqual(first["provider"], "deepseek")
+        self.assertEqual(second["provider"], "deepseek")
+        self.assertEqual(second["request_summary"]["budget_cny"], 8500)
+        self.assertNotIn("budget_exceeded", second["risk_flags"])
+        self.assertEqual(get_plan_cache().stats()["hits"], 1)
+
+    @patch("backend.app.plan_graph.generate_with_deepseek")
+    def test_exact_repeat_reuses_serialized_bytes(self, mock_generate) -> None:
+        mock_generate.return_value = _deepseek_plan()
+        run_plan_graph(_request(8000))
+        repeat = run_plan_graph(_request(8000))
+
+        self.assertIsInstance(repeat, PreSerializedPlan)
+        self.assertEqual(json.loads(repeat.json_bytes), repeat)
+        self.assertEqual(repeat["request_summary"]["budget_cny"], 8000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.deepseek_client import DeepSeekClientError
+from backend.app.plan_chunks import PARTIAL_FALLBACK_FLAG, split_days
+from backend.app.plan_graph import arun_plan_graph, get_plan_graph, run_plan_graph
+from backend.app.settings import get_settings
+from mvp_travel_agent import generate_plan
+
+
+def _request(days: int = 8) -> dict:
+    return {"destination": "成都", "days": days, "travelers": 2, "budget_cny": 20000, "preferences": []}
+
+
+def _chunk_plan(request: dict) -> dict:
+    start, _ = request["day_range"]
+    return {
+        "status": "ok",
+        "request_summary": request,
+        "itinerary": [
+            {"day": index + 1, "morning": f"M{start + index}", "afternoon": "A", "evening": "E"}
+            for index in range(request["days"])
+        ],
+        "price_breakdown": {"transport": 1000, "hotel": 100 * request["days"], "tickets": 10, "meals": 10, "service_fee": 0, "total": 0},
+        "risk_flags": ["budget_exceeded"],
+        "handoff_to_human": False,
+        "provider": "deepseek",
+    }
+
+
+class TestPlanChunks(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        os.environ["PLAN_PARALLEL_CHUNK_DAYS"] = "3"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def tearDown(self) -> None:
+        os.environ.pop("PLAN_PARALLEL_CHUNK_DAYS", None)
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def test_split_days_balances_chunks(self) -> None:
+        self.assertEqual(split_days(8, 3), [(1, 3), (4, 6), (7, 8)])
+        self.assertEqual(split_days(15, 4), [(1, 4), (5, 8), (9, 12), (13, 15)])
+        self.assertEqual(split_days(2, 3), [(1, 2)])
+
+    def test_async_fan_out_merges_days_and_prices(self) -> None:
+        async def fake(request, _baseline, _settings):
+            await asyncio.sleep(0.01)
+            return _chunk_plan(request)
+
+        with patch("backend.app.plan_graph.generate_with_deepseek_async", side_effect=fake) as mock_generate:
+            result = asyncio.run(arun_plan_graph(_request(8)))
+
+        self.assertEqual(mock_generate.call_count, 3)
+        self.assertEqual([day["day"] for day in result["itinerary"]], list(range(1, 9)))
+        self.assertEqual([day["morning"] for day in result["itinerary"]], [f"M{day}" for day in range(1, 9)])
+        prices = result["price_breakdown"]
+        self.assertEqual(prices["transport"], 1000)
+        self.assertEqual(prices["hotel"], 800)
+        self.assertEqual(prices["total"], 1860 + prices["service_fee"])
+        self.assertEqual(result["risk_flags"], [])
+        self.assertEqual(result["provider"], "deepseek")
+
+    def test_failed_chunk_is_filled_from_baseline(self) -> None:
+        def fake(request, _baseline, _settings):
+            if request["day_range"][0] == 4:
+                raise DeepSeekClientError("chunk failed")
+            return _chunk_plan(request)
+
+        with patch("backend.app.plan_graph.generate_with_deepseek", side_effect=fake):
+            result = run_plan_graph(_request(8))
+
+        local_days = generate_plan(_request(8))["itinerary"]
+        self.assertEqual(result["itinerary"][3:6], local_days[3:6])
+        self.assertEqual(result["itinerary"][0]["morning"], "M1")
+        self.assertIn(PARTIAL_FALLBACK_FLAG, result["risk_flags"])
+
+    def test_short_trip_keeps_single_call(self) -> None:
+        with patch("backend.app.plan_graph.generate_with_deepseek", side_effect=DeepSeekClientError("down")) as mock_generate:
+            result = run_plan_graph(_request(3))
+        self.assertEqual(mock_generate.call_count, 1)
+        self.assertEqual(result["provider"], "local_fallback")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,16 @@
+import asyncio
 import os
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from backend.app.deepseek_client import DeepSeekClientError
-from backend.app.plan_graph import get_plan_graph, run_plan_graph
+from backend.app.plan_graph import arun_plan_graph, get_plan_graph, run_plan_graph
 from backend.app.settings import get_settings
 
 
@@ -40,6 +41,13 @@ class TestPlanGraph(unittest.TestCase):
         self.assertEqual(result["status"], "ok")
         self.assertEqual(result["provider"], "local")
 
+    def test_local_result_shares_baseline_without_copy(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "local"
+        state = get_plan_graph().invoke({"request": _valid_request()})
+        self.assertEqual(state["final_plan"]["provider"], "local")
+        self.assertNotIn("provider", state["local_plan"])
+        self.assertIs(state["final_plan"]["itinerary"], state["local_plan"]["itinerary"])
+
     def test_debug_stream_path_keeps_contract(self) -> None:
         os.environ["PLAN_PROVIDER"] = "local"
         result = run_plan_graph(_valid_request(), debug_stream=True)
@@ -87,6 +95,22 @@ class TestPlanGraph(unittest.TestCase):
         self.assertEqual(result["status"], "ok")
         self.assertEqual(result["provider"], "local_fallback")
 
+    @patch("backend.app.plan_graph.generate_with_deepseek_async", new_callable=AsyncMock)
+    @patch("backend.app.plan_graph.generate_with_deepseek")
+    def test_async_path_uses_async_client(self, mock_generate, mock_generate_async) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        mock_generate_async.side_effect = DeepSeekClientError("mock failure")
+        result = asyncio.run(arun_plan_graph(_valid_request()))
+        self.assertEqual(result["provider"], "local_fallback")
+        mock_generate_async.assert_awaited_once()
+        mock_generate.assert_not_called()
+
+    def test_async_debug_stream_path_keeps_contract(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "local"
+        result = asyncio.run(arun_plan_graph(_valid_request(), debug_stream=True))
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(result["provider"], "local")
+
 
 if __name__ == "__main__":
     unittest.main()
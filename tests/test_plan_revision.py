@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.checkpointers import close_checkpointer
+from backend.app.deepseek_client import DeepSeekClientError
+from backend.app.plan_graph import UnknownPlanThread, arevise_plan_graph, arun_plan_graph, get_plan_graph
+from backend.app.settings import get_settings
+
+
+def _request() -> dict:
+    return {"destination": "成都", "days": 3, "travelers": 2, "budget_cny": 20000, "preferences": []}
+
+
+async def _fake_generate(request, _baseline, _settings):
+    start = (request.get("day_range") or [1])[0]
+    return {
+        "status": "ok",
+        "request_summary": request,
+        "itinerary": [
+            {"day": index + 1, "morning": f"M{start + index}", "afternoon": "A", "evening": "E"}
+            for index in range(request["days"])
+        ],
+        "price_breakdown": {
+            "transport": 1000,
+            "hotel": 300 * request["days"],
+            "tickets": 0,
+            "meals": 0,
+            "service_fee": 0,
+            "total": 1000 + 300 * request["days"],
+        },
+        "risk_flags": [],
+        "handoff_to_human": False,
+        "provider": "deepseek",
+    }
+
+
+class TestPlanRevision(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        close_checkpointer()
+        get_plan_graph.cache_clear()
+        self.thread_id = f"revise-{self.id()}"
+
+    def tearDown(self) -> None:
+        close_checkpointer()
+        get_plan_graph.cache_clear()
+
+    def _create_then_revise(self, revision: dict) -> tuple[dict, dict, list]:
+        with patch("backend.app.plan_graph.generate_with_deepseek_async", side_effect=_fake_generate) as mock_generate:
+            first = asyncio.run(arun_plan_graph(_request(), use_checkpointer=True, thread_id=self.thread_id))
+            mock_generate.reset_mock()
+            revised = asyncio.run(arevise_plan_graph(self.thread_id, revision))
+        return first, revised, mock_generate.call_args_list
+
+    def test_budget_change_reprices_without_llm_call(self) -> None:
+        first, revised, calls = self._create_then_revise({"budget_cny": 1000})
+
+        self.assertEqual(calls, [])
+        self.assertEqual(revised["itinerary"], first["itinerary"])
+        self.assertEqual(revised["request_summary"]["budget_cny"], 1000)
+        self.assertIn("budget_exceeded", revised["risk_flags"])
+        self.assertTrue(revised["handoff_to_human"])
+
+    def test_added_days_are_generated_alone(self) -> None:
+        first, revised, calls = self._create_then_revise({"days": 5})
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].args[0]["day_range"], [4, 5])
+        self.assertEqual(revised["itinerary"][:3], first["itinerary"])
+        self.assertEqual([day["morning"] for day in revised["itinerary"][3:]], ["M4", "M5"])
+        self.assertEqual(revised["price_breakdown"]["hotel"], 1500)
+
+        # The revision is checkpointed, so the next one builds on it.
+        with patch("backend.app.plan_graph.generate_with_deepseek_async", side_effect=_fake_generate) as mock_generate:
+            shorter = asyncio.run(arevise_plan_graph(self.thread_id, {"days": 2}))
+        mock_generate.assert_not_called()
+        self.assertEqual(shorter["itinerary"], revised["itinerary"][:2])
+
+    def test_other_changes_rerun_the_graph(self) -> None:
+        _, revised, calls = self._create_then_revise({"preferences": ["美食"]})
+
+        self.assertEqual(len(calls), 1)
+        self.assertNotIn("day_range", calls[0].args[0])
+        self.assertEqual(revised["request_summary"]["preferences"], ["美食"])
+
+    def test_destination_patch_after_llm_failure_returns_new_destination(self) -> None:
+        with patch("backend.app.plan_graph.generate_with_deepseek_async", side_effect=_fake_generate):
+            asyncio.run(arun_plan_graph(_request(), use_checkpointer=True, thread_id=self.thread_id))
+        with patch(
+            "backend.app.plan_graph.generate_with_deepseek_async",
+            side_effect=DeepSeekClientError("upstream down"),
+        ):
+            revised = asyncio.run(arevise_plan_graph(self.thread_id, {"destination": "上海"}))
+
+        self.assertEqual(revised["provider"], "local_fallback")
+        self.assertEqual(revised["request_summary"]["destination"], "上海")
+
+    def test_unknown_thread(self) -> None:
+        with self.assertRaises(UnknownPlanThread):
+            asyncio.run(arevise_plan_graph("missing-thread", {"days": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.metrics import PLAN_NODE_SECONDS, PLAN_RESULTS
+from backend.app.plan_graph import astream_plan_events, get_plan_graph, run_plan_graph
+from backend.app.plan_json import dump_plan_json
+from backend.app.plan_service import agenerate_plan, agenerate_plan_json, astream_plan, generate_plan
+from backend.app.settings import get_settings
+
+
+def _requests() -> list[dict]:
+    shapes = [
+        {"destination": destination, "days": days, "travelers": travelers, "budget_cny": budget, "preferences": prefs}
+        for destination, days, travelers, budget, prefs in itertools.product(
+            ("成都", "成都市", "火星"), (1, 4, 15), (1, 9), (500, 50000), ([], ["美食", "文化"])
+        )
+    ]
+    return [*shapes, {"destination": "成都", "days": 0, "travelers": 2, "budget_cny": 1000}]
+
+
+async def _collect(events) -> list:
+    return [event async for event in events]
+
+
+class TestLocalFastPath(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "local"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def tearDown(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def test_matches_graph_output(self) -> None:
+        for request in _requests():
+            expected = run_plan_graph(request)
+            with patch("backend.app.plan_service.run_plan_graph", side_effect=AssertionError("graph used")):
+                self.assertEqual(generate_plan(request), expected)
+                self.assertEqual(asyncio.run(agenerate_plan(request)), expected)
+
+    def test_records_one_route_timing_and_result(self) -> None:
+        route_before = PLAN_NODE_SECONDS.count("local_route")
+        node_before = PLAN_NODE_SECONDS.count("build_local_baseline")
+        results_before = PLAN_RESULTS.value("local")
+        generate_plan(_requests()[0])
+        asyncio.run(agenerate_plan_json(_requests()[0]))
+
+        self.assertEqual(PLAN_NODE_SECONDS.count("local_route"), route_before + 2)
+        self.assertEqual(PLAN_NODE_SECONDS.count("build_local_baseline"), node_before)
+        self.assertEqual(PLAN_RESULTS.value("local"), results_before + 2)
+
+    def test_json_body_matches_graph_output(self) -> None:
+        for request in _requests():
+            expected = dump_plan_json(run_plan_graph(request))
+            with patch("backend.app.plan_service.run_local_route", side_effect=AssertionError("dict path used")):
+                self.assertEqual(asyncio.run(agenerate_plan_json(request)), expected)
+
+    def test_stream_matches_graph_events(self) -> None:
+        request = _requests()[0]
+        expected = asyncio.run(_collect(astream_plan_events(request)))
+        self.assertEqual(asyncio.run(_collect(astream_plan(request))), expected)
+
+    def test_checkpointer_keeps_graph_path(self) -> None:
+        os.environ["PLAN_GRAPH_USE_CHECKPOINTER"] = "true"
+        get_settings.cache_clear()
+        try:
+            with patch("backend.app.plan_service.run_plan_graph", return_value={"provider": "graph"}) as mock_run:
+                self.assertEqual(generate_plan(_requests()[0]), {"provider": "graph"})
+            mock_run.assert_called_once()
+        finally:
+            os.environ.pop("PLAN_GRAPH_USE_CHECKPOINTER", None)
+            get_settings.cache_clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from mvp_travel_agent.engine import _estimate_price, _evaluate_risk, _normalize_request
+from mvp_travel_agent.pricing import estimate_prices, np
+
+
+@unittest.skipUnless(np is not None, "numpy not installed")
+class TestVectorizedPricing(unittest.TestCase):
+    def test_matches_scalar_engine(self) -> None:
+        rng = random.Random(7)
+        rows = [
+            {
+                "destination": rng.choice(["北京", "上海", "成都", " 成都 ", "杭州"]),
+                "days": rng.randint(1, 15),
+                "travelers": rng.randint(1, 20),
+                "budget_cny": rng.choice([500, 3000.5, 9000, 25000, 120000]),
+            }
+            for _ in range(2000)
+        ]
+        columns = estimate_prices(
+            [row["destination"] for row in rows],
+            [row["days"] for row in rows],
+            [row["travelers"] for row in rows],
+            [row["budget_cny"] for row in rows],
+        )
+
+        for index, row in enumerate(rows):
+            req = _normalize_request(row)
+            expected = _estimate_price(req).to_dict()
+            for key, value in expected.items():
+                self.assertEqual(float(columns[key][index]), value, (row, key))
+            risk_flags, handoff = _evaluate_risk(req, expected["total"])
+            self.assertEqual(bool(columns["budget_exceeded"][index]), "budget_exceeded" in risk_flags)
+            self.assertEqual(bool(columns["handoff_to_human"][index]), handoff)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.prompt import SYSTEM_PROMPT, PromptBudgetExceeded, TokenStats, build_messages, estimate_tokens
+from mvp_travel_agent import generate_plan
+
+
+def _request(days: int = 3) -> dict:
+    return {"destination": "成都", "days": days, "travelers": 2, "budget_cny": 5000, "preferences": ["美食"]}
+
+
+class TestPrompt(unittest.TestCase):
+    def test_system_prompt_is_static_and_first(self) -> None:
+        first, _, _ = build_messages(_request(2), generate_plan(_request(2)), token_budget=0)
+        second, _, _ = build_messages(_request(9), generate_plan(_request(9)), token_budget=0)
+        self.assertEqual(first[0], {"role": "system", "content": SYSTEM_PROMPT})
+        self.assertEqual(first[0], second[0])
+        self.assertIn("schema:", SYSTEM_PROMPT)
+
+    def test_baseline_rows_are_delta_encoded(self) -> None:
+        messages, _, truncated = build_messages(_request(3), generate_plan(_request(3)), token_budget=0)
+        lines = messages[1]["content"].splitlines()
+        rows = lines[lines.index("基线行程:") + 1 :]
+        self.assertFalse(truncated)
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(rows[0].endswith("本地特色美食 + 自由活动"))
+        self.assertTrue(rows[1].endswith("|"))
+        self.assertNotIn("request_summary", messages[1]["content"])
+
+    def test_budget_drops_trailing_days_then_fails(self) -> None:
+        baseline = generate_plan(_request(15))
+        _, full_tokens, _ = build_messages(_request(15), baseline, token_budget=0)
+        messages, tokens, truncated = build_messages(_request(15), baseline, token_budget=full_tokens - 20)
+        self.assertTrue(truncated)
+        self.assertLessEqual(tokens, full_tokens - 20)
+        self.assertIn("无基线", messages[1]["content"])
+        with self.assertRaises(PromptBudgetExceeded):
+            build_messages(_request(15), baseline, token_budget=estimate_tokens(SYSTEM_PROMPT))
+
+    def test_token_stats_record_usage(self) -> None:
+        stats = TokenStats()
+        stats.record_prompt(120, truncated=True)
+        stats.record_usage({"prompt_tokens": 130, "completion_tokens": 40, "prompt_cache_hit_tokens": 64})
+        self.assertEqual(stats.stats()["truncated"], 1)
+        self.assertEqual(stats.stats()["prompt_cache_hit_tokens"], 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
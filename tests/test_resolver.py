@@ -0,0 +1,56 @@
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from mvp_travel_agent.catalog import compile_catalog
+from mvp_travel_agent.engine import generate_plan
+from mvp_travel_agent.resolver import DestinationResolver, resolve_destination
+
+
+class TestDestinationResolver(unittest.TestCase):
+    def test_aliases_and_latin_names(self) -> None:
+        for text, method in [("北京市", "exact"), ("Beijing", "latin"), ("shang hai", "latin"), ("蓉城", "alias"), ("成都市", "exact")]:
+            resolution = resolve_destination(text)
+            self.assertIsNotNone(resolution, text)
+            self.assertEqual(resolution.method, method, text)
+        self.assertEqual(resolve_destination("成都市").name, "成都")
+
+    def test_typos_resolve_but_short_names_are_not_guessed(self) -> None:
+        resolution = resolve_destination("Shangai")
+        self.assertEqual((resolution.name, resolution.method, resolution.distance), ("上海", "fuzzy", 1))
+        self.assertIsNone(resolve_destination("南京"))
+
+    def test_engine_uses_resolved_destination(self) -> None:
+        result = generate_plan({"destination": "Beijing", "days": 2, "travelers": 2, "budget_cny": 9000})
+        self.assertEqual(result["request_summary"]["destination"], "北京")
+        self.assertNotIn("destination_fallback_template", result["risk_flags"])
+
+        fuzzy = generate_plan({"destination": "Chengdoo", "days": 2, "travelers": 2, "budget_cny": 9000})
+        self.assertEqual(fuzzy["request_summary"]["destination"], "成都")
+        self.assertIn("destination_fuzzy_match", fuzzy["risk_flags"])
+
+    def test_large_catalog_picks_closest_candidate(self) -> None:
+        entries = [
+            {
+                "name": f"城市{index}",
+                "pinyin": f"city{index:05d}town",
+                "spots": ["景点"],
+                "transport_per_person": 1,
+                "hotel_per_night": 1,
+                "ticket_per_day_per_person": 1,
+                "meal_per_day_per_person": 1,
+            }
+            for index in range(3000)
+        ]
+        resolver = DestinationResolver(compile_catalog({"destinations": entries}))
+        resolution = resolver.resolve("city01234twon")
+        self.assertEqual(resolution.name, "城市1234")
+        self.assertEqual(resolution.method, "fuzzy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_threads_share_one_call(self) -> None:
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def slow() -> dict:
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return {"provider": "deepseek"}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=lambda: results.append(flights.do("k", slow))) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(flights.stats(), {"leaders": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_async_callers_share_one_call_and_error(self) -> None:
+        flights = SingleFlight()
+        calls = []
+
+        async def failing() -> dict:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        async def scenario() -> list:
+            return await asyncio.gather(*(flights.ado("k", failing) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(item, RuntimeError) for item in results))
+        self.assertEqual(flights.stats()["coalesced"], 2)
+        self.assertEqual(flights.stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.deepseek_client import DeepSeekClientError
+from backend.app.stream_json import PlanStreamParser
+
+
+def _plan_text() -> str:
+    return json.dumps(
+        {
+            "status": "ok",
+            "request_summary": {"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000, "preferences": []},
+            "itinerary": [
+                {"day": 1, "morning": "故宫", "afternoon": "天坛", "evening": "\"胡同\" 散步"},
+                {"day": 2, "morning": "长城", "afternoon": "颐和园", "evening": "烤鸭"},
+            ],
+            "price_breakdown": {"transport": 1, "hotel": 1, "tickets": 1, "meals": 1, "service_fee": 1.5, "total": -5e2},
+            "risk_flags": [],
+            "handoff_to_human": False,
+        },
+        ensure_ascii=False,
+    )
+
+
+class TestPlanStreamParser(unittest.TestCase):
+    def test_days_are_yielded_as_each_object_closes(self) -> None:
+        text = "```json\n" + _plan_text() + "\n```"
+        parser = PlanStreamParser(expected_days=2)
+        seen = []
+        for start in range(0, len(text), 7):
+            for day in parser.feed(text[start : start + 7]):
+                seen.append((day["day"], start + 7))
+        self.assertEqual([day for day, _ in seen], [1, 2])
+        self.assertLess(seen[0][1], text.index('"day": 2'))
+        self.assertEqual(parser.days[0]["evening"], '"胡同" 散步')
+        self.assertTrue(parser.complete)
+        self.assertEqual(parser.result()["provider"], "deepseek")
+
+    def test_prose_is_rejected_on_first_character(self) -> None:
+        parser = PlanStreamParser()
+        with self.assertRaises(DeepSeekClientError):
+            parser.feed("Sure! Here is")
+
+    def test_broken_syntax_aborts_before_the_end(self) -> None:
+        parser = PlanStreamParser()
+        parser.feed('{"status": "ok", "itinerary": [')
+        with self.assertRaises(DeepSeekClientError):
+            parser.feed('{"day": 1,, "morning"')
+
+    def test_day_missing_slots_or_extra_days_abort(self) -> None:
+        with self.assertRaises(DeepSeekClientError):
+            PlanStreamParser().feed('{"itinerary": [{"day": 1, "morning": "故宫"}')
+        parser = PlanStreamParser(expected_days=1)
+        day = '{"day": 1, "morning": "a", "afternoon": "b", "evening": "c"}'
+        with self.assertRaises(DeepSeekClientError):
+            parser.feed('{"itinerary": [' + day + "," + day)
+
+    def test_truncated_stream_has_no_result(self) -> None:
+        parser = PlanStreamParser()
+        parser.feed(_plan_text()[:-10])
+        with self.assertRaises(DeepSeekClientError):
+            parser.result()
+
+
+if __name__ == "__main__":
+    unittest.main()
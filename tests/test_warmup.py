@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.checkpointers import close_checkpointer, get_checkpointer
+from backend.app.deepseek_client import close_async_client
+from backend.app.metrics import PLAN_NODE_SECONDS, PLAN_RESULTS
+from backend.app.plan_graph import get_plan_graph
+from backend.app.settings import get_settings
+from backend.app.warmup import WARMUP, warm_up
+
+try:
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    FASTAPI_READY = True
+except Exception:
+    FASTAPI_READY = False
+
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["PLAN_PROVIDER"] = "deepseek"
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def tearDown(self) -> None:
+        os.environ.pop("APP_WARMUP", None)
+        get_settings.cache_clear()
+        get_plan_graph.cache_clear()
+
+    def test_warm_up_compiles_graphs_without_calling_the_llm(self) -> None:
+        async def run() -> None:
+            await warm_up(get_settings())
+            await close_async_client()
+
+        close_checkpointer()
+        results_before = PLAN_RESULTS.value("local")
+        nodes_before = [PLAN_NODE_SECONDS.count(node) for node in ("build_local_baseline", "local_route")]
+        with patch("backend.app.plan_graph.generate_with_deepseek_async", side_effect=AssertionError("LLM called")):
+            asyncio.run(run())
+
+        stats = WARMUP.stats()
+        self.assertTrue(stats["ready"])
+        self.assertEqual(stats["error"], "")
+        self.assertEqual(set(stats["steps"]), {"http_pool", "compile_graphs", "providers", "synthetic_plan"})
+        self.assertEqual(get_plan_graph.cache_info().currsize, 1)
+        # PLAN_GRAPH_USE_CHECKPOINTER is off: no checkpointer (or SQLite file) is created.
+        self.assertEqual(get_checkpointer.cache_info().currsize, 0)
+        # Synthetic warm-up traffic stays out of the plan metrics.
+        self.assertEqual(PLAN_RESULTS.value("local"), results_before)
+        self.assertEqual([PLAN_NODE_SECONDS.count(node) for node in ("build_local_baseline", "local_route")], nodes_before)
+        self.assertGreater(stats["startup_seconds"], stats["warmup_seconds"])
+
+    @unittest.skipUnless(FASTAPI_READY, "fastapi/testclient not installed")
+    def test_ready_endpoint_flips_after_lifespan_warm_up(self) -> None:
+        WARMUP.reset()
+        self.assertEqual(TestClient(app).get("/api/ready").status_code, 503)
+
+        os.environ["PLAN_PROVIDER"] = "local"
+        get_settings.cache_clear()
+        with TestClient(app) as client:
+            deadline = time.monotonic() + 10
+            while client.get("/api/ready").status_code != 200 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            response = client.get("/api/ready")
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNotNone(response.json()["warmup_seconds"])
+
+            client.post("/api/plan", json={"destination": "北京", "days": 2, "travelers": 2, "budget_cny": 8000})
+            self.assertIsNotNone(WARMUP.stats()["first_request_seconds"])
+            self.assertIn("app_first_request_seconds", client.get("/api/metrics").text)
+
+
+if __name__ == "__main__":
+    unittest.main()